@@ -1,6 +1,11 @@
 # app/__init__.py
 
-from flask import Flask
+import time
+
+# Reference point for the import-to-first-request startup metric
+_IMPORTED_AT = time.perf_counter()
+
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 
 def create_app():
@@ -14,9 +19,46 @@ def create_app():
     # 2. Register the NEW Auth Blueprint
     from app.controllers.auth_controller import auth_bp
     app.register_blueprint(auth_bp)
+
+    # 3. Warm-up, readiness and instrumentation (per-route latency, engine timers, optional
+    #    slow-request profiler), shared with the ASGI app
+    from app.services.provider import WSGI_SERVICES
+    from app.utils.instrumentation import AppInstrumentation
+    instrumentation = AppInstrumentation(WSGI_SERVICES)
+    instrumentation.start_warm_up()
+
+    @app.before_request
+    def start_request():
+        instrumentation.request_started(g, request)
+
+    @app.after_request
+    def finish_request(response):
+        return instrumentation.request_finished(g, request, response)
+
+    @app.teardown_request
+    def tear_down_request(exc):
+        instrumentation.request_torn_down(g)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus scrape endpoint."""
+        body, mimetype = instrumentation.metrics()
+        return Response(body, mimetype=mimetype)
+
+    @app.route('/metrics/slow-requests', methods=['GET'])
+    def slow_requests():
+        """Stack samples of the slowest requests (enable with PROFILE_SLOW_REQUESTS=<n>)."""
+        return instrumentation.slow_requests()
     
     @app.route('/health', methods=['GET'])
     def health_check():
-        return {"status": "healthy", "service": "Smart Emergency Routing System API"}
+        """Liveness: the process is up and serving, independent of MongoDB."""
+        return instrumentation.health()
+
+    @app.route('/health/ready', methods=['GET'])
+    def readiness_check():
+        """Readiness: every service is built and can answer routing/auth requests."""
+        return instrumentation.readiness()
 
-    return app
\ No newline at end of file
+    instrumentation.app_created()
+    return app
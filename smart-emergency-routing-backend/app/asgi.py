@@ -0,0 +1,63 @@
+# app/asgi.py
+
+from quart import Quart, Response, g, request
+from quart_cors import cors
+
+def create_asgi_app():
+    """
+    Async serving mode: the same /api/v1 routes as create_app(), served by an ASGI server
+    (e.g. `hypercorn asgi:app`). MongoDB is awaited through Motor and CPU-bound work runs
+    in the executor, so one worker keeps many slow I/O-bound requests in flight at once.
+    """
+    app = cors(Quart(__name__))
+
+    from app.controllers.async_routing_controller import async_routing_bp
+    app.register_blueprint(async_routing_bp)
+
+    from app.controllers.async_auth_controller import async_auth_bp
+    app.register_blueprint(async_auth_bp)
+
+    # Warm-up, readiness and instrumentation shared with create_app(); only the async hooks differ
+    from app.services.provider import ASGI_SERVICES
+    from app.utils.instrumentation import AppInstrumentation
+    instrumentation = AppInstrumentation(ASGI_SERVICES)
+
+    @app.before_serving
+    async def start_warm_up():
+        instrumentation.start_warm_up()
+
+    @app.before_request
+    async def start_request():
+        instrumentation.request_started(g, request)
+
+    @app.after_request
+    async def finish_request(response):
+        return instrumentation.request_finished(g, request, response)
+
+    @app.teardown_request
+    async def tear_down_request(exc):
+        instrumentation.request_torn_down(g)
+
+    @app.route('/metrics', methods=['GET'])
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        body, mimetype = instrumentation.metrics()
+        return Response(body, mimetype=mimetype)
+
+    @app.route('/metrics/slow-requests', methods=['GET'])
+    async def slow_requests():
+        """Stack samples of the slowest requests (enable with PROFILE_SLOW_REQUESTS=<n>)."""
+        return instrumentation.slow_requests()
+
+    @app.route('/health', methods=['GET'])
+    async def health_check():
+        """Liveness: the process is up and serving, independent of MongoDB."""
+        return instrumentation.health()
+
+    @app.route('/health/ready', methods=['GET'])
+    async def readiness_check():
+        """Readiness: every service is built; a probe that finds services missing starts building them."""
+        return instrumentation.readiness()
+
+    instrumentation.app_created()
+    return app
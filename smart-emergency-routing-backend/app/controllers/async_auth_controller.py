@@ -0,0 +1,45 @@
+# app/controllers/async_auth_controller.py
+
+from quart import Blueprint, request
+from app.controllers import common
+from app.controllers.common import error_response, success
+from app.services.provider import LazyService
+from app.utils.auth_middleware import authenticate
+
+async_auth_bp = Blueprint('async_auth', __name__, url_prefix='/api/v1/auth')
+
+def _build_async_auth_service():
+    from app.services.async_auth_service import AsyncAuthService
+    return AsyncAuthService()
+
+async_auth_service = LazyService("async_auth", _build_async_auth_service)
+
+@async_auth_bp.route('/register', methods=['POST'])
+async def register():
+    try:
+        username, email, password = common.registration(await request.get_json(force=True, silent=True))
+        await async_auth_service.get().register_user(username, email, password)
+        return common.message("User registered successfully.", 201)
+    except Exception as e:
+        return error_response(e, value_error_status=409, internal_message="Internal server error")  # 409 Conflict
+
+@async_auth_bp.route('/login', methods=['POST'])
+async def login():
+    try:
+        email, password = common.credentials(await request.get_json(force=True, silent=True))
+        return success(await async_auth_service.get().login_user(email, password))
+    except Exception as e:
+        return error_response(e, value_error_status=401, internal_message="Internal server error")  # 401 Unauthorized
+
+@async_auth_bp.route('/me', methods=['GET'])
+async def me():
+    """Returns the user id carried by a valid bearer token."""
+    try:
+        return success({"user_id": authenticate(request.headers)})
+    except Exception as e:
+        return error_response(e)
+
+@async_auth_bp.route('/stats', methods=['GET'])
+async def get_auth_stats():
+    """Verified-token cache counters and password pool queue depth."""
+    return common.auth_stats()
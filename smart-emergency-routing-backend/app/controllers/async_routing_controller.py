@@ -0,0 +1,171 @@
+# app/controllers/async_routing_controller.py
+
+from quart import Blueprint, Response, request, make_response
+from app.controllers import common
+from app.controllers.common import error_response, success
+from app.services.provider import routing_service, fleet_service, stream_broker
+from app.utils.async_db import get_async_db
+from app.utils.db_workflow import run_workflow_async
+from app.utils.executor import run_cpu
+from app.utils.http_cache import conditional_response
+
+# Same /api/v1 routes as routing_controller, for the ASGI app: MongoDB is awaited through
+# Motor and graph work runs in the CPU executor, so no request blocks the event loop.
+# Validation, response bodies and error mapping are the shared ones in common.py
+async_routing_bp = Blueprint('async_routing', __name__, url_prefix='/api/v1')
+
+@async_routing_bp.route('/locations', methods=['GET'])
+async def get_locations():
+    """Returns valid ambulance starting locations for the frontend."""
+    try:
+        service = await routing_service.get_async()
+        # Served from the in-memory index; serialization / compression happen once per version
+        payload = await run_cpu(service.locations_payload)
+        body, status, headers = conditional_response(payload, request.headers)
+        return Response(body, status=status, headers=headers)
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/dispatch-map', methods=['GET'])
+async def get_dispatch_map():
+    """Returns the precomputed best hospital for every intersection (coverage regions)."""
+    try:
+        service = await routing_service.get_async()
+        payload = await run_cpu(service.dispatch_map_payload)
+        body, status, headers = conditional_response(payload, request.headers)
+        return Response(body, status=status, headers=headers)
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/cache/stats', methods=['GET'])
+async def get_cache_stats():
+    """Route cache hit / miss / eviction counters."""
+    try:
+        service = await routing_service.get_async()
+        return success(service.get_cache_stats())
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/snap', methods=['GET'])
+async def snap_position():
+    """Snaps a GPS position (?lat=&lon=) to the nearest intersection / road."""
+    try:
+        lat, lon = common.snap_query(request.args)
+        service = await routing_service.get_async()
+        # One KD-tree query: cheaper inline than a hop to the CPU executor
+        return success(service.snap_position(lat, lon))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/hospital/update-occupancy', methods=['PATCH'])
+async def update_occupancy():
+    """Allows simulating real-time capacity changes."""
+    try:
+        hospital_id, new_occupancy = common.occupancy_update(await request.get_json(force=True, silent=True))
+        service = await routing_service.get_async()
+        # The same workflow as the Flask route, with MongoDB awaited through Motor
+        updated = await run_workflow_async(service.update_hospital_occupancy_steps(hospital_id, new_occupancy), get_async_db())
+        return common.occupancy_result(updated)
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/hospital/update-occupancy/bulk', methods=['PATCH'])
+async def update_occupancy_bulk():
+    """Applies a burst of hospital occupancy reports in one database round-trip."""
+    try:
+        updates = common.occupancy_updates(await request.get_json(force=True, silent=True))
+        service = await routing_service.get_async()
+        return success(await run_workflow_async(service.update_hospital_occupancies_steps(updates), get_async_db()))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/roads/update-weight', methods=['PATCH'])
+async def update_road_weight():
+    """Applies a live traffic update (congestion / closure) to one road."""
+    try:
+        source, target, weight = common.road_weight_update(await request.get_json(force=True, silent=True))
+        service = await routing_service.get_async()
+        updated = await run_workflow_async(service.update_road_weight_steps(source, target, weight), get_async_db())
+        return common.road_weight_result(updated)
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/roads/update-weight/bulk', methods=['PATCH'])
+async def update_road_weights_bulk():
+    """Applies many live traffic updates in one request."""
+    try:
+        updates = common.road_weight_updates(await request.get_json(force=True, silent=True))
+        service = await routing_service.get_async()
+        return success(await run_workflow_async(service.update_road_weights_steps(updates), get_async_db()))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/optimize-route', methods=['POST'])
+async def optimize_route():
+    try:
+        data = await request.get_json(force=True, silent=True)
+        if data is None:
+            data = (await request.form).to_dict()
+
+        position, ambulance_location, departure_time = common.dispatch_request(data)
+        service = await routing_service.get_async()
+        if position is not None:
+            # Raw GPS report: snap to the nearest road, then dispatch as usual
+            return success(await run_cpu(service.find_optimal_hospital_from_position, *position, departure_time))
+        return success(await run_cpu(service.find_optimal_hospital, ambulance_location, departure_time))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/optimize-route/batch', methods=['POST'])
+async def optimize_route_batch():
+    """Dispatches many ambulances in one request (mass-casualty incidents)."""
+    try:
+        ambulance_locations = common.ambulance_locations(await request.get_json(force=True, silent=True))
+        service = await routing_service.get_async()
+        return success(await run_cpu(service.find_optimal_hospitals_batch, ambulance_locations))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/fleet/assign', methods=['POST'])
+async def assign_fleet():
+    """Jointly assigns many ambulances to hospitals without exceeding free beds."""
+    try:
+        ambulance_locations = common.ambulance_locations(await request.get_json(force=True, silent=True))
+        service = await fleet_service.get_async()
+        return success(await run_cpu(service.assign_fleet, ambulance_locations))
+    except Exception as e:
+        return error_response(e)
+
+@async_routing_bp.route('/stream', methods=['GET'])
+async def stream():
+    """
+    Server-sent events: `occupancy` on every capacity change, and `assignment` whenever the
+    best hospital for a registered ambulance changes (`?ambulance=<id>:<intersection>`, repeatable).
+    """
+    from app.services.stream_service import AsyncStreamSubscriber
+    try:
+        broker = await stream_broker.get_async()
+        ambulances = broker.parse_ambulances(request.args.getlist('ambulance'))
+        subscriber = broker.subscribe(ambulances, AsyncStreamSubscriber)
+    except Exception as e:
+        return error_response(e)
+
+    async def event_stream():
+        try:
+            while not subscriber.closed:
+                yield common.stream_chunk(await subscriber.next_frames_async(broker.keepalive_seconds))
+        finally:
+            broker.unsubscribe(subscriber)
+
+    response = await make_response(event_stream(), 200, {"Content-Type": "text/event-stream", **common.STREAM_HEADERS})
+    response.timeout = None  # Streams stay open until the client disconnects
+    return response
+
+@async_routing_bp.route('/stream/stats', methods=['GET'])
+async def get_stream_stats():
+    """Open subscribers, watched ambulances and fan-out counters."""
+    try:
+        broker = await stream_broker.get_async()
+        return success(broker.stats())
+    except Exception as e:
+        return error_response(e)
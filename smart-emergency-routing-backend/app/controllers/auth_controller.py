@@ -1,39 +1,37 @@
 # app/controllers/auth_controller.py
 
-from flask import Blueprint, request, jsonify
-from app.services.auth_service import AuthService
+from flask import Blueprint, request
+from app.controllers import common
+from app.controllers.common import error_response, success
+from app.services.provider import auth_service
+from app.utils.auth_middleware import token_required
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/v1/auth')
-auth_service = AuthService()
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
-        data = request.get_json(force=True, silent=True)
-        if not data or not all(k in data for k in ('username', 'email', 'password')):
-            return jsonify({"status": "error", "message": "Missing required fields: username, email, password"}), 400
-
-        auth_service.register_user(data['username'], data['email'], data['password'])
-        
-        return jsonify({"status": "success", "message": "User registered successfully."}), 201
-        
-    except ValueError as ve:
-        return jsonify({"status": "error", "message": str(ve)}), 409 # 409 Conflict
+        username, email, password = common.registration(request.get_json(force=True, silent=True))
+        auth_service.register_user(username, email, password)
+        return common.message("User registered successfully.", 201)
     except Exception as e:
-        return jsonify({"status": "error", "message": "Internal server error"}), 500
+        return error_response(e, value_error_status=409, internal_message="Internal server error")  # 409 Conflict
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     try:
-        data = request.get_json(force=True, silent=True)
-        if not data or not all(k in data for k in ('email', 'password')):
-            return jsonify({"status": "error", "message": "Missing email or password."}), 400
-
-        result = auth_service.login_user(data['email'], data['password'])
-        
-        return jsonify({"status": "success", "data": result}), 200
-        
-    except ValueError as ve:
-        return jsonify({"status": "error", "message": str(ve)}), 401 # 401 Unauthorized
+        email, password = common.credentials(request.get_json(force=True, silent=True))
+        return success(auth_service.login_user(email, password))
     except Exception as e:
-        return jsonify({"status": "error", "message": "Internal server error"}), 500
\ No newline at end of file
+        return error_response(e, value_error_status=401, internal_message="Internal server error")  # 401 Unauthorized
+
+@auth_bp.route('/me', methods=['GET'])
+@token_required
+def me(current_user_id):
+    """Returns the user id carried by a valid bearer token."""
+    return success({"user_id": current_user_id})
+
+@auth_bp.route('/stats', methods=['GET'])
+def get_auth_stats():
+    """Verified-token cache counters and password pool queue depth."""
+    return common.auth_stats()
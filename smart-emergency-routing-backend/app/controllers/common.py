@@ -0,0 +1,137 @@
+# app/controllers/common.py
+
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.errors import AuthenticationError, RouteNotFoundError, StreamFullError
+from app.utils.geo import gps_position, validate_position
+
+# Request validation, response bodies and error-to-status mapping shared by the Flask
+# controllers and their ASGI twins, so both apps answer every route the same way. The
+# per-app controllers only read the request and call (Flask) or await (ASGI) the service.
+# Bodies are returned as (dict, status[, headers]), which both frameworks serialize as JSON.
+
+Body = Tuple[Dict[str, Any], int]
+
+# Server-sent events
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        """A request rejected before it reaches a service (missing or malformed fields)."""
+        super().__init__(message)
+        self.status = status
+
+def success(data: Any, status: int = 200) -> Body:
+    return {"status": "success", "data": data}, status
+
+def message(text: str, status: int = 200) -> Body:
+    return {"status": "success" if status < 400 else "error", "message": text}, status
+
+def error_response(error: Exception, value_error_status: int = 400,
+                   internal_message: Optional[str] = None) -> Tuple[Dict[str, Any], int, Dict[str, str]]:
+    """
+    Maps an exception to (body, status, headers): RouteNotFoundError 404, any other
+    ValueError `value_error_status`, AuthenticationError 401, StreamFullError 503 with
+    Retry-After, anything else 500 (with `internal_message` instead of the error, if given).
+    """
+    headers = {}
+    if isinstance(error, ApiError):
+        status = error.status
+    elif isinstance(error, RouteNotFoundError):
+        status = 404
+    elif isinstance(error, ValueError):
+        status = value_error_status
+    elif isinstance(error, AuthenticationError):
+        status = 401
+    elif isinstance(error, StreamFullError):
+        status, headers = 503, {"Retry-After": "5"}
+    else:
+        return {"status": "error", "message": internal_message or str(error)}, 500, headers
+    return {"status": "error", "message": str(error)}, status, headers
+
+def stream_chunk(frames: List[bytes]) -> bytes:
+    """What an open /stream sends after waiting: the queued frames, or a keep-alive comment."""
+    return b"".join(frames) if frames else KEEPALIVE_FRAME
+
+# --- Request validation (ApiError, HTTP 400, for anything missing) ---
+
+def required_fields(data: Optional[Dict[str, Any]], fields: Tuple[str, ...], missing: str) -> Dict[str, Any]:
+    if not data or not all(field in data for field in fields):
+        raise ApiError(missing)
+    return data
+
+def update_list(data: Optional[Dict[str, Any]], fields: Tuple[str, ...], missing: str) -> List[Dict[str, Any]]:
+    """The non-empty `updates` list of a bulk PATCH, each entry carrying `fields`."""
+    updates = data.get('updates') if data else None
+    if not isinstance(updates, list) or not updates:
+        raise ApiError("Missing 'updates' list.")
+    if not all(isinstance(update, dict) and all(field in update for field in fields) for update in updates):
+        raise ApiError(missing)
+    return updates
+
+def occupancy_update(data: Optional[Dict[str, Any]]) -> Tuple[Any, Any]:
+    data = required_fields(data, ('hospital_id', 'new_occupancy'), "Missing required fields")
+    return data['hospital_id'], data['new_occupancy']
+
+def occupancy_updates(data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return update_list(data, ('hospital_id', 'new_occupancy'), "Every update needs hospital_id and new_occupancy.")
+
+def road_weight_update(data: Optional[Dict[str, Any]]) -> Tuple[str, str, Any]:
+    data = required_fields(data, ('source', 'target', 'weight'), "Missing required fields: source, target, weight")
+    return str(data['source']), str(data['target']), data['weight']
+
+def road_weight_updates(data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return update_list(data, ('source', 'target', 'weight'), "Every update needs source, target and weight.")
+
+def ambulance_locations(data: Optional[Dict[str, Any]]) -> List[str]:
+    if not data or not isinstance(data.get('ambulance_locations'), list) or not data['ambulance_locations']:
+        raise ApiError("Missing 'ambulance_locations' list.")
+    return [str(location).strip().upper() for location in data['ambulance_locations']]
+
+def snap_query(args) -> Tuple[float, float]:
+    if 'lat' not in args or 'lon' not in args:
+        raise ApiError("Missing 'lat' and 'lon' query parameters.")
+    return validate_position(args['lat'], args['lon'])
+
+def dispatch_request(data: Optional[Dict[str, Any]]) -> Tuple[Optional[Tuple[float, float]], Optional[str], Any]:
+    """
+    (position, ambulance_location, departure_time) of an /optimize-route body; exactly one of
+    the first two is set. A malformed position is a bad request (400), never a 404.
+    """
+    if not data:
+        raise ApiError("Missing 'ambulance_location' or lat/lon.")
+    position = gps_position(data)
+    if position is not None:
+        return validate_position(*position), None, data.get('departure_time')
+    if 'ambulance_location' not in data:
+        raise ApiError("Missing 'ambulance_location' or lat/lon.")
+    return None, str(data['ambulance_location']).strip().upper(), data.get('departure_time')
+
+def registration(data: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+    data = required_fields(data, ('username', 'email', 'password'), "Missing required fields: username, email, password")
+    return data['username'], data['email'], data['password']
+
+def credentials(data: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    data = required_fields(data, ('email', 'password'), "Missing email or password.")
+    return data['email'], data['password']
+
+# --- Responses ---
+
+def occupancy_result(updated: bool) -> Body:
+    if updated:
+        return message("Occupancy updated successfully.")
+    return message("Hospital not found or data unchanged.", 404)
+
+def road_weight_result(updated: bool) -> Body:
+    if updated:
+        return message("Road weight updated successfully.")
+    return message("Road not found.", 404)
+
+def auth_stats() -> Body:
+    """Verified-token cache counters and password pool queue depth."""
+    from app.utils.auth_middleware import token_cache
+    from app.utils.password_pool import get_password_pool
+    return success({
+        "token_cache": token_cache.stats() if token_cache is not None else None,
+        "password_pool": get_password_pool().stats()
+    })
@@ -1,37 +1,86 @@
 # app/controllers/routing_controller.py
 
-from flask import Blueprint, request, jsonify
-from app.services.routing_service import RoutingService
+from flask import Blueprint, Response, request, stream_with_context
+from app.controllers import common
+from app.controllers.common import error_response, success
+from app.services.provider import routing_service, fleet_service, stream_broker
+from app.utils.http_cache import conditional_response
 
+# Validation, response bodies and error mapping live in common.py, shared with the ASGI app
 
 routing_bp = Blueprint('routing', __name__, url_prefix='/api/v1')
 
-# Initialize the service (It now builds itself securely from MongoDB)
-routing_service = RoutingService()
-
 @routing_bp.route('/locations', methods=['GET'])
 def get_locations():
     """Returns valid ambulance starting locations for the frontend."""
     try:
-        locations = routing_service.get_all_locations()
-        return jsonify({"status": "success", "data": locations}), 200
+        # ETag / If-None-Match revalidation and gzip / br for large maps
+        body, status, headers = conditional_response(routing_service.locations_payload(), request.headers)
+        return Response(body, status=status, headers=headers)
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return error_response(e)
+
+@routing_bp.route('/dispatch-map', methods=['GET'])
+def get_dispatch_map():
+    """Returns the precomputed best hospital for every intersection (coverage regions)."""
+    try:
+        body, status, headers = conditional_response(routing_service.dispatch_map_payload(), request.headers)
+        return Response(body, status=status, headers=headers)
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Route cache hit / miss / eviction counters."""
+    try:
+        return success(routing_service.get_cache_stats())
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/snap', methods=['GET'])
+def snap_position():
+    """Snaps a GPS position (?lat=&lon=) to the nearest intersection / road."""
+    try:
+        lat, lon = common.snap_query(request.args)
+        return success(routing_service.snap_position(lat, lon))
+    except Exception as e:
+        return error_response(e)
 
 @routing_bp.route('/hospital/update-occupancy', methods=['PATCH'])
 def update_occupancy():
     """Allows simulating real-time capacity changes."""
     try:
-        data = request.get_json(force=True, silent=True)
-        if not data or 'hospital_id' not in data or 'new_occupancy' not in data:
-            return jsonify({"status": "error", "message": "Missing required fields"}), 400
-            
-        success = routing_service.update_hospital_occupancy(data['hospital_id'], data['new_occupancy'])
-        if success:
-            return jsonify({"status": "success", "message": "Occupancy updated successfully."}), 200
-        return jsonify({"status": "error", "message": "Hospital not found or data unchanged."}), 404
+        hospital_id, new_occupancy = common.occupancy_update(request.get_json(force=True, silent=True))
+        return common.occupancy_result(routing_service.update_hospital_occupancy(hospital_id, new_occupancy))
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/hospital/update-occupancy/bulk', methods=['PATCH'])
+def update_occupancy_bulk():
+    """Applies a burst of hospital occupancy reports in one database round-trip."""
+    try:
+        updates = common.occupancy_updates(request.get_json(force=True, silent=True))
+        return success(routing_service.update_hospital_occupancies(updates))
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/roads/update-weight', methods=['PATCH'])
+def update_road_weight():
+    """Applies a live traffic update (congestion / closure) to one road."""
+    try:
+        source, target, weight = common.road_weight_update(request.get_json(force=True, silent=True))
+        return common.road_weight_result(routing_service.update_road_weight(source, target, weight))
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return error_response(e)
+
+@routing_bp.route('/roads/update-weight/bulk', methods=['PATCH'])
+def update_road_weights_bulk():
+    """Applies many live traffic updates in one request."""
+    try:
+        updates = common.road_weight_updates(request.get_json(force=True, silent=True))
+        return success(routing_service.update_road_weights(updates))
+    except Exception as e:
+        return error_response(e)
 
 @routing_bp.route('/optimize-route', methods=['POST'])
 def optimize_route():
@@ -40,15 +89,61 @@ def optimize_route():
         if data is None:
             data = request.form.to_dict()
 
-        if not data or 'ambulance_location' not in data:
-            return jsonify({"status": "error", "message": "Missing 'ambulance_location'."}), 400
-            
-        ambulance_location = str(data['ambulance_location']).strip().upper()
-        
-        result = routing_service.find_optimal_hospital(ambulance_location)
-        return jsonify({"status": "success", "data": result}), 200
+        position, ambulance_location, departure_time = common.dispatch_request(data)
+        if position is not None:
+            # Raw GPS report: snap to the nearest road, then dispatch as usual
+            return success(routing_service.find_optimal_hospital_from_position(*position, departure_time))
+        return success(routing_service.find_optimal_hospital(ambulance_location, departure_time))
+    except Exception as e:
+        return error_response(e)
 
-    except ValueError as ve:
-        return jsonify({"status": "error", "message": str(ve)}), 404
+@routing_bp.route('/optimize-route/batch', methods=['POST'])
+def optimize_route_batch():
+    """Dispatches many ambulances in one request (mass-casualty incidents)."""
+    try:
+        ambulance_locations = common.ambulance_locations(request.get_json(force=True, silent=True))
+        return success(routing_service.find_optimal_hospitals_batch(ambulance_locations))
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/fleet/assign', methods=['POST'])
+def assign_fleet():
+    """Jointly assigns many ambulances to hospitals without exceeding free beds."""
+    try:
+        ambulance_locations = common.ambulance_locations(request.get_json(force=True, silent=True))
+        return success(fleet_service.assign_fleet(ambulance_locations))
+    except Exception as e:
+        return error_response(e)
+
+@routing_bp.route('/stream', methods=['GET'])
+def stream():
+    """
+    Server-sent events: `occupancy` on every capacity change, and `assignment` whenever the
+    best hospital for a registered ambulance changes (`?ambulance=<id>:<intersection>`, repeatable).
+    Each open stream holds one worker thread here, so at most STREAM_MAX_THREAD_SUBSCRIBERS
+    are served at once (503 beyond that); the ASGI app serves streams without a thread each.
+    """
+    try:
+        ambulances = stream_broker.parse_ambulances(request.args.getlist('ambulance'))
+        subscriber = stream_broker.subscribe(ambulances)
+    except Exception as e:
+        return error_response(e)
+
+    keepalive_seconds = stream_broker.keepalive_seconds
+
+    def event_stream():
+        try:
+            while not subscriber.closed:
+                yield common.stream_chunk(subscriber.next_frames(keepalive_seconds))
+        finally:
+            stream_broker.unsubscribe(subscriber)
+
+    return Response(stream_with_context(event_stream()), mimetype='text/event-stream', headers=common.STREAM_HEADERS)
+
+@routing_bp.route('/stream/stats', methods=['GET'])
+def get_stream_stats():
+    """Open subscribers, watched ambulances and fan-out counters."""
+    try:
+        return success(stream_broker.stats())
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
\ No newline at end of file
+        return error_response(e)
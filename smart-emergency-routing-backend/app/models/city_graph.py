@@ -1,16 +1,32 @@
 # app/models/city_graph.py
 
+import heapq
 import networkx as nx
-from typing import List, Dict, Tuple
+import numpy as np
+from typing import List, Dict, Tuple, Optional, Iterator, Callable
+from app.models.csr_graph import csgraph_travel_time_matrix
+from app.models.route_accelerator import RouteAccelerator
+from app.models.time_profiles import TimeProfiles
+from app.utils.metrics import GRAPH_SEARCH_SECONDS, GRAPH_SETTLED_NODES
 
 class CityGraph:
     def __init__(self):
         """Initializes the NetworkX graph."""
         self.graph = nx.Graph()
+        self._adjacency = None  # Cached SciPy export, dropped on every mutation
+
+        # Bumped on every mutation so preprocessing can tell when it went stale
+        self.version = 0
+        self.accelerator = None
+
+        # Time-of-day profiles; profiled roads carry their row as the 'profile' edge attribute
+        self.time_profiles: Optional[TimeProfiles] = None
 
     def add_intersections(self, nodes: List[str]):
         """Adds nodes (intersections/hospitals) to the city map."""
         self.graph.add_nodes_from(nodes)
+        self._adjacency = None
+        self.version += 1
 
     def add_roads(self, edges: List[Tuple[str, str, float]]):
         """
@@ -18,12 +34,81 @@ class CityGraph:
         Format of tuple: (Node_A, Node_B, Travel_Time_In_Minutes)
         """
         self.graph.add_weighted_edges_from(edges)
+        self._adjacency = None
+        self.version += 1
+
+    def update_road_weight(self, node_a: str, node_b: str, weight: float) -> float:
+        """
+        Changes a road's travel time in place (live traffic) and returns the old one.
+        Raises ValueError if the road does not exist.
+        """
+        if not self.graph.has_edge(node_a, node_b):
+            raise ValueError(f"Road not found in the city graph: {node_a} - {node_b}")
+        old_weight = self.graph[node_a][node_b].get('weight', 1)
+        self.graph[node_a][node_b]['weight'] = weight
+        self.version += 1
+        self.accelerator = None  # Built for the old weights: free it, queries fall back to Dijkstra
+
+        # Patch the cached SciPy export instead of dropping it
+        if self._adjacency is not None:
+            adjacency, _, node_index = self._adjacency
+            i, j = node_index[node_a], node_index[node_b]
+            adjacency[i, j] = weight
+            adjacency[j, i] = weight
+        return old_weight
+
+    def set_time_profiles(self, profiles: TimeProfiles, road_rows: Dict[Tuple[str, str], int]):
+        """Attaches time-of-day profiles: `road_rows` maps (node_a, node_b) to a row of `profiles`."""
+        for (node_a, node_b), row in road_rows.items():
+            if self.graph.has_edge(node_a, node_b):
+                self.graph[node_a][node_b]['profile'] = row
+        self.time_profiles = profiles if road_rows else None
+        self.version += 1
+
+    def profiled_roads(self) -> Dict[Tuple[str, str], int]:
+        """(node_a, node_b) -> profile row for every road with a time-of-day profile."""
+        return {(u, v): attrs['profile'] for u, v, attrs in self.graph.edges(data=True) if 'profile' in attrs}
+
+    def nodes(self) -> List[str]:
+        """Returns every intersection in the city map."""
+        return list(self.graph.nodes)
+
+    def has_node(self, node: str) -> bool:
+        return node in self.graph
+
+    def has_road(self, node_a: str, node_b: str) -> bool:
+        return self.graph.has_edge(node_a, node_b)
+
+    def road_time(self, node_a: str, node_b: str, departure_minute: Optional[float] = None) -> float:
+        """Travel time of one road, priced by its profile when entered at `departure_minute`; inf if absent."""
+        attrs = self.graph.get_edge_data(node_a, node_b)
+        if attrs is None:
+            return float('inf')
+        weight = attrs.get('weight', 1)
+        if departure_minute is not None and self.time_profiles is not None and 'profile' in attrs:
+            weight *= self.time_profiles.column(self.time_profiles.bucket(departure_minute))[attrs['profile']]
+        return weight
+
+    def neighbors(self, node: str) -> Iterator[Tuple[str, float]]:
+        """Yields (neighbor, travel_time) pairs for every road leaving `node`."""
+        for neighbor, attrs in self.graph[node].items():
+            yield neighbor, attrs.get('weight', 1)
+
+    def preprocess(self, landmarks: int = 8, contraction: bool = False):
+        """
+        Builds ALT landmark tables (and optionally a contraction hierarchy) for fast,
+        exact point-to-point queries. Used until the graph changes again.
+        """
+        self.accelerator = RouteAccelerator(self, landmarks=landmarks, contraction=contraction)
 
+    @GRAPH_SEARCH_SECONDS.time(backend="networkx", operation="calculate_travel_time")
     def calculate_travel_time(self, start_node: str, end_node: str) -> float:
         """
         Uses Dijkstra's algorithm to compute the shortest travel time.
         Raises an exception if no path exists.
         """
+        if self.accelerator and self.accelerator.is_fresh() and start_node in self.graph and end_node in self.graph:
+            return self.accelerator.shortest_path(start_node, end_node)[0]
         try:
             return nx.dijkstra_path_length(self.graph, start_node, end_node, weight='weight')
         except nx.NetworkXNoPath:
@@ -31,11 +116,104 @@ class CityGraph:
         except nx.NodeNotFound as e:
             raise ValueError(f"Node not found in the city graph: {str(e)}")
 
+    @GRAPH_SEARCH_SECONDS.time(backend="networkx", operation="get_shortest_path")
     def get_shortest_path(self, start_node: str, end_node: str) -> List[str]:
         """
         Returns the actual sequence of nodes (the route) for the frontend to render.
         """
+        if self.accelerator and self.accelerator.is_fresh() and start_node in self.graph and end_node in self.graph:
+            return self.accelerator.shortest_path(start_node, end_node)[1]
         try:
             return nx.dijkstra_path(self.graph, start_node, end_node, weight='weight')
         except (nx.NetworkXNoPath, nx.NodeNotFound):
-            return []
\ No newline at end of file
+            return []
+
+    @GRAPH_SEARCH_SECONDS.time(backend="networkx", operation="shortest_paths_to_targets")
+    def shortest_paths_to_targets(self, start_node: str, targets: Dict[str, float],
+                                  departure_minute: Optional[float] = None) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """
+        Single-source Dijkstra that settles many targets (e.g. hospitals) in ONE pass.
+        `targets` maps each target node to an additive penalty (e.g. its waiting time).
+        The search stops early once no unsettled target can beat the best
+        travel + penalty found so far.
+        With `departure_minute` (minute of day) it is time-dependent: a profiled road is
+        priced at the clock time the vehicle enters it (departure + travel so far).
+        Returns (travel times of the settled targets, predecessor tree).
+        """
+        if start_node not in self.graph:
+            raise ValueError(f"Node not found in the city graph: {start_node}")
+
+        # Targets that are missing or have an infinite penalty can never win
+        pending = {node: penalty for node, penalty in targets.items()
+                   if node in self.graph and penalty != float('inf')}
+        min_pending_penalty = min(pending.values(), default=float('inf'))
+        best_total = float('inf')
+
+        travel_times = {}
+        distances = {start_node: 0.0}
+        predecessors = {start_node: None}
+        settled = set()
+        heap = [(0.0, start_node)]
+        profiles = self.time_profiles if departure_minute is not None else None
+        # Settled distances only grow, so the bucket changes at most a few times per search
+        column, bucket_end = None, (-1.0 if profiles is not None else float('inf'))
+
+        while heap and pending:
+            dist, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            # Even the cheapest remaining target cannot improve on the current best
+            if dist + min_pending_penalty > best_total:
+                break
+            settled.add(node)
+
+            if node in pending:
+                penalty = pending.pop(node)
+                travel_times[node] = dist
+                best_total = min(best_total, dist + penalty)
+                min_pending_penalty = min(pending.values(), default=float('inf'))
+
+            if dist >= bucket_end:
+                # Roads out of `node` are entered at departure + dist: switch to that bucket's factors
+                column = profiles.column(profiles.bucket(departure_minute + dist))
+                bucket_end = profiles.bucket_end(departure_minute + dist) - departure_minute
+            for neighbor, attrs in self.graph[node].items():
+                weight = attrs.get('weight', 1)
+                if column is not None and 'profile' in attrs:
+                    weight *= column[attrs['profile']]
+                new_dist = dist + weight
+                if neighbor not in settled and new_dist < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_dist
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (new_dist, neighbor))
+
+        GRAPH_SETTLED_NODES.observe(len(settled), backend="networkx", operation="shortest_paths_to_targets")
+        return travel_times, predecessors
+
+    @GRAPH_SEARCH_SECONDS.time(backend="networkx", operation="travel_time_matrix")
+    def travel_time_matrix(self, sources: List[str], targets: List[str]) -> Tuple[np.ndarray, Callable[[int, int], List[str]]]:
+        """
+        Travel times from every source to every target in one compiled Dijkstra call.
+        Returns (len(sources) x len(targets) matrix, path(i, j) route function).
+        """
+        if self._adjacency is None:
+            node_ids = list(self.graph.nodes)
+            adjacency = nx.to_scipy_sparse_array(self.graph, nodelist=node_ids, weight='weight', format='csr')
+            # networkx may emit int64 indices, which older SciPy csgraph routines reject
+            adjacency.indices = adjacency.indices.astype(np.int32)
+            adjacency.indptr = adjacency.indptr.astype(np.int32)
+            self._adjacency = (adjacency, node_ids, {node: i for i, node in enumerate(node_ids)})
+        adjacency, node_ids, node_index = self._adjacency
+        return csgraph_travel_time_matrix(adjacency, node_ids, node_index, sources, targets)
+
+    @staticmethod
+    def reconstruct_path(predecessors: Dict[str, Optional[str]], end_node: str) -> List[str]:
+        """Walks a predecessor tree back from `end_node` to the search source."""
+        if end_node not in predecessors:
+            return []
+        path = []
+        node = end_node
+        while node is not None:
+            path.append(node)
+            node = predecessors[node]
+        return path[::-1]
@@ -0,0 +1,156 @@
+# app/models/contraction_hierarchy.py
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+class ContractionHierarchy:
+    def __init__(self, city_graph, witness_settle_limit: int = 50):
+        """
+        Contraction hierarchy preprocessing. Nodes are contracted from least to most
+        important; whenever removing a node would break a shortest path between two of
+        its neighbours, a shortcut edge is added. Queries then only ever walk "upwards".
+        """
+        self.witness_settle_limit = witness_settle_limit
+        self.rank: Dict[str, int] = {}
+        self.up: Dict[str, List[Tuple[str, float]]] = {}  # node -> higher-ranked neighbours
+        self.middle: Dict[Tuple[str, str], str] = {}       # shortcut -> contracted node it skips
+        self.shortcuts = 0
+
+        adjacency: Dict[str, Dict[str, float]] = {node: {} for node in city_graph.nodes()}
+        for node in adjacency:
+            for neighbor, weight in city_graph.neighbors(node):
+                if neighbor != node and weight < adjacency[node].get(neighbor, float('inf')):
+                    adjacency[node][neighbor] = weight
+        self._contract_all(adjacency)
+
+    def _contract_all(self, adjacency: Dict[str, Dict[str, float]]):
+        contracted_neighbors = defaultdict(int)
+
+        def priority(node: str) -> int:
+            # Edge difference + how many neighbours are already gone (spreads contraction out)
+            return len(self._witness_shortcuts(adjacency, node)) - len(adjacency[node]) + contracted_neighbors[node]
+
+        heap = [(priority(node), node) for node in adjacency]
+        heapq.heapify(heap)
+
+        while heap:
+            _, node = heapq.heappop(heap)
+            # Lazy update: re-check the priority, postpone if it got worse
+            current = priority(node)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+
+            new_edges = self._witness_shortcuts(adjacency, node)
+            self.rank[node] = len(self.rank)
+            self.up[node] = list(adjacency[node].items())
+
+            for neighbor in adjacency[node]:
+                del adjacency[neighbor][node]
+                contracted_neighbors[neighbor] += 1
+            for node_a, node_b, weight in new_edges:
+                if weight < adjacency[node_a].get(node_b, float('inf')):
+                    adjacency[node_a][node_b] = weight
+                    adjacency[node_b][node_a] = weight
+                    self.middle[self._key(node_a, node_b)] = node
+                    self.shortcuts += 1
+            del adjacency[node]
+
+    def _witness_shortcuts(self, adjacency: Dict[str, Dict[str, float]], node: str) -> List[Tuple[str, str, float]]:
+        """Shortcuts needed to contract `node`: pairs of neighbours with no cheaper detour."""
+        neighbors = list(adjacency[node].items())
+        needed = []
+        for i, (source, source_weight) in enumerate(neighbors):
+            targets = {target: source_weight + target_weight for target, target_weight in neighbors[i + 1:]}
+            if not targets:
+                continue
+            witness = self._limited_dijkstra(adjacency, source, node, max(targets.values()))
+            needed.extend((source, target, via) for target, via in targets.items()
+                          if witness.get(target, float('inf')) > via)
+        return needed
+
+    def _limited_dijkstra(self, adjacency: Dict[str, Dict[str, float]], source: str,
+                          excluded: str, max_distance: float) -> Dict[str, float]:
+        distances = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while heap and settled < self.witness_settle_limit:
+            dist, node = heapq.heappop(heap)
+            if dist > distances[node]:
+                continue
+            if dist > max_distance:
+                break
+            settled += 1
+            for neighbor, weight in adjacency[node].items():
+                new_dist = dist + weight
+                if neighbor != excluded and new_dist < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_dist
+                    heapq.heappush(heap, (new_dist, neighbor))
+        return distances
+
+    def query(self, start_node: str, end_node: str) -> Tuple[float, List[str], int]:
+        """
+        Bidirectional upward Dijkstra. Returns (travel time, unpacked route, settled nodes);
+        inf / [] when unreachable.
+        """
+        distances = ({start_node: 0.0}, {end_node: 0.0})
+        predecessors = ({start_node: None}, {end_node: None})
+        heaps = ([(0.0, start_node)], [(0.0, end_node)])
+        best, meeting_node, settled = float('inf'), None, 0
+
+        while True:
+            # Pick the direction with the smaller frontier that can still improve `best`
+            open_sides = [side for side in (0, 1) if heaps[side] and heaps[side][0][0] < best]
+            if not open_sides:
+                break
+            side = min(open_sides, key=lambda s: heaps[s][0][0])
+            dist, node = heapq.heappop(heaps[side])
+            if dist > distances[side][node]:
+                continue
+            settled += 1
+
+            other = distances[1 - side]
+            if node in other and dist + other[node] < best:
+                best, meeting_node = dist + other[node], node
+
+            for neighbor, weight in self.up[node]:
+                new_dist = dist + weight
+                if new_dist < distances[side].get(neighbor, float('inf')):
+                    distances[side][neighbor] = new_dist
+                    predecessors[side][neighbor] = node
+                    heapq.heappush(heaps[side], (new_dist, neighbor))
+
+        if meeting_node is None:
+            return float('inf'), [], settled
+
+        upward = []
+        node = meeting_node
+        while node is not None:
+            upward.append(node)
+            node = predecessors[0][node]
+        upward.reverse()
+        node = predecessors[1][meeting_node]
+        while node is not None:
+            upward.append(node)
+            node = predecessors[1][node]
+        return best, self._unpack(upward), settled
+
+    def _unpack(self, route: List[str]) -> List[str]:
+        """Expands shortcut edges back into the original intersections."""
+        unpacked = [route[0]]
+        for node_a, node_b in zip(route, route[1:]):
+            stack = [(node_a, node_b)]
+            while stack:
+                u, v = stack.pop()
+                middle = self.middle.get(self._key(u, v))
+                if middle is None:
+                    unpacked.append(v)
+                else:
+                    stack.append((middle, v))
+                    stack.append((u, middle))
+        return unpacked
+
+    @staticmethod
+    def _key(node_a: str, node_b: str) -> Tuple[str, str]:
+        return (node_a, node_b) if node_a <= node_b else (node_b, node_a)
@@ -0,0 +1,434 @@
+# app/models/csr_graph.py
+
+import heapq
+import numpy as np
+from collections import OrderedDict
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from typing import List, Dict, Tuple, Optional, Iterator, Callable
+from app.models.route_accelerator import RouteAccelerator
+from app.models.time_profiles import TimeProfiles
+from app.utils.metrics import GRAPH_SEARCH_SECONDS, GRAPH_SETTLED_NODES
+
+def csgraph_travel_time_matrix(adjacency: csr_matrix, node_ids: List[str], node_index: Dict[str, int],
+                               sources: List[str], targets: List[str]) -> Tuple[np.ndarray, Callable[[int, int], List[str]]]:
+    """
+    Many-source travel times computed by SciPy's compiled Dijkstra in one call.
+    Returns a len(sources) x len(targets) matrix (inf when unreachable or unknown)
+    and a `path(i, j)` function giving the route from sources[i] to targets[j].
+    """
+    matrix = np.full((len(sources), len(targets)), float('inf'))
+    rows = [node_index[source] for source in sources if source in node_index]
+    if not rows or not targets:
+        return matrix, lambda i, j: []
+
+    distances, predecessors = dijkstra(adjacency, directed=True, indices=rows, return_predecessors=True)
+    known_sources = [i for i, source in enumerate(sources) if source in node_index]
+    known_targets = [j for j, target in enumerate(targets) if target in node_index]
+    columns = [node_index[targets[j]] for j in known_targets]
+    matrix[np.ix_(known_sources, known_targets)] = distances[:, columns]
+
+    source_row = {i: row for row, i in enumerate(known_sources)}
+
+    def path(i: int, j: int) -> List[str]:
+        if matrix[i, j] == float('inf'):
+            return []
+        tree = predecessors[source_row[i]]
+        route = []
+        node = node_index[targets[j]]
+        while node >= 0:
+            route.append(node_ids[node])
+            node = tree[node]
+        return route[::-1]
+
+    return matrix, path
+
+# A trip rarely spans more than a few 15-minute buckets
+_BUCKET_CACHE_SIZE = 4
+
+class CSRCityGraph:
+    def __init__(self):
+        """
+        Compact, array-backed drop-in for CityGraph on large road networks.
+        Node IDs are interned to integers and roads are stored in NumPy CSR arrays
+        (indptr / indices / weights), so memory stays a few bytes per road instead of
+        one Python dict per node and edge.
+        """
+        self._node_index: Dict[str, int] = {}
+        self._node_ids: List[str] = []
+
+        # Undirected roads, one entry per road, as added by the caller
+        self._edge_src = np.empty(0, dtype=np.int32)
+        self._edge_dst = np.empty(0, dtype=np.int32)
+        self._edge_weight = np.empty(0, dtype=np.float64)
+
+        # CSR adjacency (each road appears in both directions)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.weights = np.empty(0, dtype=np.float64)
+        self._arc_edge = np.empty(0, dtype=np.int32)  # CSR position -> road index
+
+        # Time-of-day profiles: per road (and per CSR entry) the profile row, -1 = static
+        self.time_profiles: Optional[TimeProfiles] = None
+        self._edge_profile: Optional[np.ndarray] = None
+        self._arc_profile: Optional[np.ndarray] = None
+        # Full CSR weight arrays for the most recently searched buckets, so a time-dependent
+        # relaxation costs the same as a static one; bounded to a few arrays
+        self._bucket_weights: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+        # Bumped on every mutation so preprocessing can tell when it went stale
+        self.version = 0
+        self.accelerator = None
+
+    @classmethod
+    def from_arrays(cls, node_ids: List[str], arrays: Dict[str, np.ndarray]) -> "CSRCityGraph":
+        """Wraps prebuilt arrays (e.g. a memory-mapped snapshot) without copying them."""
+        city = cls()
+        city._node_ids = list(node_ids)
+        city._node_index = {node: i for i, node in enumerate(city._node_ids)}
+        city._edge_src, city._edge_dst, city._edge_weight = arrays["edge_src"], arrays["edge_dst"], arrays["edge_weight"]
+        city.indptr, city.indices, city.weights = arrays["indptr"], arrays["indices"], arrays["weights"]
+        city._arc_edge = arrays["arc_edge"]
+        if "edge_profile" in arrays:
+            city.time_profiles = TimeProfiles.from_table(arrays["profile_table"])
+            city._edge_profile = arrays["edge_profile"]
+            city._arc_profile = city._edge_profile[city._arc_edge]
+        return city
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The arrays from_arrays() needs, in the order they are stored on disk."""
+        arrays = {
+            "edge_src": self._edge_src,
+            "edge_dst": self._edge_dst,
+            "edge_weight": self._edge_weight,
+            "indptr": self.indptr,
+            "indices": self.indices,
+            "weights": self.weights,
+            "arc_edge": self._arc_edge
+        }
+        if self.time_profiles is not None:
+            arrays["edge_profile"] = self._edge_profile
+            arrays["profile_table"] = self.time_profiles.table()
+        return arrays
+
+    def add_intersections(self, nodes: List[str]):
+        """Adds nodes (intersections/hospitals) to the city map."""
+        for node in nodes:
+            self._intern(node)
+        self._rebuild_csr()
+        self.version += 1
+
+    def add_roads(self, edges: List[Tuple[str, str, float]]):
+        """
+        Adds edges (roads) between nodes.
+        Format of tuple: (Node_A, Node_B, Travel_Time_In_Minutes)
+        Re-adding an existing road overwrites its travel time, like nx.Graph does.
+        """
+        if not edges:
+            return
+        src = np.fromiter((self._intern(u) for u, _, _ in edges), dtype=np.int32, count=len(edges))
+        dst = np.fromiter((self._intern(v) for _, v, _ in edges), dtype=np.int32, count=len(edges))
+        weight = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+        self._merge_roads(src, dst, weight)
+
+    @classmethod
+    def from_edge_arrays(cls, node_ids: List[str], src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> "CSRCityGraph":
+        """
+        Builds a graph from already-interned roads (indices into `node_ids`), e.g. from a
+        streaming import, without materializing one Python tuple per road.
+        """
+        city = cls()
+        city._node_ids = list(node_ids)
+        city._node_index = {node: i for i, node in enumerate(city._node_ids)}
+        city._merge_roads(np.asarray(src, dtype=np.int32), np.asarray(dst, dtype=np.int32), np.asarray(weight, dtype=np.float64))
+        return city
+
+    def _merge_roads(self, src: np.ndarray, dst: np.ndarray, weight: np.ndarray):
+        src = np.concatenate([self._edge_src, src])
+        dst = np.concatenate([self._edge_dst, dst])
+        weight = np.concatenate([self._edge_weight, weight])
+        if self._edge_profile is not None:
+            profile = np.concatenate([self._edge_profile, np.full(len(src) - len(self._edge_profile), -1, dtype=np.int16)])
+
+        # Keep only the LAST weight given for each undirected road
+        lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+        keys = lo.astype(np.int64) * max(len(self._node_ids), 1) + hi
+        _, last_from_end = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - last_from_end)
+
+        self._edge_src, self._edge_dst, self._edge_weight = lo[keep], hi[keep], weight[keep]
+        if self._edge_profile is not None:
+            self._edge_profile = profile[keep]
+        self._rebuild_csr()
+        self.version += 1
+
+    def update_road_weight(self, node_a: str, node_b: str, weight: float) -> float:
+        """
+        Changes a road's travel time in place (live traffic) and returns the old one.
+        Only the two CSR entries of the road are touched, no rebuild.
+        Raises ValueError if the road does not exist.
+        """
+        u, v = self._node_index.get(node_a), self._node_index.get(node_b)
+        if u is None or v is None:
+            raise ValueError(f"Road not found in the city graph: {node_a} - {node_b}")
+        start, end = self.indptr[u], self.indptr[u + 1]
+        hits = np.flatnonzero(self.indices[start:end] == v)
+        if not len(hits):
+            raise ValueError(f"Road not found in the city graph: {node_a} - {node_b}")
+
+        edge = self._arc_edge[start + hits[0]]
+        old_weight = float(self._edge_weight[edge])
+        self._edge_weight[edge] = weight
+        arcs = [start + hits[0]]
+        if u != v:
+            start, end = self.indptr[v], self.indptr[v + 1]
+            arcs.append(start + np.flatnonzero(self.indices[start:end] == u)[0])
+        self.weights[arcs] = weight
+        for bucket, bucket_weights in self._bucket_weights.items():
+            bucket_weights[arcs] = weight * self.time_profiles.arc_factors(bucket, self._arc_profile[arcs])
+        self.version += 1
+        self.accelerator = None  # Built for the old weights: free it, queries fall back to Dijkstra
+        return old_weight
+
+    def set_time_profiles(self, profiles: TimeProfiles, road_rows: Dict[Tuple[str, str], int]):
+        """Attaches time-of-day profiles: `road_rows` maps (node_a, node_b) to a row of `profiles`."""
+        if not road_rows:
+            self.time_profiles = self._edge_profile = self._arc_profile = None
+            self.version += 1
+            return
+        # int16 rows: 2 bytes per road, plus one shared row per distinct curve
+        edge_profile = np.full(len(self._edge_src), -1, dtype=np.int16)
+        size = max(len(self._node_ids), 1)
+        keys = self._edge_src.astype(np.int64) * size + self._edge_dst
+        order = np.argsort(keys)
+        for (node_a, node_b), row in road_rows.items():
+            u, v = self._node_index.get(node_a), self._node_index.get(node_b)
+            if u is None or v is None:
+                continue
+            key = min(u, v) * size + max(u, v)
+            position = np.searchsorted(keys, key, sorter=order)
+            if position < len(keys) and keys[order[position]] == key:
+                edge_profile[order[position]] = row
+        self.time_profiles = profiles
+        self._edge_profile = edge_profile
+        self._arc_profile = edge_profile[self._arc_edge]
+        self._bucket_weights.clear()
+        self.version += 1
+
+    def profiled_roads(self) -> Dict[Tuple[str, str], int]:
+        """(node_a, node_b) -> profile row for every road with a time-of-day profile."""
+        if self._edge_profile is None:
+            return {}
+        return {(self._node_ids[self._edge_src[e]], self._node_ids[self._edge_dst[e]]): int(self._edge_profile[e])
+                for e in np.flatnonzero(self._edge_profile >= 0)}
+
+    def nodes(self) -> List[str]:
+        """Returns every intersection in the city map."""
+        return list(self._node_ids)
+
+    def has_node(self, node: str) -> bool:
+        return node in self._node_index
+
+    def has_road(self, node_a: str, node_b: str) -> bool:
+        u, v = self._node_index.get(node_a), self._node_index.get(node_b)
+        if u is None or v is None:
+            return False
+        return bool((self.indices[self.indptr[u]:self.indptr[u + 1]] == v).any())
+
+    def road_time(self, node_a: str, node_b: str, departure_minute: Optional[float] = None) -> float:
+        """Travel time of one road, priced by its profile when entered at `departure_minute`; inf if absent."""
+        u, v = self._node_index.get(node_a), self._node_index.get(node_b)
+        if u is None or v is None:
+            return float('inf')
+        start, end = self.indptr[u], self.indptr[u + 1]
+        hits = np.flatnonzero(self.indices[start:end] == v)
+        if not len(hits):
+            return float('inf')
+        if departure_minute is not None and self.time_profiles is not None:
+            return float(self._weights_at(TimeProfiles.bucket(departure_minute))[start + hits[0]])
+        return float(self.weights[start + hits[0]])
+
+    def neighbors(self, node: str) -> Iterator[Tuple[str, float]]:
+        """Yields (neighbor, travel_time) pairs for every road leaving `node`."""
+        u = self._node_index[node]
+        start, end = self.indptr[u], self.indptr[u + 1]
+        for v, weight in zip(self.indices[start:end].tolist(), self.weights[start:end].tolist()):
+            yield self._node_ids[v], weight
+
+    def preprocess(self, landmarks: int = 8, contraction: bool = False):
+        """
+        Builds ALT landmark tables (and optionally a contraction hierarchy) for fast,
+        exact point-to-point queries. Used until the graph changes again.
+        """
+        self.accelerator = RouteAccelerator(self, landmarks=landmarks, contraction=contraction)
+
+    @GRAPH_SEARCH_SECONDS.time(backend="csr", operation="calculate_travel_time")
+    def calculate_travel_time(self, start_node: str, end_node: str) -> float:
+        """
+        Uses Dijkstra's algorithm to compute the shortest travel time.
+        Returns inf if no path exists, raises ValueError for unknown nodes.
+        """
+        source, target = self._lookup(start_node), self._lookup(end_node)
+        if self.accelerator and self.accelerator.is_fresh():
+            return self.accelerator.shortest_path(start_node, end_node)[0]
+        distances, _ = self._dijkstra(source, {target: 0.0})
+        return distances.get(target, float('inf'))
+
+    @GRAPH_SEARCH_SECONDS.time(backend="csr", operation="get_shortest_path")
+    def get_shortest_path(self, start_node: str, end_node: str) -> List[str]:
+        """
+        Returns the actual sequence of nodes (the route) for the frontend to render.
+        """
+        if start_node not in self._node_index or end_node not in self._node_index:
+            return []
+        if self.accelerator and self.accelerator.is_fresh():
+            return self.accelerator.shortest_path(start_node, end_node)[1]
+        source, target = self._node_index[start_node], self._node_index[end_node]
+        distances, predecessors = self._dijkstra(source, {target: 0.0})
+        if target not in distances:
+            return []
+        return self._unwind(predecessors, target)
+
+    @GRAPH_SEARCH_SECONDS.time(backend="csr", operation="shortest_paths_to_targets")
+    def shortest_paths_to_targets(self, start_node: str, targets: Dict[str, float],
+                                  departure_minute: Optional[float] = None) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """
+        Single-source Dijkstra that settles many targets (e.g. hospitals) in ONE pass.
+        Same contract as CityGraph.shortest_paths_to_targets, including the time-dependent mode.
+        """
+        source = self._lookup(start_node)
+        pending = {self._node_index[node]: penalty for node, penalty in targets.items()
+                   if node in self._node_index and penalty != float('inf')}
+        distances, predecessors = self._dijkstra(source, pending, departure_minute)
+
+        travel_times = {self._node_ids[t]: distances[t] for t in pending if t in distances}
+        node_predecessors = {}
+        for target in travel_times:
+            node = self._node_index[target]
+            while node is not None and self._node_ids[node] not in node_predecessors:
+                parent = predecessors[node]
+                node_predecessors[self._node_ids[node]] = self._node_ids[parent] if parent is not None else None
+                node = parent
+        return travel_times, node_predecessors
+
+    @GRAPH_SEARCH_SECONDS.time(backend="csr", operation="travel_time_matrix")
+    def travel_time_matrix(self, sources: List[str], targets: List[str]) -> Tuple[np.ndarray, Callable[[int, int], List[str]]]:
+        """
+        Travel times from every source to every target in one compiled Dijkstra call.
+        Returns (len(sources) x len(targets) matrix, path(i, j) route function).
+        """
+        adjacency = csr_matrix((self.weights, self.indices, self.indptr), shape=(len(self._node_ids),) * 2)
+        return csgraph_travel_time_matrix(adjacency, self._node_ids, self._node_index, sources, targets)
+
+    @staticmethod
+    def reconstruct_path(predecessors: Dict[str, Optional[str]], end_node: str) -> List[str]:
+        """Walks a predecessor tree back from `end_node` to the search source."""
+        if end_node not in predecessors:
+            return []
+        path = []
+        node = end_node
+        while node is not None:
+            path.append(node)
+            node = predecessors[node]
+        return path[::-1]
+
+    def _intern(self, node: str) -> int:
+        index = self._node_index.get(node)
+        if index is None:
+            index = len(self._node_ids)
+            self._node_index[node] = index
+            self._node_ids.append(node)
+        return index
+
+    def _lookup(self, node: str) -> int:
+        if node not in self._node_index:
+            raise ValueError(f"Node not found in the city graph: {node}")
+        return self._node_index[node]
+
+    def _rebuild_csr(self):
+        """Expands the undirected road list into sorted CSR adjacency arrays."""
+        loops = self._edge_src == self._edge_dst
+        src = np.concatenate([self._edge_src, self._edge_dst[~loops]])
+        dst = np.concatenate([self._edge_dst, self._edge_src[~loops]])
+        weight = np.concatenate([self._edge_weight, self._edge_weight[~loops]])
+        edge_ids = np.arange(len(self._edge_src), dtype=np.int32)
+        arc_edge = np.concatenate([edge_ids, edge_ids[~loops]])
+
+        order = np.argsort(src, kind='stable')
+        self.indices = dst[order]
+        self.weights = weight[order]
+        self._arc_edge = arc_edge[order]
+        if self._edge_profile is not None:
+            self._arc_profile = self._edge_profile[self._arc_edge]
+        self._bucket_weights.clear()
+        self.indptr = np.zeros(len(self._node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(self._node_ids)), out=self.indptr[1:])
+
+    def _dijkstra(self, source: int, targets: Dict[int, float],
+                  departure_minute: Optional[float] = None) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+        """
+        Heap-based Dijkstra over the CSR arrays. `targets` maps node index -> additive
+        penalty; the search stops once no unsettled target can beat the best total.
+        With `departure_minute`, profiled roads are priced at the time they are entered.
+        Returns (distances of the settled targets, predecessor tree).
+        """
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        # Settled distances only grow, so the bucket changes at most a few times per search
+        time_dependent = departure_minute is not None and self.time_profiles is not None
+        bucket_end = -1.0 if time_dependent else float('inf')
+        pending = dict(targets)
+        min_pending_penalty = min(pending.values(), default=float('inf'))
+        best_total = float('inf')
+
+        distances = {source: 0.0}
+        predecessors = {source: None}
+        settled = set()
+        heap = [(0.0, source)]
+
+        while heap and pending:
+            dist, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            if dist + min_pending_penalty > best_total:
+                break
+            settled.add(u)
+
+            if u in pending:
+                best_total = min(best_total, dist + pending.pop(u))
+                min_pending_penalty = min(pending.values(), default=float('inf'))
+
+            start, end = int(indptr[u]), int(indptr[u + 1])
+            if dist >= bucket_end:
+                # Roads out of u are entered at departure + dist: switch to that bucket's weights
+                weights = self._weights_at(TimeProfiles.bucket(departure_minute + dist))
+                bucket_end = TimeProfiles.bucket_end(departure_minute + dist) - departure_minute
+            for v, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+                new_dist = dist + weight
+                if v not in settled and new_dist < distances.get(v, float('inf')):
+                    distances[v] = new_dist
+                    predecessors[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+
+        GRAPH_SETTLED_NODES.observe(len(settled), backend="csr", operation="dijkstra")
+        settled_targets = {node: distances[node] for node in targets if node in settled}
+        return settled_targets, predecessors
+
+    def _weights_at(self, bucket: int) -> np.ndarray:
+        """CSR weights with every profiled road scaled to `bucket` (LRU of _BUCKET_CACHE_SIZE arrays)."""
+        bucket_weights = self._bucket_weights.get(bucket)
+        if bucket_weights is None:
+            bucket_weights = self.weights * self.time_profiles.arc_factors(bucket, self._arc_profile)
+            self._bucket_weights[bucket] = bucket_weights
+            if len(self._bucket_weights) > _BUCKET_CACHE_SIZE:
+                self._bucket_weights.popitem(last=False)
+        else:
+            self._bucket_weights.move_to_end(bucket)
+        return bucket_weights
+
+    def _unwind(self, predecessors: Dict[int, Optional[int]], target: int) -> List[str]:
+        path = []
+        node = target
+        while node is not None:
+            path.append(self._node_ids[node])
+            node = predecessors[node]
+        return path[::-1]
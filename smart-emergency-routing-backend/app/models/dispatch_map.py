@@ -0,0 +1,218 @@
+# app/models/dispatch_map.py
+
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Any, Tuple
+from app.models.city_graph import CityGraph
+from app.models.hospital import Hospital
+
+# Improvements smaller than this are float noise, not a better route
+_EPSILON = 1e-9
+
+class DispatchMap:
+    def __init__(self, city_graph: CityGraph, hospitals: Dict[str, Hospital]):
+        """
+        Precomputed "best hospital per intersection" map.
+        A single multi-source Dijkstra is seeded at every hospital with its waiting time,
+        so each node ends up labelled with the hospital minimising travel + waiting time.
+        """
+        self.city_graph = city_graph
+        self.hospitals = hospitals
+        self.cost: Dict[str, float] = {}               # node -> total response time
+        self.owner: Dict[str, str] = {}                # node -> winning hospital_id
+        self.next_hop: Dict[str, Optional[str]] = {}   # node -> next node towards the hospital
+        self._children: Dict[str, Set[str]] = defaultdict(set)
+        self._changed: Set[str] = set()
+        self._counter = itertools.count()
+        self.build()
+
+    @classmethod
+    def from_labels(cls, city_graph: CityGraph, hospitals: Dict[str, Hospital],
+                    labels: Dict[str, Tuple[float, str, Optional[str]]],
+                    waiting_times: Dict[str, float]) -> "DispatchMap":
+        """
+        Restores a map computed earlier (e.g. from a graph snapshot) instead of rebuilding it.
+        `labels` maps node -> (cost, owner, next_hop) and `waiting_times` holds the waits the
+        labels were computed with; hospitals whose wait changed since are repaired.
+        """
+        dispatch_map = cls.__new__(cls)
+        dispatch_map.city_graph = city_graph
+        dispatch_map.hospitals = hospitals
+        dispatch_map.cost, dispatch_map.owner, dispatch_map.next_hop = {}, {}, {}
+        dispatch_map._children = defaultdict(set)
+        dispatch_map._changed = set()
+        dispatch_map._counter = itertools.count()
+
+        if any(owner not in hospitals for _, owner, _ in labels.values()):
+            dispatch_map.build()
+            return dispatch_map
+
+        for node, (cost, owner, next_hop) in labels.items():
+            dispatch_map.cost[node] = cost
+            dispatch_map.owner[node] = owner
+            dispatch_map.next_hop[node] = next_hop
+            if next_hop is not None:
+                dispatch_map._children[next_hop].add(node)
+
+        for hospital_id, hospital in hospitals.items():
+            if waiting_times.get(hospital_id) != hospital.calculate_waiting_time():
+                dispatch_map.update_hospital(hospital_id)
+        return dispatch_map
+
+    def build(self):
+        """Computes the whole map from scratch."""
+        self.cost.clear()
+        self.owner.clear()
+        self.next_hop.clear()
+        self._children.clear()
+        heap = []
+        for hospital_id in self.hospitals:
+            self._push_seed(heap, hospital_id)
+        self._propagate(heap)
+        self._changed.clear()
+
+    def update_hospital(self, hospital_id: str) -> Set[str]:
+        """
+        Incrementally repairs the map after a hospital's waiting time changed.
+        Only the region currently served by that hospital is recomputed; a lower waiting
+        time then spreads outwards into neighbouring regions on its own.
+        Returns the set of nodes whose label changed.
+        """
+        region = set()
+        if self.owner.get(hospital_id) == hospital_id and self.next_hop.get(hospital_id) is None:
+            region = self._subtree(hospital_id)
+        seeds = []
+        self._push_seed(seeds, hospital_id)
+        return self._repair(region, seeds)
+
+    def update_road(self, node_a: str, node_b: str, old_weight: float, new_weight: float) -> Set[str]:
+        """
+        Dynamic shortest-path repair after a road's travel time changed in the graph.
+        A faster road is pushed outwards from its cheaper end; a slower road only
+        invalidates the subtree that was routed through it.
+        Returns the set of nodes whose label changed.
+        """
+        if new_weight < old_weight:
+            seeds = []
+            for tail, head in ((node_a, node_b), (node_b, node_a)):
+                if tail in self.cost and self.cost[tail] + new_weight < self.cost.get(head, float('inf')) - _EPSILON:
+                    seeds.append((self.cost[tail] + new_weight, next(self._counter), head, tail, self.owner[tail]))
+            return self._repair(set(), seeds)
+
+        if new_weight > old_weight:
+            for tail, head in ((node_a, node_b), (node_b, node_a)):
+                if self.next_hop.get(head) == tail and tail != head:
+                    return self._repair(self._subtree(head))
+        return set()
+
+    def lookup(self, node: str) -> Optional[Dict[str, Any]]:
+        """Returns the precomputed dispatch decision for `node`, or None if it is not covered."""
+        if node not in self.owner:
+            return None
+        hospital_id = self.owner[node]
+        waiting_time = self.hospitals[hospital_id].calculate_waiting_time()
+        return {
+            "hospital_id": hospital_id,
+            "route_nodes": self.route_from(node),
+            "travel_time": self.cost[node] - waiting_time,
+            "waiting_time": waiting_time,
+            "total_time": self.cost[node]
+        }
+
+    def route_from(self, node: str) -> List[str]:
+        """Follows the next hops from `node` down to its assigned hospital."""
+        if node not in self.owner:
+            return []
+        route = [node]
+        while self.next_hop[route[-1]] is not None:
+            route.append(self.next_hop[route[-1]])
+        return route
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Serializes the full map for the Flask JSON response."""
+        return {
+            node: {
+                "hospital_id": hospital_id,
+                "next_hop": self.next_hop[node],
+                "total_response_time_mins": round(self.cost[node], 2)
+            }
+            for node, hospital_id in self.owner.items()
+        }
+
+    def _push_seed(self, heap: list, hospital_id: str):
+        if not self.city_graph.has_node(hospital_id):
+            return
+        waiting_time = self.hospitals[hospital_id].calculate_waiting_time()
+        if waiting_time != float('inf'):
+            heapq.heappush(heap, (waiting_time, next(self._counter), hospital_id, None, hospital_id))
+
+    def _subtree(self, root: str) -> Set[str]:
+        """All nodes whose route to their hospital passes through `root` (root included)."""
+        region = {root}
+        stack = [root]
+        while stack:
+            for child in self._children.get(stack.pop(), ()):
+                if child not in region:
+                    region.add(child)
+                    stack.append(child)
+        return region
+
+    def _repair(self, region: Set[str], seeds: Optional[list] = None) -> Set[str]:
+        """
+        Drops the labels of `region` and re-runs Dijkstra from its boundary only.
+        Labels outside the region are kept and are only ever overwritten by strictly
+        better ones, so untouched parts of the city cost nothing.
+        """
+        self._changed = set()
+        previous = {node: (self.owner.get(node), self.cost.get(node)) for node in region}
+
+        # 1. Invalidate the region
+        for node in region:
+            parent = self.next_hop.pop(node, None)
+            if parent is not None and parent not in region:
+                self._children[parent].discard(node)
+            self._children.pop(node, None)
+            self.cost.pop(node, None)
+            self.owner.pop(node, None)
+
+        # 2. Seed from the still-valid boundary and from any hospital inside the region
+        heap = list(seeds or [])
+        heapq.heapify(heap)
+        for node in region:
+            for neighbor, weight in self.city_graph.neighbors(node):
+                if neighbor in self.cost:
+                    heapq.heappush(heap, (self.cost[neighbor] + weight, next(self._counter), node, neighbor, self.owner[neighbor]))
+            if node in self.hospitals:
+                self._push_seed(heap, node)
+
+        # 3. Re-run the search; an improved label may also spill past the region
+        self._propagate(heap)
+
+        for node, label in previous.items():
+            if (self.owner.get(node), self.cost.get(node)) == label:
+                self._changed.discard(node)
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def _propagate(self, heap: list):
+        while heap:
+            cost, _, node, parent, owner = heapq.heappop(heap)
+            if cost >= self.cost.get(node, float('inf')) - _EPSILON:
+                continue
+            self._set_label(node, cost, parent, owner)
+            for neighbor, weight in self.city_graph.neighbors(node):
+                new_cost = cost + weight
+                if new_cost < self.cost.get(neighbor, float('inf')) - _EPSILON:
+                    heapq.heappush(heap, (new_cost, next(self._counter), neighbor, node, owner))
+
+    def _set_label(self, node: str, cost: float, parent: Optional[str], owner: str):
+        old_parent = self.next_hop.get(node)
+        if old_parent is not None:
+            self._children[old_parent].discard(node)
+        if parent is not None:
+            self._children[parent].add(node)
+        self.cost[node] = cost
+        self.owner[node] = owner
+        self.next_hop[node] = parent
+        self._changed.add(node)
@@ -16,22 +16,36 @@ class Hospital:
         self.capacity = capacity
         self.current_occupancy = current_occupancy
 
+    def update_occupancy(self, new_occupancy: int):
+        """Applies a live occupancy report in place, with the same validation as on creation."""
+        if new_occupancy < 0:
+            raise ValueError("Occupancy cannot be negative.")
+        self.current_occupancy = new_occupancy
+
     @property
     def occupancy_ratio(self) -> float:
         """Calculates the Oh (Occupancy Ratio)."""
         return self.current_occupancy / self.capacity
 
-    def calculate_waiting_time(self, alpha: float = 10.0) -> float:
+    @property
+    def remaining_beds(self) -> int:
+        """Beds still free before the hospital hits capacity."""
+        return max(self.capacity - self.current_occupancy, 0)
+
+    def calculate_waiting_time(self, alpha: float = 10.0, additional_patients: int = 0) -> float:
         """
         Calculates the estimated waiting time based on current occupancy.
         This represents the alpha * Oh portion of the mathematical model.
+        `additional_patients` prices in ambulances already heading to this hospital.
         Returns waiting time in minutes.
         """
+        occupancy = self.current_occupancy + additional_patients
+
         # If the hospital is overflowing, the wait time spikes exponentially
-        if self.current_occupancy >= self.capacity:
+        if occupancy >= self.capacity:
             return float('inf') 
             
-        return alpha * self.occupancy_ratio
+        return alpha * occupancy / self.capacity
 
     def to_dict(self) -> dict:
         """Serializes the object for the Flask JSON response."""
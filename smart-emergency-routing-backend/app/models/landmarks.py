@@ -0,0 +1,93 @@
+# app/models/landmarks.py
+
+import heapq
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+def astar(city_graph, start_node: str, end_node: str,
+          heuristic: Callable[[str], float]) -> Tuple[float, List[str], int]:
+    """
+    A* over any graph exposing neighbors(). With a consistent heuristic the result is
+    exact; with heuristic = 0 it is plain Dijkstra.
+    Returns (travel time, route, number of settled nodes). inf / [] if unreachable.
+    """
+    distances = {start_node: 0.0}
+    predecessors: Dict[str, Optional[str]] = {start_node: None}
+    settled = set()
+    heap = [(heuristic(start_node), 0.0, start_node)]
+
+    while heap:
+        _, dist, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        if node == end_node:
+            route = []
+            while node is not None:
+                route.append(node)
+                node = predecessors[node]
+            return dist, route[::-1], len(settled)
+
+        for neighbor, weight in city_graph.neighbors(node):
+            new_dist = dist + weight
+            if neighbor not in settled and new_dist < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_dist
+                predecessors[neighbor] = node
+                heapq.heappush(heap, (new_dist + heuristic(neighbor), new_dist, neighbor))
+
+    return float('inf'), [], len(settled)
+
+class LandmarkIndex:
+    def __init__(self, city_graph, num_landmarks: int = 8):
+        """
+        ALT preprocessing: exact travel times from a few far-apart landmarks to every node.
+        By the triangle inequality |d(L, t) - d(L, v)| is a lower bound on d(v, t),
+        which steers A* towards the target without losing exactness.
+        """
+        if num_landmarks <= 0:
+            raise ValueError(f"Number of landmarks must be greater than 0. Received: {num_landmarks}")
+        self.nodes = city_graph.nodes()
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.landmarks: List[str] = []
+
+        # node x landmark table; unreachable pairs are stored as 0 so they never prune
+        rows = self._select_landmarks(city_graph, min(num_landmarks, len(self.nodes)))
+        table = np.vstack(rows).T if rows else np.zeros((len(self.nodes), 0))
+        table[~np.isfinite(table)] = 0.0
+        self.table = np.ascontiguousarray(table)
+
+    @classmethod
+    def from_table(cls, nodes: List[str], landmarks: List[str], table: np.ndarray) -> "LandmarkIndex":
+        """Restores a previously computed table (e.g. from a graph snapshot)."""
+        index = cls.__new__(cls)
+        index.nodes = list(nodes)
+        index.node_index = {node: i for i, node in enumerate(index.nodes)}
+        index.landmarks = list(landmarks)
+        index.table = table
+        return index
+
+    def _select_landmarks(self, city_graph, count: int) -> List[np.ndarray]:
+        """Farthest-point selection: each landmark is the node farthest from all previous ones."""
+        rows = []
+        if not count:
+            return rows
+        seed_distances, _ = city_graph.travel_time_matrix([self.nodes[0]], self.nodes)
+        closest = np.where(np.isfinite(seed_distances[0]), seed_distances[0], -1.0)
+        for _ in range(count):
+            landmark = self.nodes[int(np.argmax(closest))]
+            if landmark in self.landmarks:
+                break
+            self.landmarks.append(landmark)
+            distances, _ = city_graph.travel_time_matrix([landmark], self.nodes)
+            rows.append(distances[0])
+            closest = np.minimum(closest, np.where(np.isfinite(distances[0]), distances[0], -1.0))
+        return rows
+
+    def heuristic_to(self, end_node: str) -> Callable[[str], float]:
+        """Lower-bound function h(v) <= d(v, end_node) for A*."""
+        target_row = self.table[self.node_index[end_node]]
+        table, node_index = self.table, self.node_index
+        return lambda node: float(np.abs(table[node_index[node]] - target_row).max(initial=0.0))
+
+    def query(self, city_graph, start_node: str, end_node: str) -> Tuple[float, List[str], int]:
+        return astar(city_graph, start_node, end_node, self.heuristic_to(end_node))
@@ -0,0 +1,44 @@
+# app/models/route_accelerator.py
+
+from typing import List, Tuple
+from app.models.landmarks import LandmarkIndex
+from app.models.contraction_hierarchy import ContractionHierarchy
+from app.utils.metrics import GRAPH_SEARCH_SECONDS, GRAPH_SETTLED_NODES
+
+class RouteAccelerator:
+    def __init__(self, city_graph, landmarks: int = 8, contraction: bool = False):
+        """
+        Point-to-point preprocessing (ALT landmarks and/or a contraction hierarchy)
+        stamped with the graph version it was built from.
+        """
+        if not landmarks and not contraction:
+            raise ValueError("Enable at least one of landmarks or contraction.")
+        self.city_graph = city_graph
+        self.graph_version = city_graph.version
+        self.landmarks = LandmarkIndex(city_graph, landmarks) if landmarks else None
+        self.hierarchy = ContractionHierarchy(city_graph) if contraction else None
+
+    @classmethod
+    def from_landmarks(cls, city_graph, landmarks: LandmarkIndex) -> "RouteAccelerator":
+        """Wraps restored landmark tables; they are trusted to match the current graph."""
+        accelerator = cls.__new__(cls)
+        accelerator.city_graph = city_graph
+        accelerator.graph_version = city_graph.version
+        accelerator.landmarks = landmarks
+        accelerator.hierarchy = None
+        return accelerator
+
+    def is_fresh(self) -> bool:
+        """Any change to the graph after preprocessing makes the tables unsafe to use."""
+        return self.graph_version == self.city_graph.version
+
+    def shortest_path(self, start_node: str, end_node: str) -> Tuple[float, List[str], int]:
+        """Returns (travel time, route, settled nodes); the hierarchy wins when both exist."""
+        mode = "contraction_hierarchy" if self.hierarchy else "alt"
+        with GRAPH_SEARCH_SECONDS.time(backend="accelerator", operation=mode):
+            if self.hierarchy:
+                result = self.hierarchy.query(start_node, end_node)
+            else:
+                result = self.landmarks.query(self.city_graph, start_node, end_node)
+        GRAPH_SETTLED_NODES.observe(result[2], backend="accelerator", operation=mode)
+        return result
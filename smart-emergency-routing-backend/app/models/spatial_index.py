@@ -0,0 +1,90 @@
+# app/models/spatial_index.py
+
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from app.utils.geo import validate_position
+
+EARTH_RADIUS_M = 6371008.8
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Lat/lon degrees -> points on the unit sphere; chord length is monotonic in great-circle distance."""
+    phi, lam = np.radians(lat), np.radians(lon)
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+def _chord_to_meters(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(np.asarray(chord) / 2, 1.0))
+
+class SpatialIndex:
+    def __init__(self, city_graph, coordinates: Dict[str, Tuple[float, float]], candidates: int = 8):
+        """
+        KD-tree over the (lat, lon) of every routable intersection. Snapping a GPS point is
+        one O(log n) tree query for the nearest `candidates` intersections, then a projection
+        onto the roads leaving them, so the nearest road is found even between intersections.
+        """
+        self.city_graph = city_graph
+        self.node_ids = [node for node in coordinates if city_graph.has_node(node)]
+        if not self.node_ids:
+            raise ValueError("No map node has coordinates.")
+        self._position = {node: i for i, node in enumerate(self.node_ids)}
+        latlon = np.array([coordinates[node] for node in self.node_ids], dtype=np.float64)
+        self._lonlat = latlon[:, ::-1].copy()
+        self._tree = cKDTree(_unit_vectors(latlon[:, 0], latlon[:, 1]))
+        self.candidates = min(candidates, len(self.node_ids))
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def snap(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Nearest point of the road network to (lat, lon). Returns the nearest intersection and,
+        when a road passes closer than any intersection, that road with `fraction` = how far
+        along source -> target the snapped point lies (0 = at source).
+        """
+        lat, lon = validate_position(lat, lon)
+        phi, lam = math.radians(lat), math.radians(lon)
+        point = (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+        chord, index = self._tree.query(point, k=self.candidates)
+        chord, index = np.atleast_1d(chord), np.atleast_1d(index)
+        snapped = {
+            "node_id": self.node_ids[index[0]],
+            "distance_m": round(float(_chord_to_meters(chord[0])), 1),
+            "road": None
+        }
+
+        # Roads leaving the candidate intersections, projected in one vectorized pass
+        sources, targets = [], []
+        for i in index.tolist():
+            for target, weight in self.city_graph.neighbors(self.node_ids[i]):
+                j = self._position.get(target)
+                if j is not None and weight != float('inf'):
+                    sources.append(i)
+                    targets.append(j)
+        if not sources:
+            return snapped
+
+        # Local equirectangular frame centered on the GPS point: accurate to centimeters at street scale
+        meters_per_lat = math.pi * EARTH_RADIUS_M / 180
+        scale = np.array([meters_per_lat * math.cos(phi), meters_per_lat])
+        start = (self._lonlat[sources] - (lon, lat)) * scale
+        segment = (self._lonlat[targets] - (lon, lat)) * scale - start
+        length_sq = np.einsum("ij,ij->i", segment, segment)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraction = np.clip(-np.einsum("ij,ij->i", start, segment) / length_sq, 0.0, 1.0)
+        fraction[length_sq == 0] = 0.0
+        distance = np.hypot(*(start + fraction[:, None] * segment).T)
+
+        # Interior points only: a road snapped at an end is just its intersection
+        distance[(fraction <= 0.0) | (fraction >= 1.0)] = np.inf
+        best = int(np.argmin(distance))
+        if distance[best] < snapped["distance_m"]:
+            snapped["road"] = {
+                "source": self.node_ids[sources[best]],
+                "target": self.node_ids[targets[best]],
+                "fraction": round(float(fraction[best]), 4),
+                "distance_m": round(float(distance[best]), 1)
+            }
+        return snapped
@@ -0,0 +1,142 @@
+# app/models/time_profiles.py
+
+import datetime
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# The day is split into fixed buckets; a profile is precomputed as one factor per bucket
+BUCKET_MINUTES = 15
+BUCKETS = 24 * 60 // BUCKET_MINUTES
+_DAY_MINUTES = 24 * 60
+# Epoch seconds sent as text; ISO-8601 always has separators, so plain numbers are unambiguous
+_EPOCH_SECONDS = re.compile(r"[+-]?\d+(\.\d*)?([eE][+-]?\d+)?")
+
+class TimeProfiles:
+    def __init__(self):
+        """
+        Time-of-day travel-time profiles shared by the roads of a city graph.
+        A profile is a piecewise-linear curve of multipliers on the road's live weight,
+        e.g. [[0, 1.0], [480, 2.5], [600, 1.2], ...] (minute of day, factor), wrapping at
+        midnight. Each distinct curve is sampled once per 15-minute bucket and stored as one
+        float32 row; roads only keep the row number, so thousands of roads of the same
+        class cost one row.
+        """
+        self._rows: Dict[bytes, int] = {}
+        self._table: List[np.ndarray] = []
+        self._array: Optional[np.ndarray] = None            # Cached (profiles x BUCKETS) table
+        self._columns: Dict[int, List[float]] = {}         # Per bucket: the factor of every row
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @classmethod
+    def from_table(cls, table: np.ndarray) -> "TimeProfiles":
+        """Rebuilds profiles from table() output (e.g. a graph snapshot)."""
+        profiles = cls()
+        for factors in np.asarray(table, dtype=np.float32):
+            profiles.add_factors(factors)
+        return profiles
+
+    def table(self) -> np.ndarray:
+        """(profiles x BUCKETS) float32 factor table."""
+        if self._array is None:
+            self._array = np.array(self._table, dtype=np.float32).reshape(-1, BUCKETS)
+        return self._array
+
+    def add(self, breakpoints: Sequence[Sequence[float]]) -> int:
+        """Registers a profile from [[minute_of_day, factor], ...]; returns its row."""
+        return self.add_factors(self.sample(breakpoints))
+
+    def add_factors(self, factors: np.ndarray) -> int:
+        factors = np.asarray(factors, dtype=np.float32)
+        key = factors.tobytes()
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._table)
+            self._table.append(factors)
+            self._array, self._columns = None, {}
+        return row
+
+    def column(self, bucket: int) -> List[float]:
+        """Factor of every profile during `bucket`, as a list indexed by row."""
+        column = self._columns.get(bucket)
+        if column is None:
+            column = self._columns[bucket] = self.table()[:, bucket].tolist()
+        return column
+
+    def arc_factors(self, bucket: int, rows: np.ndarray) -> np.ndarray:
+        """Factors for an array of profile rows during `bucket` (-1 = static road, factor 1)."""
+        return np.append(self.table()[:, bucket], np.float32(1.0))[rows]
+
+    @staticmethod
+    def bucket(minute: float) -> int:
+        """Bucket of a minute offset (wraps across days)."""
+        return int(minute % _DAY_MINUTES // BUCKET_MINUTES) % BUCKETS
+
+    @staticmethod
+    def bucket_end(minute: float) -> float:
+        """The minute offset at which the bucket containing `minute` ends."""
+        return (minute // BUCKET_MINUTES + 1) * BUCKET_MINUTES
+
+    @staticmethod
+    def sample(breakpoints: Sequence[Sequence[float]]) -> np.ndarray:
+        """Validates a profile and evaluates it at the middle of every bucket."""
+        try:
+            points = sorted((float(minute), float(factor)) for minute, factor in breakpoints)
+        except (TypeError, ValueError):
+            raise ValueError("A time profile must be a list of [minute_of_day, factor] pairs.")
+        if not points:
+            raise ValueError("A time profile needs at least one [minute_of_day, factor] pair.")
+        for minute, factor in points:
+            if not 0 <= minute < _DAY_MINUTES:
+                raise ValueError(f"Profile minutes must be within [0, 1440). Received: {minute}")
+            if not 0 < factor < float('inf'):
+                raise ValueError(f"Profile factors must be positive. Received: {factor}")
+        minutes, factors = zip(*points)
+        # Wrap around midnight so the curve is continuous across days
+        minutes = [minutes[-1] - _DAY_MINUTES, *minutes, minutes[0] + _DAY_MINUTES]
+        factors = [factors[-1], *factors, factors[0]]
+        midpoints = np.arange(BUCKETS) * BUCKET_MINUTES + BUCKET_MINUTES / 2
+        return np.interp(midpoints, minutes, factors).astype(np.float32)
+
+def departure_minute(departure_time: Any) -> Optional[int]:
+    """
+    Minute of the (city-local) day a trip departs, rounded down to its bucket, or None for
+    static routing. Accepts "now", epoch seconds (also as a numeric string, e.g. from a form),
+    or an ISO-8601 timestamp; naive timestamps are already local. The city's zone comes from
+    CITY_TIMEZONE (default: the server's). Anything else raises ValueError.
+    """
+    if departure_time is None or departure_time == "":
+        return None
+    zone = os.getenv("CITY_TIMEZONE")
+    tz = None
+    if zone:
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo(zone)
+
+    if isinstance(departure_time, str) and _EPOCH_SECONDS.fullmatch(departure_time.strip()):
+        departure_time = float(departure_time)
+
+    if isinstance(departure_time, str) and departure_time.strip().lower() == "now":
+        moment = datetime.datetime.now(tz)
+    elif isinstance(departure_time, (int, float)) and not isinstance(departure_time, bool):
+        try:
+            moment = datetime.datetime.fromtimestamp(departure_time, tz)
+        except (OverflowError, OSError, ValueError):
+            # Out of the platform's range (e.g. 1e20) or NaN
+            raise ValueError(f"departure_time is not a valid epoch timestamp. Received: {departure_time}")
+    elif isinstance(departure_time, str):
+        try:
+            moment = datetime.datetime.fromisoformat(departure_time.strip().replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"departure_time must be 'now', epoch seconds or ISO-8601. Received: {departure_time}")
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(tz)
+    else:
+        raise ValueError(f"departure_time must be 'now', epoch seconds or ISO-8601. Received: {departure_time}")
+
+    minute = moment.hour * 60 + moment.minute
+    return minute - minute % BUCKET_MINUTES
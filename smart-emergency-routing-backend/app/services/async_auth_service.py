@@ -0,0 +1,40 @@
+# app/services/async_auth_service.py
+
+from pymongo.errors import DuplicateKeyError
+from app.utils.async_db import get_async_db
+from app.utils.auth_middleware import JWT_SECRET
+from app.utils.password_pool import get_password_pool
+from app.services.auth_service import issue_session
+from app.models.user import User
+
+class AsyncAuthService:
+    def __init__(self):
+        """AuthService for the ASGI app: Motor for MongoDB, the shared password pool for PBKDF2."""
+        self.db = get_async_db()
+        self.secret = JWT_SECRET
+        self.password_pool = get_password_pool()
+
+    async def register_user(self, username: str, email: str, password: str) -> str:
+        if await self.db.users.find_one({"email": email.strip().lower()}):
+            raise ValueError("A user with this email already exists.")
+
+        if len(password) < 6:
+            raise ValueError("Password must be at least 6 characters long.")
+
+        # PBKDF2 is deliberately slow; keep it off the event loop
+        hashed_password = await self.password_pool.hash_password_async(password)
+        new_user = User(username=username, email=email, password_hash=hashed_password)
+
+        try:
+            result = await self.db.users.insert_one(new_user.to_db_dict())
+        except DuplicateKeyError:
+            raise ValueError("A user with this email already exists.")
+        return str(result.inserted_id)
+
+    async def login_user(self, email: str, password: str) -> dict:
+        user_record = await self.db.users.find_one({"email": email.strip().lower()})
+
+        if not user_record or not await self.password_pool.verify_password_async(user_record['password'], password):
+            raise ValueError("Invalid email or password.")
+
+        return issue_session(user_record, self.secret)
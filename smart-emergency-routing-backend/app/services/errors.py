@@ -0,0 +1,12 @@
+# app/services/errors.py
+
+# Kept free of graph / database imports so controllers can catch these without loading the services
+
+class RouteNotFoundError(ValueError):
+    """A well-formed request for a location that has no route to any hospital (HTTP 404, not 400)."""
+
+class StreamFullError(Exception):
+    """No room for another open /stream connection right now (HTTP 503)."""
+
+class AuthenticationError(Exception):
+    """A missing, expired or invalid bearer token (HTTP 401)."""
@@ -0,0 +1,86 @@
+# app/services/fleet_service.py
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from typing import Dict, Any, List
+from app.services.routing_service import RoutingService
+
+# Finite stand-in for "no route / no bed" so the assignment solver stays well-defined
+_UNREACHABLE = 1e9
+
+class FleetAssignmentService:
+    def __init__(self, routing_service: RoutingService):
+        """
+        Assigns a whole fleet of ambulances jointly instead of greedily one by one,
+        so a single "best" hospital is never pushed past its capacity.
+        """
+        self.routing_service = routing_service
+
+    def assign_fleet(self, ambulance_locations: List[str]) -> Dict[str, Any]:
+        """
+        Minimizes the TOTAL response time of all ambulances under each hospital's
+        remaining beds (capacity - current_occupancy).
+
+        Every free bed becomes one assignment slot whose cost is the travel time plus
+        the waiting time the patient would see after the ambulances already sent there,
+        and the Hungarian algorithm (linear_sum_assignment) solves ambulances x slots.
+        """
+        # A concurrent occupancy or road update cannot change the graph or the hospitals
+        # halfway through building the matrix and the slots
+        with self.routing_service.consistent_view() as (city_graph, hospitals):
+            hospital_ids = [node_id for node_id, hospital in hospitals.items()
+                            if hospital.remaining_beds > 0 and city_graph.has_node(node_id)]
+
+            # 1. One batched travel-time matrix: hospitals x unique start nodes
+            starts = list(dict.fromkeys(ambulance_locations))
+            travel, hospital_route = city_graph.travel_time_matrix(hospital_ids, starts)
+            start_column = {start: j for j, start in enumerate(starts)}
+            columns = [start_column[location] for location in ambulance_locations]
+
+            # 2. Expand hospitals into bed slots (never more slots than ambulances)
+            slot_hospital, slot_rank, slot_wait = [], [], []
+            for i, hospital_id in enumerate(hospital_ids):
+                hospital = hospitals[hospital_id]
+                for k in range(min(hospital.remaining_beds, len(ambulance_locations))):
+                    slot_hospital.append(i)
+                    slot_rank.append(k)
+                    slot_wait.append(hospital.calculate_waiting_time(additional_patients=k))
+            slot_hospital = np.array(slot_hospital, dtype=int)
+            slot_wait = np.array(slot_wait)
+
+        # 3. Ambulances x slots cost matrix, then the optimal assignment
+        assignments, unassigned = [], []
+        assigned = {}
+        if len(slot_hospital):
+            cost = travel[slot_hospital][:, columns].T + slot_wait[None, :]
+            cost[~np.isfinite(cost)] = _UNREACHABLE
+            rows, slots = linear_sum_assignment(cost)
+            assigned = {row: slot for row, slot in zip(rows, slots) if cost[row, slot] < _UNREACHABLE}
+
+        total_response_time = 0.0
+        for row, location in enumerate(ambulance_locations):
+            if row not in assigned:
+                unassigned.append({"ambulance_index": row, "ambulance_start_node": location})
+                continue
+            slot = assigned[row]
+            i, j = slot_hospital[slot], columns[row]
+            travel_time, waiting_time = float(travel[i, j]), float(slot_wait[slot])
+            total_response_time += travel_time + waiting_time
+            assignments.append({
+                "ambulance_index": row,
+                "ambulance_start_node": location,
+                "hospital_id": hospital_ids[i],
+                "bed_rank": slot_rank[slot] + 1,
+                "route_nodes": hospital_route(i, j)[::-1],
+                "metrics": {
+                    "travel_time_mins": round(travel_time, 2),
+                    "waiting_time_mins": round(waiting_time, 2),
+                    "total_response_time_mins": round(travel_time + waiting_time, 2)
+                }
+            })
+
+        return {
+            "assignments": assignments,
+            "unassigned": unassigned,
+            "total_response_time_mins": round(total_response_time, 2)
+        }
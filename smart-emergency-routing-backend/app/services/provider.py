@@ -0,0 +1,152 @@
+# app/services/provider.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_REGISTRY: List["LazyService"] = []
+
+class LazyService:
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """
+        Builds a service on first use (or from the warm-up thread) instead of at import,
+        so importing the app never blocks on MongoDB or graph construction.
+        Attribute access is forwarded to the built service.
+        """
+        self.name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+        self.build_ms: Optional[float] = None
+        _REGISTRY.append(self)
+
+    @property
+    def ready(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    try:
+                        self._instance = self._factory()
+                        self.error = None
+                    except Exception as e:
+                        self.error = str(e)
+                        raise
+                    self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+        return self._instance
+
+    def set(self, instance: Any) -> Any:
+        """
+        Installs an already-built service (e.g. one built by a benchmark or test); None drops
+        it so the next use rebuilds. Returns the instance it replaced.
+        """
+        with self._lock:
+            previous, self._instance = self._instance, instance
+            self.error = None
+        return previous
+
+    async def get_async(self) -> Any:
+        """get() for the ASGI app: a service still being built is awaited in the CPU executor."""
+        if self._instance is not None:
+            return self._instance
+        from app.utils.executor import run_cpu
+        return await run_cpu(self.get)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+def _selected(names: Optional[Iterable[str]]) -> List["LazyService"]:
+    """The registered services named in `names` (all of them when None), in registration order."""
+    if names is None:
+        return list(_REGISTRY)
+    names = set(names)
+    return [service for service in _REGISTRY if service.name in names]
+
+def warm_up_services(names: Optional[Iterable[str]] = None):
+    """Builds the named services (default: all); failures are kept for /health/ready and retried on use."""
+    for service in _selected(names):
+        try:
+            service.get()
+        except Exception as e:
+            print(f"[!] Warm-up of {service.name} failed: {e}")
+
+_WARM_UP: Optional[threading.Thread] = None
+_WARM_UP_LOCK = threading.Lock()
+
+def start_warm_up_thread(names: Optional[Iterable[str]] = None) -> threading.Thread:
+    """
+    Builds the named services in a background thread. Idempotent while a warm-up is running, so the
+    readiness probe can call it to build (or retry) services without waiting for traffic.
+    """
+    global _WARM_UP
+    with _WARM_UP_LOCK:
+        if _WARM_UP is None or not _WARM_UP.is_alive():
+            names = tuple(names) if names is not None else None
+            _WARM_UP = threading.Thread(target=warm_up_services, args=(names,), name="service-warm-up", daemon=True)
+            _WARM_UP.start()
+        return _WARM_UP
+
+def services_status(names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    return {
+        service.name: {"ready": service.ready, "build_ms": service.build_ms, "error": service.error}
+        for service in _selected(names)
+    }
+
+# --- Process-wide services, shared by the Flask (WSGI) and Quart (ASGI) apps ---
+# Services (and their heavy graph libraries) load lazily or in the warm-up thread,
+# so importing the app never blocks on MongoDB or graph construction
+
+def _build_routing_service():
+    from app.services.routing_service import RoutingService
+    return RoutingService()
+
+def _build_fleet_service():
+    from app.services.fleet_service import FleetAssignmentService
+    return FleetAssignmentService(routing_service.get())
+
+def _build_stream_broker():
+    from app.services.stream_service import StreamBroker
+    return StreamBroker(routing_service.get())
+
+def _build_auth_service():
+    from app.services.auth_service import AuthService
+    return AuthService()
+
+routing_service = LazyService("routing", _build_routing_service)
+fleet_service = LazyService("fleet", _build_fleet_service)
+stream_broker = LazyService("stream", _build_stream_broker)
+auth_service = LazyService("auth", _build_auth_service)
+
+# What each app serves from: both share routing / fleet / stream, each has its own auth service
+# (async_auth is registered by the ASGI auth controller). Warm-up and readiness cover only these.
+WSGI_SERVICES = ("routing", "fleet", "stream", "auth")
+ASGI_SERVICES = ("routing", "fleet", "stream", "async_auth")
+
+def register_service_gauges():
+    """Scrape-time gauges for the built services (skipped while a service is still starting)."""
+    from app.utils.metrics import register_gauge
+    from app.utils.password_pool import get_password_pool
+
+    def route_cache():
+        stats = routing_service.get_cache_stats() if routing_service.ready else {}
+        return {(("counter", name),): stats[name] for name in ("entries", "hits", "misses", "evictions") if name in stats}
+
+    def password_pool():
+        stats = get_password_pool().stats()
+        return {(("state", name),): stats[name] for name in ("running", "queued", "max_queued")}
+
+    def stream():
+        stats = stream_broker.stats() if stream_broker.ready else {}
+        return {(("counter", name),): stats[name] for name in ("subscribers", "watched_ambulances", "dropped") if name in stats}
+
+    def services():
+        return {(("service", service.name),): 1 if service.ready else 0 for service in _REGISTRY}
+
+    register_gauge("sers_route_cache", "Route cache size and hit/miss/eviction counts.", route_cache)
+    register_gauge("sers_password_pool", "Password hashing pool running and queued jobs.", password_pool)
+    register_gauge("sers_stream", "SSE subscribers and watched ambulances.", stream)
+    register_gauge("sers_service_ready", "1 once the service is built.", services)
@@ -1,17 +1,81 @@
 # app/services/routing_service.py
 
+import os
+import threading
+from contextlib import contextmanager
+from pymongo import UpdateMany, UpdateOne
 from app.models.city_graph import CityGraph
+from app.models.csr_graph import CSRCityGraph
 from app.models.hospital import Hospital
+from app.models.dispatch_map import DispatchMap
+from app.models.spatial_index import SpatialIndex
+from app.models.time_profiles import TimeProfiles, departure_minute
+from app.services.errors import RouteNotFoundError
 from app.utils.db import get_db
-from typing import Dict, Any, List
+from app.utils.db_workflow import Workflow, db_call, run_workflow
+from app.utils.route_cache import RouteCache
+from app.utils.http_cache import CachedPayload, PayloadCache
+from app.utils.graph_snapshot import GraphSnapshot, load_snapshot
+from app.utils.map_version import MAP_VERSION_BUMP, MAP_VERSION_FILTER, bump_map_version, read_map_version
+from app.utils.occupancy_board import open_occupancy_board
+from app.utils.road_import import road_filter
+from app.utils.seed_data import SEED_COORDINATES
+from app.utils.metrics import SERVICE_STEP_SECONDS
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+# Selectable graph engines: "networkx" (default) or the compact array-backed "csr"
+GRAPH_BACKENDS = {
+    "networkx": CityGraph,
+    "csr": CSRCityGraph
+}
 
 class RoutingService:
-    def __init__(self):
+    def __init__(self, use_snapshot: bool = True):
         """Initializes the service and fetches ALL data live from MongoDB."""
         self.db = get_db()
         self._seed_if_empty() # Ensure data exists for the service
+
+        # Occupancy changes made by other workers arrive through shared memory. The board version
+        # is read BEFORE the hospitals, so a change published while they load is replayed below.
+        self.occupancy_board = open_occupancy_board()
+        self._board_version = self.occupancy_board.version if self.occupancy_board else 0
+
         self.hospitals = self._fetch_live_hospitals()
-        self.city_graph = self._build_city_graph_from_db()
+        # Read before the graph, so a road written during the build makes a snapshot look stale, never fresh
+        self.map_version = read_map_version(self.db)
+
+        # Prefer the shared memory-mapped snapshot over rebuilding the graph from MongoDB
+        snapshot_path = os.getenv("GRAPH_SNAPSHOT_PATH")
+        snapshot = self._load_fresh_snapshot(snapshot_path) if use_snapshot and snapshot_path else None
+        if snapshot is not None:
+            self.city_graph = snapshot.city_graph
+            self.dispatch_map = snapshot.restore_dispatch_map(self.hospitals)
+        else:
+            self.city_graph = self._build_city_graph_from_db()
+            self.dispatch_map = DispatchMap(self.city_graph, self.hospitals)
+
+        # GPS positions are snapped to the road network through a KD-tree over node coordinates
+        self.spatial_index = self._build_spatial_index()
+        self.snap_max_distance_m = float(os.getenv("SNAP_MAX_DISTANCE_M", "1000"))
+
+        # Bumped on every change so cached routes are never served stale
+        self.graph_version = 0
+        self.occupancy_version = 0
+        self.route_cache = RouteCache(int(os.getenv("ROUTE_CACHE_SIZE", "1024")))
+        self.max_batch_size = int(os.getenv("BATCH_MAX_LOCATIONS", "500"))
+
+        # Serialized (and lazily compressed) GET payloads, rebuilt only when their version moves
+        self.payload_cache = PayloadCache()
+        self._locations: Optional[Tuple[int, List[str]]] = None
+
+        # Guards in-place repairs against concurrent request threads
+        self._lock = threading.RLock()
+
+        # Called with every applied occupancy / road change (e.g. the SSE stream broker)
+        self._change_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+        # Catch up on occupancy published while the hospitals and graph were loading
+        self.sync_occupancy()
 
     def _seed_if_empty(self):
         """Auto-populates the database if it's currently empty (e.g. fresh Mock DB)."""
@@ -26,8 +90,10 @@ class RoutingService:
                 {"hospital_id": "H4", "name": "Southwest Clinic", "capacity": 40, "current_occupancy": 15}
             ])
             
-            # 2. Seed Nodes
-            self.db.map_nodes.insert_many([{"node_id": n} for n in ["A", "B", "C", "D", "E", "F", "H1", "H2", "H3", "H4"]])
+            # 2. Seed Nodes (with GPS coordinates for position-based dispatch)
+            self.db.map_nodes.insert_many([
+                {"node_id": node_id, "lat": lat, "lon": lon} for node_id, (lat, lon) in SEED_COORDINATES.items()
+            ])
             
             # 3. Seed Edges
             self.db.map_edges.insert_many([
@@ -38,6 +104,7 @@ class RoutingService:
                 {"source": "E", "target": "H2", "weight": 4.0}, {"source": "F", "target": "H3", "weight": 3.0},
                 {"source": "A", "target": "H4", "weight": 12.0}
             ])
+            bump_map_version(self.db)
 
             # 4. Seed a Default Test User (admin@example.com / password123)
             from werkzeug.security import generate_password_hash
@@ -52,6 +119,19 @@ class RoutingService:
 
 
 
+    def _load_fresh_snapshot(self, path: str) -> Optional[GraphSnapshot]:
+        """The snapshot at `path` if it was exported from the road network MongoDB holds now, else None."""
+        if not os.path.exists(path):
+            return None
+        snapshot = load_snapshot(path)
+        if snapshot.header.get("map_version") != self.map_version:
+            print(f"[!] Graph snapshot {snapshot.graph_version} is stale (map version "
+                  f"{snapshot.header.get('map_version')}, database {self.map_version}). Rebuilding from MongoDB.")
+            return None
+        print(f"Loaded graph snapshot {snapshot.graph_version} from {path}")
+        return snapshot
+
+    @SERVICE_STEP_SECONDS.time(step="fetch_live_hospitals")
     def _fetch_live_hospitals(self) -> Dict[str, Hospital]:
         hospital_objects = {}
         for data in self.db.hospitals.find():
@@ -64,66 +144,488 @@ class RoutingService:
             hospital_objects[data['hospital_id']] = hospital
         return hospital_objects
 
-    def _build_city_graph_from_db(self) -> CityGraph:
-        city = CityGraph()
+    @SERVICE_STEP_SECONDS.time(step="build_city_graph_from_db")
+    def _build_city_graph_from_db(self, backend: Optional[str] = None) -> CityGraph:
+        backend = (backend or os.getenv("GRAPH_BACKEND", "networkx")).lower()
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(f"Unknown graph backend '{backend}'. Choose one of: {', '.join(GRAPH_BACKENDS)}")
+        city = GRAPH_BACKENDS[backend]()
         # Fetch nodes
         nodes = [doc["node_id"] for doc in self.db.map_nodes.find()]
         city.add_intersections(nodes)
         
-        # Fetch edges
-        edges = [(doc["source"], doc["target"], doc["weight"]) for doc in self.db.map_edges.find()]
+        # Fetch edges; roads with a time-of-day `profile` share deduplicated factor rows
+        edges = []
+        profiles, road_rows = TimeProfiles(), {}
+        for doc in self.db.map_edges.find():
+            edges.append((doc["source"], doc["target"], doc["weight"]))
+            if doc.get("profile"):
+                road_rows[(doc["source"], doc["target"])] = profiles.add(doc["profile"])
         city.add_roads(edges)
+        if road_rows:
+            city.set_time_profiles(profiles, road_rows)
         
         return city
 
+    @SERVICE_STEP_SECONDS.time(step="build_spatial_index")
+    def _build_spatial_index(self) -> Optional[SpatialIndex]:
+        coordinates = {
+            doc["node_id"]: (doc["lat"], doc["lon"])
+            for doc in self.db.map_nodes.find({"lat": {"$exists": True}, "lon": {"$exists": True}},
+                                              {"_id": 0, "node_id": 1, "lat": 1, "lon": 1})
+        }
+        try:
+            return SpatialIndex(self.city_graph, coordinates) if coordinates else None
+        except ValueError:
+            return None  # Coordinates exist only for nodes outside the graph
+
     def get_all_locations(self) -> List[str]:
-        """Returns all valid intersections for the frontend dropdown."""
-        return [doc["node_id"] for doc in self.db.map_nodes.find() if not doc["node_id"].startswith("H")]
+        """
+        Returns all valid intersections for the frontend dropdown: every graph node that is
+        not a hospital, indexed in memory once per graph version instead of a MongoDB scan.
+        """
+        locations = self._locations
+        if locations is None or locations[0] != self.graph_version:
+            locations = self._locations = (
+                self.graph_version, [node for node in self.city_graph.nodes() if node not in self.hospitals])
+        return locations[1]
+
+    def locations_payload(self) -> CachedPayload:
+        """The /locations response body, serialized once per graph version."""
+        return self.payload_cache.get("locations", self.graph_version, self.get_all_locations)
+
+    def dispatch_map_payload(self) -> CachedPayload:
+        """The /dispatch-map response body, serialized once per graph and occupancy version."""
+        self.sync_occupancy()
+        return self.payload_cache.get("dispatch_map", (self.graph_version, self.occupancy_version), self.get_dispatch_map)
 
     def update_hospital_occupancy(self, hospital_id: str, new_occupancy: int) -> bool:
         """Updates occupancy in DB to simulate real-time patient influx."""
-        result = self.db.hospitals.update_one(
+        return run_workflow(self.update_hospital_occupancy_steps(hospital_id, new_occupancy), self.db)
+
+    def update_hospital_occupancy_steps(self, hospital_id: str, new_occupancy: int) -> Workflow:
+        """update_hospital_occupancy as a db_workflow, shared with the ASGI app."""
+        self.validate_occupancy(new_occupancy)
+        result = yield db_call(
+            "hospitals", "update_one",
             {"hospital_id": hospital_id},
             {"$set": {"current_occupancy": new_occupancy}}
         )
-        # Refresh the local cache so the next calculation uses the new data
-        if result.modified_count > 0:
-            self.hospitals = self._fetch_live_hospitals()
-            return True
-        return False
+        # Patch the local Hospital in place and tell the other workers. Also when MongoDB already
+        # held the value: this worker's copy may be the stale one.
+        if result.matched_count > 0:
+            self.apply_occupancy_changes({hospital_id: new_occupancy})
+        return result.modified_count > 0
+
+    def apply_occupancy_changes(self, occupancies: Dict[str, int]):
+        """Applies already-persisted occupancy changes locally and publishes them to the other workers."""
+        self._apply_occupancy(occupancies)
+        if self.occupancy_board:
+            self.occupancy_board.publish(occupancies)
+
+    def sync_occupancy(self):
+        """
+        Applies occupancy published by other workers since the last check.
+        A plain shared-memory read, so it is cheap enough to run before every routing call.
+        """
+        if self.occupancy_board is None:
+            return
+        update = self.occupancy_board.read_changes(self._board_version)
+        if update:
+            with self._lock:
+                self._board_version, changes = update
+                self._apply_occupancy(changes)
+
+    @contextmanager
+    def consistent_view(self) -> Iterator[Tuple[CityGraph, Dict[str, Hospital]]]:
+        """
+        Yields (city_graph, hospitals), current as of entry and unchanged until the block ends:
+        occupancy and road updates wait for it, so keep the block to reads.
+        """
+        self.sync_occupancy()
+        with self._lock:
+            yield self.city_graph, self.hospitals
+
+    def _apply_occupancy(self, occupancies: Dict[str, int]):
+        """Updates the affected Hospital objects in place and repairs only their dispatch regions."""
+        with self._lock:
+            updated, changed_nodes = [], set()
+            for hospital_id, occupancy in occupancies.items():
+                hospital = self.hospitals.get(hospital_id)
+                if hospital is None:
+                    # A hospital added after startup: load just that one document
+                    data = self.db.hospitals.find_one({"hospital_id": hospital_id})
+                    if not data:
+                        continue
+                    self.hospitals[hospital_id] = Hospital(
+                        hospital_id=data['hospital_id'],
+                        name=data['name'],
+                        capacity=data['capacity'],
+                        current_occupancy=data['current_occupancy']
+                    )
+                elif hospital.current_occupancy == occupancy:
+                    continue
+                else:
+                    hospital.update_occupancy(occupancy)
+                changed_nodes |= self.dispatch_map.update_hospital(hospital_id)
+                updated.append(hospital_id)
+            if updated:
+                self.occupancy_version += 1
+                self._notify_change({
+                    "type": "occupancy",
+                    "hospitals": [self.hospitals[hospital_id].to_dict() for hospital_id in updated],
+                    "changed_nodes": changed_nodes,
+                    "occupancy_version": self.occupancy_version
+                })
+
+    def add_change_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """
+        Registers `listener(change)` for every applied occupancy or road change.
+        `change["changed_nodes"]` holds the intersections whose dispatch decision was repaired.
+        Listeners run while the service lock is held, so they should only hand the change off.
+        """
+        self._change_listeners.append(listener)
+
+    def _notify_change(self, change: Dict[str, Any]):
+        for listener in self._change_listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"[!] Change listener failed: {e}")
+
+    @staticmethod
+    def validate_occupancy(occupancy: Any):
+        if isinstance(occupancy, bool) or not isinstance(occupancy, int) or occupancy < 0:
+            raise ValueError(f"Occupancy must be a non-negative integer. Received: {occupancy}")
+
+    def get_dispatch_map(self) -> Dict[str, Any]:
+        """Returns the winning hospital, total cost and next hop for every intersection."""
+        self.sync_occupancy()
+        with self._lock:
+            return {
+                "hospitals": [hospital.to_dict() for hospital in self.hospitals.values()],
+                "nodes": self.dispatch_map.to_dict()
+            }
+
+    def update_road_weight(self, source: str, target: str, weight: float) -> bool:
+        """Applies a live traffic update to MongoDB and to the in-memory graph."""
+        return run_workflow(self.update_road_weight_steps(source, target, weight), self.db)
+
+    def update_road_weight_steps(self, source: str, target: str, weight: Any) -> Workflow:
+        """update_road_weight as a db_workflow, shared with the ASGI app."""
+        weight = self.validate_road_weight(weight)
+        # Checked against the graph first, so MongoDB is never changed for a road the graph cannot apply
+        if not self.city_graph.has_road(source, target):
+            return False
+        result = yield db_call("map_edges", "update_many", self.road_filter(source, target), {"$set": {"weight": weight}})
+        if result.matched_count == 0:
+            return False
+        yield db_call("graph_meta", "update_one", MAP_VERSION_FILTER, MAP_VERSION_BUMP, upsert=True)
+        self.apply_road_weights([(source, target, weight)])
+        return True
+
+    def update_road_weights(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk variant: one bulk_write to MongoDB, then in-place graph repairs."""
+        return run_workflow(self.update_road_weights_steps(updates), self.db)
+
+    def update_road_weights_steps(self, updates: List[Dict[str, Any]]) -> Workflow:
+        """update_road_weights as a db_workflow, shared with the ASGI app."""
+        parsed = self.parse_road_updates(updates)
+
+        # One round-trip to learn which of the roads the graph knows also exist in MongoDB
+        known = self.known_roads(parsed)
+        existing = (yield db_call("map_edges", "find", self.existing_roads_query(known), {"source": 1, "target": 1})) if known else []
+        found, not_found = self.partition_roads(parsed, existing)
+
+        if found:
+            yield db_call(
+                "map_edges", "bulk_write",
+                [UpdateMany(self.road_filter(source, target), {"$set": {"weight": weight}}) for source, target, weight in found],
+                ordered=True
+            )
+            yield db_call("graph_meta", "update_one", MAP_VERSION_FILTER, MAP_VERSION_BUMP, upsert=True)
+            self.apply_road_weights(found)
+
+        return {"updated": len(found), "not_found": not_found}
+
+    def known_roads(self, roads: List[Tuple[str, str, float]]) -> List[Tuple[str, str, float]]:
+        """The road updates whose road exists in the in-memory graph."""
+        return [road for road in roads if self.city_graph.has_road(road[0], road[1])]
+
+    def apply_road_weights(self, roads: List[Tuple[str, str, float]]):
+        """
+        Applies already-persisted road weights to the in-memory graph and dispatch map.
+        All roads are checked before the first one is applied, so a batch lands completely or not at all.
+        """
+        with self._lock:
+            missing = [f"{source} - {target}" for source, target, _ in roads if not self.city_graph.has_road(source, target)]
+            if missing:
+                raise ValueError(f"Roads not found in the city graph: {', '.join(missing)}")
+
+            changed_nodes = set()
+            for source, target, weight in roads:
+                old_weight = self.city_graph.update_road_weight(source, target, weight)
+                # Dynamic SSSP: only the part of the dispatch map routed over this road is repaired
+                changed_nodes |= self.dispatch_map.update_road(source, target, old_weight, weight)
+                self.graph_version += 1
+            self._notify_change({
+                "type": "road",
+                "roads": [{"source": source, "target": target, "weight": weight} for source, target, weight in roads],
+                "changed_nodes": changed_nodes,
+                "graph_version": self.graph_version
+            })
 
-    def find_optimal_hospital(self, ambulance_location: str) -> Dict[str, Any]:
+    @classmethod
+    def parse_road_updates(cls, updates: List[Dict[str, Any]]) -> List[Tuple[str, str, float]]:
+        return [(str(u['source']), str(u['target']), cls.validate_road_weight(u['weight'])) for u in updates]
+
+    @classmethod
+    def existing_roads_query(cls, roads: List[Tuple[str, str, float]]) -> Dict[str, Any]:
+        """A single MongoDB filter matching every road in `roads`, in either orientation."""
+        return {"$or": [clause for source, target, _ in roads for clause in cls.road_filter(source, target)["$or"]]}
+
+    @staticmethod
+    def partition_roads(roads: List[Tuple[str, str, float]], existing_docs: List[Dict[str, Any]]) -> Tuple[list, list]:
+        """Splits road updates into (found, not_found) given the matching map_edges documents."""
+        existing = {frozenset((doc["source"], doc["target"])) for doc in existing_docs}
+        found = [road for road in roads if frozenset(road[:2]) in existing]
+        not_found = [{"source": source, "target": target} for source, target, _ in roads
+                     if frozenset((source, target)) not in existing]
+        return found, not_found
+
+    @staticmethod
+    def road_filter(source: str, target: str) -> Dict[str, Any]:
+        """Roads are undirected, so match the edge in either orientation."""
+        return road_filter(source, target)
+
+    @staticmethod
+    def validate_road_weight(weight: Any) -> float:
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"Road weight must be a number. Received: {weight}")
+        if not weight > 0 or weight == float('inf'):
+            raise ValueError(f"Road weight must be a positive travel time in minutes. Received: {weight}")
+        return weight
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Route cache counters plus the versions currently keying it."""
+        return {
+            **self.route_cache.stats(),
+            "graph_version": self.graph_version,
+            "occupancy_version": self.occupancy_version
+        }
+
+    def find_optimal_hospital(self, ambulance_location: str, departure_time: Any = None) -> Dict[str, Any]:
+        """
+        Best hospital by travel + waiting time. With `departure_time` ("now", epoch seconds
+        or ISO-8601) and time-of-day profiles on the map, travel times follow the time of day.
+        """
+        minute = self.resolve_departure(departure_time)
+        self.sync_occupancy()
+        # Time-dependent answers are cached per departure bucket
+        cache_key = (ambulance_location, self.graph_version, self.occupancy_version, minute)
+        cached = self.route_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            if minute is None:
+                result = self._compute_optimal_hospital(ambulance_location)
+            else:
+                # The dispatch map holds static travel times: search at the departure time instead
+                result = self._search_optimal_hospital(ambulance_location, minute)
+                result["departure_time_of_day"] = f"{minute // 60:02d}:{minute % 60:02d}"
+        self.route_cache.put(cache_key, result)
+        return result
+
+    def resolve_departure(self, departure_time: Any) -> Optional[int]:
+        """Departure bucket (minute of day), or None when the trip is routed on static weights."""
+        minute = departure_minute(departure_time)
+        if minute is None or getattr(self.city_graph, "time_profiles", None) is None:
+            return None
+        return minute
+
+    def snap_position(self, lat: Any, lon: Any) -> Dict[str, Any]:
+        """Nearest intersection (and road, if closer) to a GPS position."""
+        if self.spatial_index is None:
+            raise ValueError("The city map has no node coordinates; GPS positions cannot be snapped.")
+        snapped = self.spatial_index.snap(lat, lon)
+        distance = snapped["road"]["distance_m"] if snapped["road"] else snapped["distance_m"]
+        if distance > self.snap_max_distance_m:
+            raise ValueError(f"No road within {self.snap_max_distance_m:g} m of ({lat}, {lon}).")
+        return snapped
+
+    def find_optimal_hospital_from_position(self, lat: Any, lon: Any, departure_time: Any = None) -> Dict[str, Any]:
+        """
+        find_optimal_hospital for a raw GPS position. A point snapped onto a road can leave
+        through either end, so both are tried with the partial road time added (at the
+        departure time's profile factor for time-dependent queries).
+        """
+        minute = self.resolve_departure(departure_time)
+        snapped = self.snap_position(lat, lon)
+        road = snapped["road"]
+        if road:
+            weight = self.city_graph.road_time(road["source"], road["target"], minute)
+            starts = [(road["source"], road["fraction"] * weight), (road["target"], (1 - road["fraction"]) * weight)]
+        else:
+            starts = [(snapped["node_id"], 0.0)]
+
+        best, best_total, best_offset = None, float('inf'), 0.0
+        for node_id, offset in starts:
+            try:
+                result = self.find_optimal_hospital(node_id, departure_time)
+            except ValueError:
+                continue
+            total = result["metrics"]["total_response_time_mins"] + offset
+            if total < best_total:
+                best, best_total, best_offset = result, total, offset
+        if best is None:
+            raise RouteNotFoundError(f"Could not find a valid route from ({lat}, {lon}) to any hospital.")
+
+        metrics = best["metrics"]
+        return {
+            **best,  # Cached results are shared: copy, never mutate
+            "snapped_location": snapped,
+            "metrics": {
+                "travel_time_mins": round(metrics["travel_time_mins"] + best_offset, 2),
+                "waiting_time_mins": metrics["waiting_time_mins"],
+                "total_response_time_mins": round(metrics["total_response_time_mins"] + best_offset, 2)
+            }
+        }
+
+    def _compute_optimal_hospital(self, ambulance_location: str) -> Dict[str, Any]:
+        # Fast path: the precomputed dispatch map turns routing into a dictionary lookup
+        decision = self.dispatch_map.lookup(ambulance_location)
+        if decision:
+            return self._format_result(
+                ambulance_location,
+                self.hospitals[decision["hospital_id"]],
+                decision["route_nodes"],
+                decision["travel_time"],
+                decision["waiting_time"]
+            )
+        return self._search_optimal_hospital(ambulance_location)
+
+    def update_hospital_occupancies(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Bulk variant of update_hospital_occupancy: every change goes to MongoDB in ONE
+        bulk_write, then the dispatch map is repaired once per hospital that changed.
+        """
+        return run_workflow(self.update_hospital_occupancies_steps(updates), self.db)
+
+    def update_hospital_occupancies_steps(self, updates: List[Dict[str, Any]]) -> Workflow:
+        """update_hospital_occupancies as a db_workflow, shared with the ASGI app."""
+        requested = self.parse_occupancy_updates(updates)
+        stored = yield db_call("hospitals", "find", *self.stored_occupancy_query(requested))
+        changes, unchanged, not_found = self.plan_occupancy_changes(requested, stored)
+        if changes:
+            yield db_call("hospitals", "bulk_write", self.occupancy_write_ops(changes), ordered=False)
+        if changes or unchanged:
+            self.apply_occupancy_changes({**unchanged, **changes})
+
+        return {"updated": len(changes), "unchanged": list(unchanged), "not_found": not_found}
+
+    @classmethod
+    def parse_occupancy_updates(cls, updates: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Validates a burst of reports into {hospital_id: new_occupancy}; the last report per hospital wins."""
+        requested = {}
+        for update in updates:
+            new_occupancy = update['new_occupancy']
+            cls.validate_occupancy(new_occupancy)
+            requested[str(update['hospital_id'])] = new_occupancy
+        return requested
+
+    @staticmethod
+    def stored_occupancy_query(requested: Dict[str, int]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """(filter, projection) reading the stored occupancy of every requested hospital."""
+        return {"hospital_id": {"$in": list(requested)}}, {"_id": 0, "hospital_id": 1, "current_occupancy": 1}
+
+    @staticmethod
+    def plan_occupancy_changes(requested: Dict[str, int], stored_docs: List[Dict[str, Any]]
+                               ) -> Tuple[Dict[str, int], Dict[str, int], List[str]]:
+        """
+        Splits requested occupancies into (changes, unchanged, not_found) against what MongoDB
+        holds, not against this worker's copy, which may lag behind other writers.
+        """
+        stored = {doc["hospital_id"]: doc.get("current_occupancy") for doc in stored_docs}
+        changes, unchanged, not_found = {}, {}, []
+        for hospital_id, new_occupancy in requested.items():
+            if hospital_id not in stored:
+                not_found.append(hospital_id)
+            elif stored[hospital_id] == new_occupancy:
+                unchanged[hospital_id] = new_occupancy
+            else:
+                changes[hospital_id] = new_occupancy
+        return changes, unchanged, not_found
+
+    @staticmethod
+    def occupancy_write_ops(changes: Dict[str, int]) -> List[UpdateOne]:
+        return [UpdateOne({"hospital_id": hospital_id}, {"$set": {"current_occupancy": occupancy}})
+                for hospital_id, occupancy in changes.items()]
+
+    def find_optimal_hospitals_batch(self, ambulance_locations: List[str]) -> List[Dict[str, Any]]:
+        """
+        Dispatches many ambulances at once. Every location goes through find_optimal_hospital
+        (route cache, then the dispatch map), so a batch answers exactly like single queries;
+        identical start nodes are resolved once. Returns one entry per requested location.
+        """
+        if len(ambulance_locations) > self.max_batch_size:
+            raise ValueError(f"At most {self.max_batch_size} ambulance locations per batch. "
+                             f"Received: {len(ambulance_locations)}")
+
+        results_by_start = {}
+        for location in dict.fromkeys(ambulance_locations):
+            try:
+                results_by_start[location] = {"status": "success", "data": self.find_optimal_hospital(location)}
+            except ValueError as e:
+                results_by_start[location] = {"status": "error", "message": str(e)}
+        return [results_by_start[location] for location in ambulance_locations]
+
+    def _search_optimal_hospital(self, ambulance_location: str, departure_minute: Optional[int] = None) -> Dict[str, Any]:
         best_hospital = None
         min_total_time = float('inf')
         best_route = []
         travel_time_to_best = 0
         wait_time_at_best = 0
 
+        waiting_times = {node_id: hospital.calculate_waiting_time() for node_id, hospital in self.hospitals.items()}
+
+        # One Dijkstra pass from the ambulance settles every reachable hospital
+        try:
+            travel_times, predecessors = self.city_graph.shortest_paths_to_targets(
+                ambulance_location, waiting_times, departure_minute)
+        except ValueError:
+            travel_times, predecessors = {}, {}
+
         for node_id, hospital in self.hospitals.items():
-            try:
-                travel_time = self.city_graph.calculate_travel_time(ambulance_location, node_id)
-                waiting_time = hospital.calculate_waiting_time()
-                total_time = travel_time + waiting_time
-                
-                if total_time < min_total_time:
-                    min_total_time = total_time
-                    best_hospital = hospital
-                    best_route = self.city_graph.get_shortest_path(ambulance_location, node_id)
-                    travel_time_to_best = travel_time
-                    wait_time_at_best = waiting_time
-            except ValueError:
+            if node_id not in travel_times:
                 continue
+            travel_time = travel_times[node_id]
+            waiting_time = waiting_times[node_id]
+            total_time = travel_time + waiting_time
+
+            if total_time < min_total_time:
+                min_total_time = total_time
+                best_hospital = hospital
+                travel_time_to_best = travel_time
+                wait_time_at_best = waiting_time
 
         if not best_hospital:
-            raise ValueError(f"Could not find a valid route from '{ambulance_location}' to any hospital.")
+            raise RouteNotFoundError(f"Could not find a valid route from '{ambulance_location}' to any hospital.")
+
+        best_route = self.city_graph.reconstruct_path(predecessors, best_hospital.hospital_id)
+        return self._format_result(ambulance_location, best_hospital, best_route, travel_time_to_best, wait_time_at_best)
 
+    def _format_result(self, ambulance_location: str, hospital: Hospital, route: List[str],
+                       travel_time: float, waiting_time: float) -> Dict[str, Any]:
         return {
             "ambulance_start_node": ambulance_location,
-            "optimal_hospital": best_hospital.to_dict(),
-            "route_nodes": best_route,
+            "optimal_hospital": hospital.to_dict(),
+            "route_nodes": route,
             "metrics": {
-                "travel_time_mins": round(travel_time_to_best, 2),
-                "waiting_time_mins": round(wait_time_at_best, 2),
-                "total_response_time_mins": round(min_total_time, 2)
+                "travel_time_mins": round(float(travel_time), 2),
+                "waiting_time_mins": round(float(waiting_time), 2),
+                "total_response_time_mins": round(float(travel_time + waiting_time), 2)
             }
         }
\ No newline at end of file
@@ -0,0 +1,234 @@
+# app/services/stream_service.py
+
+import json
+import os
+import queue
+import threading
+from collections import deque
+from itertools import count
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.services.errors import StreamFullError
+
+class StreamSubscriber:
+    # Flask serves each open stream from a request thread that blocks in next_frames()
+    holds_thread = True
+
+    def __init__(self, ambulances: Dict[str, str], max_pending: int):
+        """
+        One open /stream connection. Frames are shared, pre-encoded bytes; the broker
+        appends them here and the connection's request thread drains them.
+        `ambulances` maps an in-flight ambulance id to its current intersection.
+        """
+        self.ambulances = ambulances
+        self.assigned: Dict[str, Optional[str]] = {}
+        self.closed = False
+        self._max_pending = max_pending
+        self._frames = deque()
+        self._ready = threading.Event()
+
+    def push(self, frame: bytes):
+        # A consumer that stopped reading is dropped instead of buffering without bound
+        if len(self._frames) >= self._max_pending:
+            self.closed = True
+        else:
+            self._frames.append(frame)
+        self._wake()
+
+    def _wake(self):
+        self._ready.set()
+
+    def _drain(self) -> List[bytes]:
+        frames = []
+        while self._frames:
+            frames.append(self._frames.popleft())
+        return frames
+
+    def next_frames(self, timeout: float) -> List[bytes]:
+        """Blocks up to `timeout` seconds; an empty list means nothing happened (send a keep-alive)."""
+        if not self._frames:
+            self._ready.wait(timeout)
+        self._ready.clear()
+        return self._drain()
+
+class AsyncStreamSubscriber(StreamSubscriber):
+    holds_thread = False
+
+    def __init__(self, ambulances: Dict[str, str], max_pending: int):
+        """Same subscriber for the ASGI app: the broker thread wakes the event loop instead of a thread."""
+        import asyncio
+        super().__init__(ambulances, max_pending)
+        self._loop = asyncio.get_running_loop()
+        self._async_ready = asyncio.Event()
+
+    def _wake(self):
+        self._loop.call_soon_threadsafe(self._async_ready.set)
+
+    async def next_frames_async(self, timeout: float) -> List[bytes]:
+        import asyncio
+        if not self._frames:
+            try:
+                await asyncio.wait_for(self._async_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._async_ready.clear()
+        return self._drain()
+
+class StreamBroker:
+    def __init__(self, routing_service):
+        """
+        Server-sent-event fan-out for occupancy changes and per-ambulance reassignments.
+        RoutingService hands every applied change to a dispatcher thread, so writes never wait
+        on subscribers. Each occupancy event is serialized ONCE and the same bytes are queued
+        to every subscriber; only ambulances standing on intersections whose dispatch decision
+        was repaired are re-evaluated.
+        """
+        self.routing_service = routing_service
+        self.keepalive_seconds = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+        self.max_pending = int(os.getenv("STREAM_MAX_PENDING", "256"))
+        self.sync_seconds = float(os.getenv("STREAM_SYNC_SECONDS", "1"))
+        # Each Flask (WSGI) subscriber pins a worker thread for as long as the stream is open, so
+        # they are capped below the server's thread count; the ASGI app's streams hold no thread
+        self.max_thread_subscribers = int(os.getenv("STREAM_MAX_THREAD_SUBSCRIBERS", "32"))
+
+        self._subscribers: Set[StreamSubscriber] = set()
+        self._thread_subscribers = 0
+        # intersection -> {(subscriber, ambulance_id)} of the ambulances standing there
+        self._watchers: Dict[str, Set[Tuple[StreamSubscriber, str]]] = {}
+        self._lock = threading.Lock()
+        self._event_ids = count(1)
+        # Written by the dispatcher thread, read by request threads: both under self._lock
+        self._stats = {"events": 0, "frames_delivered": 0, "reevaluated": 0, "reassigned": 0, "dropped": 0}
+
+        self._changes = queue.Queue()
+        routing_service.add_change_listener(self._changes.put)
+        threading.Thread(target=self._dispatch_loop, name="stream-dispatch", daemon=True).start()
+
+    @staticmethod
+    def parse_ambulances(values: List[str]) -> Dict[str, str]:
+        """Parses `?ambulance=<id>:<intersection>` query values (a bare intersection is its own id)."""
+        ambulances = {}
+        for value in values:
+            ambulance_id, _, location = value.rpartition(":")
+            location = location.strip().upper()
+            if not location:
+                raise ValueError(f"Invalid ambulance '{value}'. Expected <ambulance_id>:<intersection>.")
+            ambulances[ambulance_id.strip() or location] = location
+        return ambulances
+
+    def subscribe(self, ambulances: Dict[str, str], subscriber_class=StreamSubscriber) -> StreamSubscriber:
+        """Opens a subscriber and queues the current assignment of each registered ambulance."""
+        for ambulance_id, location in ambulances.items():
+            if not self.routing_service.city_graph.has_node(location):
+                raise ValueError(f"Ambulance {ambulance_id}: location {location} does not exist.")
+
+        subscriber = subscriber_class(ambulances, self.max_pending)
+        with self._lock:
+            if subscriber.holds_thread:
+                if 0 < self.max_thread_subscribers <= self._thread_subscribers:
+                    raise StreamFullError(f"Too many open streams ({self.max_thread_subscribers}). Retry later.")
+                self._thread_subscribers += 1
+            # Decided and queued under the lock: the dispatcher only sees this subscriber once its
+            # initial assignments are in, so they always precede any reassignment frame
+            for ambulance_id, location in ambulances.items():
+                decision = self._decide(location)
+                subscriber.assigned[ambulance_id] = self._hospital_id(decision)
+                subscriber.push(self._frame("assignment", self._assignment_payload(ambulance_id, None, decision)))
+            self._subscribers.add(subscriber)
+            for ambulance_id, location in ambulances.items():
+                self._watchers.setdefault(location, set()).add((subscriber, ambulance_id))
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers.discard(subscriber)
+            self._thread_subscribers -= subscriber.holds_thread
+            for ambulance_id, location in subscriber.ambulances.items():
+                watchers = self._watchers.get(location)
+                if watchers is not None:
+                    watchers.discard((subscriber, ambulance_id))
+                    if not watchers:
+                        del self._watchers[location]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self._stats,
+                subscribers=len(self._subscribers),
+                watched_ambulances=sum(len(watchers) for watchers in self._watchers.values())
+            )
+
+    def _dispatch_loop(self):
+        while True:
+            try:
+                change = self._changes.get(timeout=self.sync_seconds)
+            except queue.Empty:
+                # Idle: pick up occupancy published by other workers, which notifies us in turn
+                if self._subscribers:
+                    self.routing_service.sync_occupancy()
+                continue
+            try:
+                self._publish(change)
+            except Exception as e:
+                print(f"[!] Stream dispatch failed: {e}")
+
+    def _publish(self, change: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            affected = [
+                (node, list(self._watchers[node])) for node in change["changed_nodes"] if node in self._watchers
+            ]
+
+        deliveries = []
+        if change["type"] == "occupancy":
+            frame = self._frame("occupancy", {
+                "hospitals": change["hospitals"],
+                "occupancy_version": change["occupancy_version"]
+            })
+            deliveries = [(subscriber, frame) for subscriber in subscribers]
+
+        # Re-evaluate only the ambulances whose intersection got a new dispatch decision
+        reevaluated = reassigned = dropped = 0
+        for node, watchers in affected:
+            decision = self._decide(node)
+            hospital_id = self._hospital_id(decision)
+            reevaluated += len(watchers)
+            for subscriber, ambulance_id in watchers:
+                previous = subscriber.assigned.get(ambulance_id)
+                if previous == hospital_id:
+                    continue
+                subscriber.assigned[ambulance_id] = hospital_id
+                payload = self._assignment_payload(ambulance_id, previous, decision)
+                deliveries.append((subscriber, self._frame("assignment", payload)))
+                reassigned += 1
+
+        for subscriber, frame in deliveries:
+            subscriber.push(frame)
+            if subscriber.closed:
+                dropped += 1
+                self.unsubscribe(subscriber)
+
+        with self._lock:
+            self._stats["events"] += 1
+            self._stats["frames_delivered"] += len(deliveries)
+            self._stats["reevaluated"] += reevaluated
+            self._stats["reassigned"] += reassigned
+            self._stats["dropped"] += dropped
+
+    def _decide(self, location: str) -> Dict[str, Any]:
+        try:
+            return self.routing_service.find_optimal_hospital(location)
+        except ValueError as e:
+            return {"ambulance_start_node": location, "error": str(e)}
+
+    @staticmethod
+    def _hospital_id(decision: Dict[str, Any]) -> Optional[str]:
+        return decision["optimal_hospital"]["id"] if "optimal_hospital" in decision else None
+
+    @staticmethod
+    def _assignment_payload(ambulance_id: str, previous: Optional[str], decision: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ambulance_id": ambulance_id, "previous_hospital_id": previous, **decision}
+
+    def _frame(self, event: str, data: Dict[str, Any]) -> bytes:
+        return f"id: {next(self._event_ids)}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode()
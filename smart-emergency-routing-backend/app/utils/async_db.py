@@ -0,0 +1,39 @@
+# app/utils/async_db.py
+
+import os
+import threading
+from app.utils.db import get_db, is_mock_db
+from app.utils.metrics import MongoCommandMetrics
+
+_ASYNC_DB = None
+_LOCK = threading.Lock()
+
+def get_async_db():
+    """
+    Returns the database from a process-wide pooled Motor (asyncio) client for the ASGI app.
+    Falls back to a mongomock-motor wrapper around the SAME in-memory store as get_db(),
+    so the async request handlers and the (sync) service warm-up see identical data.
+    """
+    global _ASYNC_DB
+    if _ASYNC_DB is not None:
+        return _ASYNC_DB
+
+    with _LOCK:
+        if _ASYNC_DB is None:
+            # get_db() decides once whether the cluster is reachable and creates the indexes
+            if is_mock_db():
+                from mongomock_motor import AsyncMongoMockClient
+                mock_db = get_db()
+                _ASYNC_DB = AsyncMongoMockClient(mock_mongo_client=mock_db.client).get_database(mock_db.name)
+            else:
+                from motor.motor_asyncio import AsyncIOMotorClient
+                client = AsyncIOMotorClient(
+                    os.getenv("MONGO_URI"),
+                    serverSelectionTimeoutMS=2000,
+                    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+                    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+                    waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+                    event_listeners=[MongoCommandMetrics()]
+                )
+                _ASYNC_DB = client.get_default_database()
+    return _ASYNC_DB
@@ -2,35 +2,56 @@
 
 from functools import wraps
 from flask import request, jsonify
+from dotenv import load_dotenv
+from app.services.errors import AuthenticationError
+from app.utils.token_cache import TokenCache
 import jwt
 import os
 
+load_dotenv()
+
+# Read once at import instead of on every protected call
+JWT_SECRET = os.getenv('JWT_SECRET_KEY', 'fallback_secret')
+
+# Verified tokens skip the HMAC check until their TTL or `exp`, whichever comes first
+_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+token_cache = TokenCache(_TOKEN_CACHE_SIZE, float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))) if _TOKEN_CACHE_SIZE > 0 else None
+
+def verify_token(token: str) -> str:
+    """Returns the token's user_id; raises jwt.ExpiredSignatureError / jwt.InvalidTokenError."""
+    if token_cache is not None:
+        user_id = token_cache.get(token)
+        if user_id is not None:
+            return user_id
+
+    data = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+    user_id = data['user_id']
+    if token_cache is not None:
+        token_cache.put(token, user_id, data.get('exp'))
+    return user_id
+
+def authenticate(headers) -> str:
+    """The user_id of a request's bearer token; AuthenticationError when it is missing or invalid."""
+    auth_header = headers.get('Authorization', '')
+    token = auth_header.split(' ')[1] if auth_header.startswith('Bearer ') else None
+    if not token:
+        raise AuthenticationError("Authentication token is missing.")
+    try:
+        return verify_token(token)
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationError("Token has expired. Please log in again.")
+    except jwt.InvalidTokenError:
+        raise AuthenticationError("Invalid token. Authentication failed.")
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Check if the Authorization header exists
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-
-        if not token:
-            return jsonify({"status": "error", "message": "Authentication token is missing."}), 401
-
         try:
-            # Decode the token using our secret key
-            secret = os.getenv('JWT_SECRET_KEY', 'fallback_secret')
-            data = jwt.decode(token, secret, algorithms=["HS256"])
-            current_user_id = data['user_id']
-            
-        except jwt.ExpiredSignatureError:
-            return jsonify({"status": "error", "message": "Token has expired. Please log in again."}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({"status": "error", "message": "Invalid token. Authentication failed."}), 401
+            current_user_id = authenticate(request.headers)
+        except AuthenticationError as e:
+            return jsonify({"status": "error", "message": str(e)}), 401
 
         # Pass the verified user ID to the protected route
         return f(current_user_id, *args, **kwargs)
-    
-    return decorated
\ No newline at end of file
+
+    return decorated
@@ -1,45 +1,120 @@
 # app/utils/db.py
 
+import inspect
 import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+import threading
+from pymongo import MongoClient, ASCENDING
+from pymongo.errors import ConnectionFailure, ConfigurationError, OperationFailure, PyMongoError
 from dotenv import load_dotenv
+from app.utils.metrics import MongoCommandMetrics
 
 # Load environment variables from the .env file
 load_dotenv()
 
 _MOCK_DB = None
+_CLIENT = None          # One pooled MongoClient per process, shared by every service
+_USE_MOCK = False       # Set once the real cluster was found unreachable
+_LOCK = threading.Lock()
+_INDEX_CONFLICT_CODES = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
 
 def get_db():
     """
-    Establishes a connection to MongoDB with an automatic mock fallback.
+    Returns the database from a process-wide pooled MongoClient, with an automatic mock fallback.
+    The client is created and pinged ONCE; later calls reuse its connection pool.
+    Pool sizes come from MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE.
     """
-    global _MOCK_DB
+    global _CLIENT, _USE_MOCK
     uri = os.getenv("MONGO_URI")
     
     # Check if URI is present
     if not uri:
         if _MOCK_DB is None:
             print("[!] No MONGO_URI found in .env. Falling back to PERSISTENT Mock Database.")
-            import mongomock
-            _MOCK_DB = mongomock.MongoClient().smart_emergency_db
-        return _MOCK_DB
-
-    try:
-        from pymongo import MongoClient
-        from pymongo.errors import ConnectionFailure, ConfigurationError
-        
-        client = MongoClient(uri, serverSelectionTimeoutMS=2000)
-        # Verify connection
-        client.admin.command('ping') 
-        return client.get_default_database()
-    
-    except (ConnectionFailure, ConfigurationError, Exception) as e:
-        if _MOCK_DB is None:
-            print(f"Error: Could not connect to MongoDB Atlas: {e}")
-            print("Fallback: Using PERSISTENT Local Mock Database (In-Memory).")
-            import mongomock
-            _MOCK_DB = mongomock.MongoClient().smart_emergency_db
-        return _MOCK_DB
+        return _get_mock_db()
+
+    if _CLIENT is not None:
+        return _CLIENT.get_default_database()
+    if _USE_MOCK:
+        return _get_mock_db()
 
-
\ No newline at end of file
+    with _LOCK:
+        if _CLIENT is None and not _USE_MOCK:
+            try:
+                client = MongoClient(
+                    uri,
+                    serverSelectionTimeoutMS=2000,
+                    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+                    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+                    waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+                    event_listeners=[MongoCommandMetrics()]
+                )
+                # Verify connection
+                client.admin.command('ping')
+                ensure_indexes(client.get_default_database())
+                _CLIENT = client
+            except (ConnectionFailure, ConfigurationError, Exception) as e:
+                print(f"Error: Could not connect to MongoDB Atlas: {e}")
+                print("Fallback: Using PERSISTENT Local Mock Database (In-Memory).")
+                _USE_MOCK = True
+
+    if _CLIENT is not None:
+        return _CLIENT.get_default_database()
+    return _get_mock_db()
+
+def is_mock_db() -> bool:
+    """True when get_db() serves the in-memory mock (no MONGO_URI, or the cluster was unreachable)."""
+    get_db()
+    return _CLIENT is None
+
+def _get_mock_db():
+    global _MOCK_DB
+    if _MOCK_DB is None:
+        with _LOCK:
+            if _MOCK_DB is None:
+                import mongomock
+                _accept_bulk_sort(mongomock)
+                db = mongomock.MongoClient().smart_emergency_db
+                ensure_indexes(db)
+                _MOCK_DB = db
+    return _MOCK_DB
+
+def _accept_bulk_sort(mongomock):
+    """
+    pymongo >= 4.11 hands bulk updates a `sort` option that mongomock 4.x does not take yet,
+    so every bulk_write against the mock would raise TypeError. None of our updates sort:
+    drop the option. (requirements-dev.txt pins a pair that needs no adapter.)
+    """
+    builder = mongomock.collection.BulkOperationBuilder
+    if "sort" in inspect.signature(builder.add_update).parameters:
+        return
+    add_update = builder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+    builder.add_update = add_update_without_sort
+
+def ensure_indexes(db):
+    """
+    Creates the indexes the hot queries rely on (idempotent, safe on every boot):
+    login by email, occupancy updates by hospital_id, graph loads and road updates.
+    Nodes and roads are unique, so a re-run or resumed import can never duplicate them
+    (roads are undirected and imported as (min, max), see road_import.road_key).
+    """
+    indexes = [
+        (db.users, [("email", ASCENDING)], {"unique": True}),
+        (db.hospitals, [("hospital_id", ASCENDING)], {}),
+        (db.map_nodes, [("node_id", ASCENDING)], {"unique": True}),
+        (db.map_edges, [("source", ASCENDING), ("target", ASCENDING)], {"unique": True})
+    ]
+    for collection, keys, options in indexes:
+        try:
+            try:
+                collection.create_index(keys, **options)
+            except OperationFailure as e:
+                if e.code not in _INDEX_CONFLICT_CODES:
+                    raise
+                # Same keys indexed with other options (e.g. the earlier non-unique index): replace it
+                collection.drop_index(keys)
+                collection.create_index(keys, **options)
+        except PyMongoError as e:
+            print(f"[!] Could not create index {keys} on {collection.name}: {e}")
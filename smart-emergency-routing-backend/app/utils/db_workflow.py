@@ -0,0 +1,46 @@
+# app/utils/db_workflow.py
+
+from typing import Any, Generator, NamedTuple, Tuple
+from app.utils.executor import run_cpu
+
+class DbCall(NamedTuple):
+    """One MongoDB call a workflow needs: db[collection].method(*args, **kwargs)."""
+    collection: str
+    method: str
+    args: tuple
+    kwargs: dict
+
+def db_call(collection: str, method: str, *args: Any, **kwargs: Any) -> DbCall:
+    return DbCall(collection, method, args, kwargs)
+
+# A service operation written once as a generator: it yields DbCalls, receives their results
+# (a list for "find") and returns its answer. run_workflow drives it on the pymongo database
+# (Flask), run_workflow_async on Motor (ASGI), so the two apps share one implementation.
+Workflow = Generator[DbCall, Any, Any]
+
+def run_workflow(workflow: Workflow, db) -> Any:
+    """Runs a workflow to completion against a synchronous (pymongo / mongomock) database."""
+    done, step = _advance(workflow, None)
+    while not done:
+        result = getattr(db[step.collection], step.method)(*step.args, **step.kwargs)
+        done, step = _advance(workflow, list(result) if step.method == "find" else result)
+    return step
+
+async def run_workflow_async(workflow: Workflow, db) -> Any:
+    """
+    Runs a workflow against a Motor database: MongoDB calls are awaited on the event loop,
+    the workflow's own (in-memory, CPU-bound) steps run in the CPU executor.
+    """
+    done, step = await run_cpu(_advance, workflow, None)
+    while not done:
+        result = getattr(db[step.collection], step.method)(*step.args, **step.kwargs)
+        result = await (result.to_list(None) if step.method == "find" else result)
+        done, step = await run_cpu(_advance, workflow, result)
+    return step
+
+def _advance(workflow: Workflow, value: Any) -> Tuple[bool, Any]:
+    """(done, next DbCall or return value). StopIteration cannot cross an executor future."""
+    try:
+        return False, workflow.send(value)
+    except StopIteration as finished:
+        return True, finished.value
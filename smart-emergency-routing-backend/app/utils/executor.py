@@ -0,0 +1,19 @@
+# app/utils/executor.py
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Graph searches, dispatch-map repairs and password hashing run here so the event loop
+# keeps serving I/O-bound requests while they compute
+_CPU_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ASYNC_CPU_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    thread_name_prefix="cpu"
+)
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Runs a blocking / CPU-bound call in the shared executor and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CPU_EXECUTOR, functools.partial(fn, *args, **kwargs))
@@ -0,0 +1,24 @@
+# app/utils/geo.py
+
+from typing import Any, Dict, Optional, Tuple
+
+# Kept free of NumPy / SciPy so request handlers can validate positions without loading the spatial index
+
+def validate_position(lat: Any, lon: Any) -> Tuple[float, float]:
+    """(lat, lon) as floats; ValueError for anything that is not a position on Earth."""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        raise ValueError("Latitude and longitude must be numbers.")
+    if not (abs(lat) <= 90 and abs(lon) <= 180):
+        raise ValueError("Latitude must be within [-90, 90] and longitude within [-180, 180].")
+    return lat, lon
+
+def gps_position(data: Dict[str, Any]) -> Optional[Tuple[Any, Any]]:
+    """(lat, lon) from a request body ({"lat", "lon"} at the top level or as ambulance_location), else None."""
+    location = data.get('ambulance_location')
+    source = location if isinstance(location, dict) else data
+    for lat_key, lon_key in (('lat', 'lon'), ('latitude', 'longitude')):
+        if lat_key in source and lon_key in source:
+            return source[lat_key], source[lon_key]
+    return None
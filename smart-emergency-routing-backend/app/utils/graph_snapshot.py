@@ -0,0 +1,159 @@
+# app/utils/graph_snapshot.py
+"""
+Versioned, memory-mappable binary snapshot of the city graph and its routing
+precomputation (dispatch map labels, ALT landmark tables).
+
+Layout:  MAGIC | format version (u32) | reserved (u32) | header length (u64)
+         | JSON header | 64-byte aligned raw arrays ...
+
+Workers map the file copy-on-write, so every process shares one physical copy of
+the road network in the page cache and only pages they modify become private.
+"""
+
+import datetime
+import json
+import mmap
+import struct
+import numpy as np
+from typing import Any, Dict, Optional
+
+from app.models.csr_graph import CSRCityGraph
+from app.models.dispatch_map import DispatchMap
+from app.models.landmarks import LandmarkIndex
+from app.models.route_accelerator import RouteAccelerator
+
+MAGIC = b"SERSSNAP"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sIIQ")
+_ALIGNMENT = 64
+
+class GraphSnapshot:
+    def __init__(self, header: Dict[str, Any], city_graph: CSRCityGraph, arrays: Dict[str, np.ndarray], buffer: mmap.mmap):
+        """A loaded snapshot: the graph plus whatever precomputation was exported with it."""
+        self.header = header
+        self.city_graph = city_graph
+        self._arrays = arrays
+        self._buffer = buffer  # Keeps the mapping alive as long as the arrays are used
+
+    @property
+    def graph_version(self) -> str:
+        return self.header["graph_version"]
+
+    def restore_dispatch_map(self, hospitals: Dict[str, Any]) -> DispatchMap:
+        """Rebuilds the DispatchMap from stored labels, repairing hospitals whose wait changed."""
+        if "dispatch_cost" not in self._arrays:
+            return DispatchMap(self.city_graph, hospitals)
+
+        node_ids = self.city_graph.nodes()
+        cost = self._arrays["dispatch_cost"].tolist()
+        owner = self._arrays["dispatch_owner"].tolist()
+        next_hop = self._arrays["dispatch_next_hop"].tolist()
+        labels = {
+            node_ids[i]: (cost[i], node_ids[owner[i]], node_ids[next_hop[i]] if next_hop[i] >= 0 else None)
+            for i in range(len(node_ids)) if owner[i] >= 0
+        }
+        return DispatchMap.from_labels(self.city_graph, hospitals, labels, self.header["dispatch_waiting_times"])
+
+def write_snapshot(path: str, city_graph, dispatch_map: Optional[DispatchMap] = None,
+                   graph_version: Optional[str] = None, map_version: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Writes `city_graph` (converted to CSR if needed) and optional precomputation to `path`.
+    `map_version` is the MongoDB road-network revision the graph was read at; workers only
+    use the snapshot while the database is still at that revision. Returns the header written.
+    """
+    accelerator = getattr(city_graph, "accelerator", None)
+    if not isinstance(city_graph, CSRCityGraph):
+        city_graph = _to_csr(city_graph)
+
+    node_ids = city_graph.nodes()
+    if any("\0" in node for node in node_ids):
+        raise ValueError("Node IDs must not contain NUL characters.")
+
+    arrays = {"node_ids": np.frombuffer("\0".join(node_ids).encode("utf-8"), dtype=np.uint8)}
+    arrays.update(city_graph.to_arrays())
+    header: Dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "graph_version": graph_version or datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ"),
+        "map_version": map_version,
+        "node_count": len(node_ids),
+        "road_count": int(len(arrays["edge_src"]))
+    }
+
+    # 1. Dispatch map labels (node index based, -1 = none)
+    if dispatch_map is not None:
+        node_index = {node: i for i, node in enumerate(node_ids)}
+        arrays["dispatch_cost"] = np.array([dispatch_map.cost.get(node, np.inf) for node in node_ids], dtype=np.float64)
+        arrays["dispatch_owner"] = np.array([node_index.get(dispatch_map.owner.get(node), -1) for node in node_ids], dtype=np.int32)
+        arrays["dispatch_next_hop"] = np.array([node_index.get(dispatch_map.next_hop.get(node), -1) for node in node_ids], dtype=np.int32)
+        header["dispatch_waiting_times"] = {
+            hospital_id: hospital.calculate_waiting_time() for hospital_id, hospital in dispatch_map.hospitals.items()
+        }
+
+    # 2. ALT landmark tables, if fresh preprocessing exists
+    if accelerator and accelerator.is_fresh() and accelerator.landmarks:
+        landmarks = accelerator.landmarks
+        order = [landmarks.node_index[node] for node in node_ids]
+        arrays["landmark_table"] = np.ascontiguousarray(landmarks.table[order])
+        header["landmarks"] = landmarks.landmarks
+
+    # 3. Lay the arrays out after the JSON header, each 64-byte aligned
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    header["arrays"] = layout
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = -(-(_PREAMBLE.size + len(header_bytes)) // _ALIGNMENT) * _ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    return header
+
+def load_snapshot(path: str) -> GraphSnapshot:
+    """
+    Maps a snapshot copy-on-write and wraps its arrays without copying them.
+    Raises ValueError for foreign or incompatible files.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, format_version, _, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a graph snapshot: {path}")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {format_version} (expected {FORMAT_VERSION}).")
+
+    header = json.loads(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length].decode("utf-8"))
+    data_start = -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + spec["offset"]).reshape(spec["shape"])
+
+    node_ids = arrays.pop("node_ids").tobytes().decode("utf-8").split("\0") if header["node_count"] else []
+    city_graph = CSRCityGraph.from_arrays(node_ids, arrays)
+
+    if "landmark_table" in arrays:
+        landmarks = LandmarkIndex.from_table(node_ids, header["landmarks"], arrays["landmark_table"])
+        city_graph.accelerator = RouteAccelerator.from_landmarks(city_graph, landmarks)
+
+    return GraphSnapshot(header, city_graph, arrays, buffer)
+
+def _to_csr(city_graph) -> CSRCityGraph:
+    csr_graph = CSRCityGraph()
+    nodes = city_graph.nodes()
+    csr_graph.add_intersections(nodes)
+    csr_graph.add_roads([(node, neighbor, weight) for node in nodes
+                         for neighbor, weight in city_graph.neighbors(node) if node <= neighbor])
+    if getattr(city_graph, "time_profiles", None) is not None:
+        csr_graph.set_time_profiles(city_graph.time_profiles, city_graph.profiled_roads())
+    return csr_graph
@@ -0,0 +1,115 @@
+# app/utils/http_cache.py
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+try:
+    import brotli  # Optional: `pip install brotli` adds Content-Encoding: br
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are cheaper to send as-is than to compress
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
+class CachedPayload:
+    def __init__(self, body: bytes):
+        """
+        A serialized JSON response with a content-derived strong ETag, so every worker
+        hands out the same validator for the same data. Compressed variants are built
+        once, on first request, and reused until the payload is replaced.
+        """
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self._encoded: Dict[str, bytes] = {"identity": body}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._encoded.get(encoding)
+                if body is None:
+                    if encoding == "br":
+                        body = brotli.compress(self.body, quality=5)
+                    else:
+                        body = gzip.compress(self.body, compresslevel=6, mtime=0)
+                    self._encoded[encoding] = body
+        return body
+
+    def etag_for(self, encoding: str) -> str:
+        # Each representation needs its own strong ETag (RFC 9110 8.8.3)
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+class PayloadCache:
+    def __init__(self):
+        """Serialized success responses by name, rebuilt only when their version key changes."""
+        self._entries: Dict[str, Tuple[Hashable, CachedPayload]] = {}
+
+    def get(self, name: str, version: Hashable, build: Callable[[], Any]) -> CachedPayload:
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        body = json.dumps({"status": "success", "data": build()}, separators=(",", ":")).encode("utf-8")
+        payload = CachedPayload(body)
+        self._entries[name] = (version, payload)
+        return payload
+
+def choose_encoding(accept_encoding: Optional[str], size: int) -> str:
+    """Best Content-Encoding the client accepts for a body of `size` bytes: br, gzip or identity."""
+    if not accept_encoding or size < COMPRESS_MIN_BYTES:
+        return "identity"
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+def etag_matches(if_none_match: Optional[str], payload: CachedPayload) -> bool:
+    """Weak comparison (as If-None-Match requires) against any representation of `payload`."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in (payload.etag, payload.etag_for("gzip"), payload.etag_for("br")):
+            return True
+    return False
+
+def conditional_response(payload: CachedPayload, headers: Mapping[str, str]) -> Tuple[bytes, int, Dict[str, str]]:
+    """
+    (body, status, headers) for a GET of `payload`: 304 with no body when the client's
+    If-None-Match still matches, otherwise the body in the best accepted encoding.
+    Framework-agnostic so the Flask and ASGI controllers share it.
+    """
+    encoding = choose_encoding(headers.get("Accept-Encoding"), len(payload.body))
+    response_headers = {
+        "ETag": payload.etag_for(encoding),
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache"  # Cache, but revalidate every time: the data is live
+    }
+    if etag_matches(headers.get("If-None-Match"), payload):
+        return b"", 304, response_headers
+
+    response_headers["Content-Type"] = "application/json"
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return payload.encoded(encoding), 200, response_headers
@@ -0,0 +1,85 @@
+# app/utils/instrumentation.py
+
+import os
+import time
+from typing import Any, Dict, Iterable, Tuple
+from app import _IMPORTED_AT
+from app.utils.metrics import HTTP_REQUEST_SECONDS, render_prometheus
+from app.utils.profiler import profiler_from_env
+
+# Framework-agnostic: Flask and Quart share the `g` / `request` attributes used here, so
+# create_app() and create_asgi_app() only wire these calls into their own hooks and routes
+
+class AppInstrumentation:
+    def __init__(self, services: Iterable[str]):
+        """
+        Startup timings, per-route latency, the optional slow-request profiler, warm-up and
+        readiness for one app that serves the named `services` (see provider.WSGI_SERVICES).
+        """
+        from app.services.provider import register_service_gauges
+        self.services = tuple(services)
+        self.startup = {"create_app_ms": None, "import_to_first_request_ms": None}
+        register_service_gauges()
+        self.profiler = profiler_from_env()
+
+    def app_created(self):
+        self.startup["create_app_ms"] = self._ms_since_import()
+
+    def start_warm_up(self):
+        """Builds the services in the background (unless SERVICE_WARMUP=false); earlier requests wait for them."""
+        from app.services.provider import start_warm_up_thread
+        if os.getenv("SERVICE_WARMUP", "true").lower() in ("1", "true", "yes"):
+            start_warm_up_thread(self.services)
+
+    def request_started(self, g, request):
+        if self.startup["import_to_first_request_ms"] is None:
+            self.startup["import_to_first_request_ms"] = self._ms_since_import()
+            print(f"[startup] import-to-first-request: {self.startup['import_to_first_request_ms']} ms")
+        g.request_started = time.perf_counter()
+        if self.profiler:
+            # Keyed per request: ASGI requests share the event-loop thread
+            g.profile_key = self.profiler.start_request(f"{request.method} {request.full_path.rstrip('?')}", key=object())
+
+    def request_finished(self, g, request, response):
+        started = g.get("request_started")
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                         method=request.method, route=route, status=response.status_code)
+        return response
+
+    def request_torn_down(self, g):
+        if self.profiler and g.get("profile_key") is not None:
+            self.profiler.end_request(g.profile_key)
+
+    @staticmethod
+    def metrics() -> Tuple[str, str]:
+        """(body, mimetype) of the Prometheus scrape endpoint."""
+        return render_prometheus(), "text/plain; version=0.0.4"
+
+    def slow_requests(self) -> Tuple[Dict[str, Any], int]:
+        if self.profiler is None:
+            return {"status": "error", "message": "Profiler disabled. Set PROFILE_SLOW_REQUESTS."}, 404
+        return {"status": "success", "data": self.profiler.report()}, 200
+
+    @staticmethod
+    def health() -> Dict[str, Any]:
+        return {"status": "healthy", "service": "Smart Emergency Routing System API"}
+
+    def readiness(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Ready once every service is built. A probe that finds services missing starts building
+        them (also with SERVICE_WARMUP=false), so a readiness-gated load balancer never waits
+        on traffic that cannot arrive.
+        """
+        from app.services.provider import services_status, start_warm_up_thread
+        services = services_status(self.services)
+        ready = all(service["ready"] for service in services.values())
+        if not ready:
+            start_warm_up_thread(self.services)
+        body = {"status": "ready" if ready else "starting", "services": services, "startup": self.startup}
+        return body, (200 if ready else 503)
+
+    @staticmethod
+    def _ms_since_import() -> float:
+        return round((time.perf_counter() - _IMPORTED_AT) * 1000, 1)
@@ -0,0 +1,18 @@
+# app/utils/map_version.py
+
+from typing import Any, Dict
+
+# One counter document in `graph_meta`, bumped AFTER every write to map_nodes / map_edges.
+# A graph snapshot records the counter it was built from, so a worker can tell at boot
+# whether the road network changed since the export (e.g. live road-weight updates).
+MAP_VERSION_FILTER: Dict[str, Any] = {"_id": "map"}
+MAP_VERSION_BUMP: Dict[str, Any] = {"$inc": {"version": 1}}
+
+def read_map_version(db) -> int:
+    """Current revision of the road network in MongoDB (0 before the first recorded write)."""
+    doc = db.graph_meta.find_one(MAP_VERSION_FILTER, {"version": 1})
+    return int(doc["version"]) if doc else 0
+
+def bump_map_version(db):
+    """Records that map_nodes / map_edges changed. Call after the write, never before."""
+    db.graph_meta.update_one(MAP_VERSION_FILTER, MAP_VERSION_BUMP, upsert=True)
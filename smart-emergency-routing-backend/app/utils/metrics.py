@@ -0,0 +1,196 @@
+# app/utils/metrics.py
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+# Every metric keeps one shard per thread: the hot path only touches the calling thread's
+# own dict (no lock), and a /metrics scrape sums the shards. Cheap enough to leave on.
+_REGISTRY: List["_Metric"] = []
+_GAUGES: List[Tuple[str, str, Callable[[], Dict[Tuple[Tuple[str, str], ...], float]]]] = []
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SETTLED_BUCKETS = (1, 4, 16, 64, 256, 1024, 4096, 16384, 65536, 262144)
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, ...], Any]] = []
+        self._shards_lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _shard(self) -> Dict[Tuple[str, ...], Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:  # Once per thread
+                self._shards.append(shard)
+            return shard
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _label_text(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _collect_shards(self) -> List[Dict[Tuple[str, ...], Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # list(dict.items()) runs without releasing the GIL, so it is a consistent copy
+        return [dict(shard.items()) for shard in shards]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._collect_shards():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in sorted(totals.items())]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: Any):
+        shard = self._shard()
+        key = self._key(labels)
+        entry = shard.get(key)
+        if entry is None:
+            # [per-bucket counts (+Inf last), sum]
+            entry = shard[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def time(self, **labels: Any) -> "_Timer":
+        """Context manager / decorator observing the elapsed seconds."""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], list] = {}
+        for shard in self._collect_shards():
+            for key, (counts, total) in shard.items():
+                merged = totals.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+
+        lines = []
+        for key, (counts, total) in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le_label = 'le="%s"' % ("+Inf" if bound == float('inf') else _number(bound))
+                lines.append(f"{self.name}_bucket{self._label_text(key, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        histogram, labels = self._histogram, self._labels
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, **labels)
+        return timed
+
+def register_gauge(name: str, documentation: str, collect: Callable[[], Dict[Tuple[Tuple[str, str], ...], float]]):
+    """A gauge computed at scrape time: `collect()` returns {((label, value), ...): number}."""
+    if any(existing == name for existing, _, _ in _GAUGES):
+        return  # create_app() may run more than once per process
+    _GAUGES.append((name, documentation, collect))
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for name, documentation, collect in _GAUGES:
+        try:
+            samples = collect()
+        except Exception:
+            continue  # A half-built service must not break the scrape
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in sorted(samples.items()):
+            label_text = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}" if labels else ""
+            lines.append(f"{name}{label_text} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+# --- Metrics shared across the app ---
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "sers_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status"))
+GRAPH_SEARCH_SECONDS = Histogram(
+    "sers_graph_search_duration_seconds", "Time spent in city-graph searches.", ("backend", "operation"))
+GRAPH_SETTLED_NODES = Histogram(
+    "sers_graph_search_settled_nodes", "Nodes settled per graph search.", ("backend", "operation"), SETTLED_BUCKETS)
+SERVICE_STEP_SECONDS = Histogram(
+    "sers_service_step_duration_seconds", "Time spent in RoutingService loading steps.", ("step",))
+MONGO_COMMAND_SECONDS = Histogram(
+    "sers_mongo_command_duration_seconds", "MongoDB command latency (real cluster only).", ("command",))
+MONGO_COMMAND_FAILURES = Counter(
+    "sers_mongo_command_failures_total", "Failed MongoDB commands.", ("command",))
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener feeding the Mongo latency histogram (pass via event_listeners=)."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name)
+
+    def failed(self, event):
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name)
+        MONGO_COMMAND_FAILURES.inc(command=event.command_name)
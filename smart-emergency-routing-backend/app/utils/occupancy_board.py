@@ -0,0 +1,127 @@
+# app/utils/occupancy_board.py
+
+import fcntl
+import os
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+_ID_BYTES = 32
+_HEADER_WORDS = 4  # [version, slot_count, max_slots, reserved]
+
+class OccupancyBoard:
+    def __init__(self, name: str, max_slots: int = 4096):
+        """
+        Cross-process occupancy channel in POSIX shared memory.
+        Every worker on the host maps the same segment; a writer publishes occupancy
+        under a file lock and bumps a version counter (seqlock), and readers pick up
+        changed slots with plain memory reads - no database round-trip.
+        """
+        self.name = name
+        size = _HEADER_WORDS * 8 + max_slots * (_ID_BYTES + 16)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # The segment outlives any single worker: stop Python unlinking it on exit
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        buf = self._shm.buf
+        self._header = np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=buf)
+        if self._header[2] == 0:
+            self._header[2] = max_slots
+        self.max_slots = int(self._header[2])
+        self._ids = np.ndarray((self.max_slots, _ID_BYTES), dtype=np.uint8, buffer=buf, offset=_HEADER_WORDS * 8)
+        # Per slot: (occupancy, version stamp of its last write)
+        self._values = np.ndarray((self.max_slots, 2), dtype=np.int64, buffer=buf,
+                                  offset=_HEADER_WORDS * 8 + self.max_slots * _ID_BYTES)
+        self._slots: Dict[str, int] = {}
+        self._slot_ids: Dict[int, str] = {}
+        self._lock_path = os.path.join(_lock_dir(), f"{name}.lock")
+
+    @property
+    def version(self) -> int:
+        return int(self._header[0])
+
+    def publish(self, occupancies: Dict[str, int]):
+        """Writes new occupancy values for one or more hospitals."""
+        # Opened per call: flock on one shared descriptor would not exclude this process's own threads
+        lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            new_version = self.version + 2
+            self._header[0] = new_version - 1  # Odd: write in progress
+            for hospital_id, occupancy in occupancies.items():
+                slot = self._slot_for(hospital_id, create=True)
+                self._values[slot] = (occupancy, new_version)
+            self._header[0] = new_version
+        finally:
+            os.close(lock_fd)  # Releases the lock
+
+    def read_changes(self, since_version: int) -> Optional[tuple]:
+        """
+        Returns (version, {hospital_id: occupancy}) for slots written after
+        `since_version`, or None when nothing changed.
+        """
+        for _ in range(100):
+            version = self.version
+            if version == since_version:
+                return None
+            if version % 2:
+                continue  # A writer is mid-update, retry
+            self._refresh_slots()
+            changed = np.flatnonzero(self._values[:int(self._header[1]), 1] > since_version)
+            changes = {self._slot_ids[slot]: int(self._values[slot, 0]) for slot in changed}
+            if self.version == version:
+                return version, changes
+        return None
+
+    def _slot_for(self, hospital_id: str, create: bool = False) -> int:
+        self._refresh_slots()
+        if hospital_id in self._slots:
+            return self._slots[hospital_id]
+        if not create:
+            raise KeyError(hospital_id)
+        encoded = hospital_id.encode("utf-8")
+        if len(encoded) > _ID_BYTES:
+            raise ValueError(f"Hospital ID too long for the occupancy board: {hospital_id}")
+        slot = int(self._header[1])
+        if slot >= self.max_slots:
+            raise ValueError("Occupancy board is full.")
+        self._ids[slot] = 0
+        self._ids[slot, :len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+        self._header[1] = slot + 1
+        self._slots[hospital_id] = slot
+        self._slot_ids[slot] = hospital_id
+        return slot
+
+    def _refresh_slots(self):
+        for slot in range(len(self._slots), int(self._header[1])):
+            hospital_id = self._ids[slot].tobytes().rstrip(b"\0").decode("utf-8")
+            self._slots[hospital_id] = slot
+            self._slot_ids[slot] = hospital_id
+
+def _lock_dir() -> str:
+    """
+    Where the writer lock file lives: OCCUPANCY_BOARD_LOCK_DIR, else /dev/shm next to the
+    segment itself (same host, same lifetime), never the world-shared temp directory.
+    """
+    lock_dir = os.getenv("OCCUPANCY_BOARD_LOCK_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else "")
+    if not lock_dir:
+        raise OSError("No lock directory for the occupancy board: set OCCUPANCY_BOARD_LOCK_DIR.")
+    return lock_dir
+
+def open_occupancy_board() -> Optional[OccupancyBoard]:
+    """
+    Board named by OCCUPANCY_BOARD_NAME; None when unset (the default) or when shared memory
+    is unavailable. Opt-in because every process on the host that uses the same name shares
+    one board: give each deployment (database) its own name, e.g. "sers_occupancy_prod".
+    """
+    name = os.getenv("OCCUPANCY_BOARD_NAME", "")
+    if not name:
+        return None
+    try:
+        return OccupancyBoard(name, int(os.getenv("OCCUPANCY_BOARD_SLOTS", "4096")))
+    except (OSError, ValueError) as e:
+        print(f"[!] Occupancy board unavailable, workers will not share occupancy: {e}")
+        return None
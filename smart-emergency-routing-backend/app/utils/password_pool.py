@@ -0,0 +1,82 @@
+# app/utils/password_pool.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from werkzeug.security import generate_password_hash, check_password_hash
+
+class PasswordPool:
+    def __init__(self, max_workers: int):
+        """
+        Dedicated workers for PBKDF2 hashing and verification.
+        At most `max_workers` hashes run at once (PBKDF2 releases the GIL, so each one
+        occupies a core); a login storm queues here instead of starving every other request.
+        """
+        if max_workers <= 0:
+            raise ValueError(f"Password pool size must be greater than 0. Received: {max_workers}")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self._wait_seconds = 0.0
+
+    def hash_password(self, password: str) -> str:
+        return self.submit(generate_password_hash, password).result()
+
+    def verify_password(self, password_hash: str, password: str) -> bool:
+        return self.submit(check_password_hash, password_hash, password).result()
+
+    async def hash_password_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(generate_password_hash, password))
+
+    async def verify_password_async(self, password_hash: str, password: str) -> bool:
+        return await asyncio.wrap_future(self.submit(check_password_hash, password_hash, password))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        return self._executor.submit(self._run, submitted, fn, *args)
+
+    def _run(self, submitted: float, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._wait_seconds += time.perf_counter() - submitted
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait time, to size AUTH_HASH_WORKERS."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "avg_queue_wait_ms": round(self._wait_seconds / self.completed * 1000, 2) if self.completed else 0.0
+            }
+
+_POOL = None
+_LOCK = threading.Lock()
+
+def get_password_pool() -> PasswordPool:
+    """Process-wide pool; size from AUTH_HASH_WORKERS (default: half the cores, at least 1)."""
+    global _POOL
+    if _POOL is None:
+        with _LOCK:
+            if _POOL is None:
+                _POOL = PasswordPool(int(os.getenv("AUTH_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))))
+    return _POOL
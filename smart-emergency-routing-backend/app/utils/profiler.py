@@ -0,0 +1,91 @@
+# app/utils/profiler.py
+
+import heapq
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+class SlowRequestProfiler:
+    def __init__(self, keep: int = 10, interval_ms: float = 5.0, max_depth: int = 40):
+        """
+        Opt-in sampling profiler: a background thread snapshots the stack of every thread
+        that is serving a request every `interval_ms`. When a request finishes, its collapsed
+        stacks are kept only if it ranks among the `keep` slowest seen so far.
+
+        WSGI requests own their thread, so their stacks are their own. ASGI requests share the
+        event-loop thread: each one collects the loop's stacks while it is in flight, which
+        includes the work of concurrent requests on the same loop.
+        """
+        self.keep = keep
+        self.interval = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self._active: Dict[Any, list] = {}   # request key -> [label, started, Counter of stacks, thread ident]
+        self._slowest: List[tuple] = []      # min-heap of (duration, tiebreak, report)
+        self._tiebreak = count()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._sample_loop, name="slow-request-profiler", daemon=True).start()
+
+    def start_request(self, label: str, key: Any = None) -> Any:
+        """
+        Starts sampling the calling thread for one request. `key` tells concurrent requests on
+        the same thread apart (ASGI); by default the thread itself is the key (WSGI).
+        """
+        thread = threading.get_ident()
+        key = thread if key is None else key
+        self._active[key] = [label, time.perf_counter(), Counter(), thread]
+        return key
+
+    def end_request(self, key: Any = None):
+        active = self._active.pop(threading.get_ident() if key is None else key, None)
+        if active is None:
+            return
+        label, started, samples, _ = active
+        duration = time.perf_counter() - started
+        with self._lock:
+            if len(self._slowest) >= self.keep and duration <= self._slowest[0][0]:
+                return
+            report = {
+                "request": label,
+                "duration_ms": round(duration * 1000, 2),
+                "samples": sum(samples.values()),
+                "stacks": [{"stack": stack, "samples": hits} for stack, hits in samples.most_common(20)]
+            }
+            heapq.heappush(self._slowest, (duration, next(self._tiebreak), report))
+            if len(self._slowest) > self.keep:
+                heapq.heappop(self._slowest)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Slowest requests first, each with its most frequent collapsed stacks (root;...;leaf)."""
+        with self._lock:
+            return [report for _, _, report in sorted(self._slowest, reverse=True)]
+
+    def _sample_loop(self):
+        while True:
+            time.sleep(self.interval)
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            stacks = {}  # One collapse per thread, however many requests share it
+            for active in list(self._active.values()):
+                thread = active[3]
+                if thread not in stacks:
+                    frame = frames.get(thread)
+                    stacks[thread] = self._collapse(frame) if frame is not None else None
+                if stacks[thread] is not None:
+                    active[2][stacks[thread]] += 1
+
+    def _collapse(self, frame) -> str:
+        stack = traceback.extract_stack(frame, limit=self.max_depth)
+        return ";".join(f"{os.path.basename(entry.filename)}:{entry.name}:{entry.lineno}" for entry in stack)
+
+def profiler_from_env() -> Optional[SlowRequestProfiler]:
+    """Enabled by PROFILE_SLOW_REQUESTS=<how many to keep>; PROFILE_SAMPLE_MS sets the interval."""
+    keep = int(os.getenv("PROFILE_SLOW_REQUESTS", "0"))
+    if keep <= 0:
+        return None
+    return SlowRequestProfiler(keep, float(os.getenv("PROFILE_SAMPLE_MS", "5")))
@@ -0,0 +1,402 @@
+# app/utils/road_import.py
+"""
+Streaming import of road networks (CSV or GeoJSON edge lists) into map_nodes / map_edges.
+
+Rows are parsed and validated one at a time and written in bounded batches, so parsing
+memory stays constant; only the interned node IDs and compact NumPy edge arrays for the
+snapshot grow with the network. A checkpoint after every committed batch makes an
+interrupted import resumable, and --incremental re-imports upsert instead of inserting.
+Nodes and roads are unique in MongoDB (see ensure_indexes), so no mode can duplicate them.
+Roads are undirected: each is stored once, as (min, max) of its two node IDs.
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.csr_graph import CSRCityGraph
+from app.utils.graph_snapshot import write_snapshot
+from app.utils.map_version import bump_map_version, read_map_version
+
+CSV_EXTENSIONS = (".csv",)
+GEOJSON_EXTENSIONS = (".geojson", ".json")
+GEOJSON_SEQ_EXTENSIONS = (".geojsonl", ".geojsons", ".ndjson")
+
+# Column / property aliases found in common road-network exports (OSMnx, pgRouting, ...)
+_SOURCE_KEYS = ("source", "from", "u", "start_node")
+_TARGET_KEYS = ("target", "to", "v", "end_node")
+_WEIGHT_KEYS = ("weight", "travel_time", "minutes", "cost")
+_DEFAULT_SPEED_KMH = 30.0
+_DUPLICATE_KEY = 11000
+
+class RoadRow:
+    __slots__ = ("source", "target", "weight", "source_position", "target_position")
+
+    def __init__(self, source: str, target: str, weight: float,
+                 source_position: Optional[Tuple[float, float]] = None,
+                 target_position: Optional[Tuple[float, float]] = None):
+        """One validated road; positions are (lat, lon) when the input carries geometry."""
+        self.source = source
+        self.target = target
+        self.weight = weight
+        self.source_position = source_position
+        self.target_position = target_position
+
+def road_key(source: str, target: str) -> Tuple[str, str]:
+    """The stored orientation of an undirected road, so A-B and B-A hit the same unique key."""
+    return (source, target) if source <= target else (target, source)
+
+def road_filter(source: str, target: str) -> Dict[str, Any]:
+    """Roads are undirected, so match the edge in either orientation (older imports kept the file's)."""
+    return {"$or": [{"source": source, "target": target}, {"source": target, "target": source}]}
+
+def _first(record: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+def validate_road(record: Dict[str, Any], geometry: Optional[List[List[float]]] = None) -> RoadRow:
+    """Raises ValueError with a human-readable reason for an unusable record."""
+    source, target = _first(record, _SOURCE_KEYS), _first(record, _TARGET_KEYS)
+    if source is None or target is None:
+        raise ValueError("missing source/target")
+    source, target = str(source).strip(), str(target).strip()
+    if source == target:
+        raise ValueError(f"self-loop on {source}")
+
+    source_position = target_position = None
+    if geometry:
+        source_position = (float(geometry[0][1]), float(geometry[0][0]))
+        target_position = (float(geometry[-1][1]), float(geometry[-1][0]))
+    elif record.get("source_lat") not in (None, "") and record.get("target_lat") not in (None, ""):
+        source_position = (float(record["source_lat"]), float(record["source_lon"]))
+        target_position = (float(record["target_lat"]), float(record["target_lon"]))
+
+    weight = _first(record, _WEIGHT_KEYS)
+    if weight is None:
+        # No travel time given: derive it from the geometry length and speed limit
+        if not geometry:
+            raise ValueError("missing weight")
+        speed = float(_first(record, ("speed_kph", "maxspeed")) or _DEFAULT_SPEED_KMH)
+        weight = _line_length_km(geometry) / speed * 60
+    try:
+        weight = float(weight)
+    except (TypeError, ValueError):
+        raise ValueError(f"weight is not a number: {weight!r}")
+    if not weight > 0 or math.isinf(weight):
+        raise ValueError(f"weight must be a positive travel time in minutes: {weight}")
+    return RoadRow(source, target, weight, source_position, target_position)
+
+def _line_length_km(coordinates: List[List[float]]) -> float:
+    length = 0.0
+    for (lon1, lat1), (lon2, lat2) in zip((c[:2] for c in coordinates), (c[:2] for c in coordinates[1:])):
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+        length += 2 * 6371.0 * math.asin(math.sqrt(a))
+    return length
+
+def read_csv(path: str) -> Iterator[Tuple[Dict[str, Any], None]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {key.strip().lower(): value for key, value in row.items() if key}, None
+
+def read_geojson_seq(path: str) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    """Newline-delimited features (GeoJSONSeq / ndjson), one per line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().lstrip("\x1e")  # RFC 8142 record separators
+            if line:
+                yield _feature_record(json.loads(line))
+
+def read_geojson(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    """
+    Streams the `features` array of a FeatureCollection one feature at a time, decoding
+    from a bounded buffer instead of json.load()-ing the whole file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        # 1. Skip ahead to the opening bracket of "features"
+        while True:
+            position = buffer.find('"features"')
+            if position >= 0:
+                bracket = buffer.find("[", position)
+                if bracket >= 0:
+                    buffer = buffer[bracket + 1:]
+                    break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"No FeatureCollection 'features' array found in {path}")
+            buffer = buffer[-16:] + chunk if position < 0 else buffer + chunk
+
+        # 2. Decode one feature object at a time
+        while True:
+            buffer = buffer.lstrip(" \t\r\n,")
+            if buffer.startswith("]"):
+                return
+            try:
+                feature, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    if buffer.strip():
+                        raise ValueError(f"Truncated GeoJSON in {path}")
+                    return
+                buffer += chunk
+                continue
+            buffer = buffer[end:]
+            yield _feature_record(feature)
+
+def _feature_record(feature: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+    properties = {str(key).lower(): value for key, value in (feature.get("properties") or {}).items()}
+    geometry = feature.get("geometry") or {}
+    coordinates = geometry.get("coordinates") if geometry.get("type") == "LineString" else None
+    return properties, coordinates
+
+def open_reader(path: str, input_format: Optional[str] = None) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    extension = os.path.splitext(path)[1].lower()
+    input_format = input_format or (
+        "csv" if extension in CSV_EXTENSIONS else
+        "geojsonseq" if extension in GEOJSON_SEQ_EXTENSIONS else
+        "geojson" if extension in GEOJSON_EXTENSIONS else None
+    )
+    readers = {"csv": read_csv, "geojson": read_geojson, "geojsonseq": read_geojson_seq}
+    if input_format not in readers:
+        raise ValueError(f"Cannot tell the format of {path}; pass one of: {', '.join(readers)}")
+    return readers[input_format](path)
+
+class RoadImporter:
+    def __init__(self, db, batch_size: int = 5000, incremental: bool = False,
+                 checkpoint_path: Optional[str] = None, max_errors: int = 1000):
+        """
+        Writes validated roads to `db` in batches of `batch_size`.
+        incremental=False inserts and refuses collections that already hold a network (unless
+        resuming this import); incremental=True upserts each road, in either orientation, and
+        each node on node_id, so re-imports update in place.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be greater than 0. Received: {batch_size}")
+        self.db = db
+        self.batch_size = batch_size
+        self.incremental = incremental
+        self.checkpoint_path = checkpoint_path
+        self.max_errors = max_errors
+
+        # Interned nodes and compact edge arrays for the snapshot written in the same pass
+        self._node_index: Dict[str, int] = {}
+        self._node_ids: List[str] = []
+        self._edge_chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._pending_edges: List[Tuple[int, int, float]] = []
+        self._known_in_db: set = set()    # Nodes MongoDB already had (incremental mode)
+        self._written_nodes: set = set()  # Nodes written by this run
+
+        self.stats = {"rows": 0, "edges": 0, "invalid": 0, "skipped_resume": 0, "duplicates": 0,
+                      "nodes_written": 0, "edges_written": 0, "batches": 0}
+        self.errors: List[str] = []
+
+    def run(self, path: str, input_format: Optional[str] = None, resume: bool = False,
+            progress_every: int = 0) -> Dict[str, Any]:
+        """Imports `path`; returns the counters plus elapsed seconds and edges/sec."""
+        if self.incremental:
+            self._load_existing_roads()
+
+        resume_from = self._read_checkpoint(path) if resume else 0
+        if not self.incremental and resume_from == 0:
+            self._require_empty_collections()
+        started = time.perf_counter()
+        batch: List[RoadRow] = []
+        first_batch_after_resume = resume_from > 0
+
+        for record, geometry in open_reader(path, input_format):
+            self.stats["rows"] += 1
+            try:
+                road = validate_road(record, geometry)
+            except (ValueError, TypeError, IndexError) as e:
+                self._record_error(f"row {self.stats['rows']}: {e}")
+                continue
+
+            self._add_to_graph(road)
+            self.stats["edges"] += 1
+            if self.stats["rows"] <= resume_from:
+                self.stats["skipped_resume"] += 1  # Already in MongoDB; only rebuild the graph
+                self._written_nodes.update((road.source, road.target))  # ...and its nodes too
+                continue
+
+            batch.append(road)
+            if len(batch) >= self.batch_size:
+                # A crash may have left part of the batch after the checkpoint written: upsert it
+                self._write_batch(batch, upsert=self.incremental or first_batch_after_resume)
+                first_batch_after_resume = False
+                batch = []
+                self._write_checkpoint(path)
+                if progress_every and self.stats["batches"] % progress_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"  {self.stats['rows']:,} rows, {self.stats['edges_written']:,} edges written, "
+                          f"{self.stats['edges'] / elapsed:,.0f} edges/s")
+
+        if batch:
+            self._write_batch(batch, upsert=self.incremental or first_batch_after_resume)
+        self._write_checkpoint(path, complete=True)
+
+        elapsed = time.perf_counter() - started
+        return dict(self.stats, seconds=round(elapsed, 2),
+                    edges_per_sec=round(self.stats["edges"] / elapsed, 1) if elapsed > 0 else None)
+
+    def city_graph(self) -> CSRCityGraph:
+        """Everything imported (plus the existing roads in incremental mode) as a CSR graph."""
+        if self._edge_chunks:
+            src, dst, weight = (np.concatenate(parts) for parts in zip(*self._edge_chunks))
+        else:
+            src = dst = np.empty(0, dtype=np.int32)
+            weight = np.empty(0, dtype=np.float64)
+        return CSRCityGraph.from_edge_arrays(self._node_ids, src, dst, weight)
+
+    def write_snapshot(self, output: str) -> Dict[str, Any]:
+        return write_snapshot(output, self.city_graph(), map_version=read_map_version(self.db))
+
+    # --- internals ---
+
+    def _intern(self, node: str) -> Tuple[int, bool]:
+        index = self._node_index.get(node)
+        if index is None:
+            index = self._node_index[node] = len(self._node_ids)
+            self._node_ids.append(node)
+            return index, True
+        return index, False
+
+    def _add_to_graph(self, road: RoadRow):
+        # Appended to a small pending list and flushed to NumPy chunks per batch
+        self._pending_edges.append((self._intern(road.source)[0], self._intern(road.target)[0], road.weight))
+        if len(self._pending_edges) >= self.batch_size:
+            self._flush_edges()
+
+    def _flush_edges(self):
+        if self._pending_edges:
+            src, dst, weight = zip(*self._pending_edges)
+            self._edge_chunks.append((np.array(src, dtype=np.int32), np.array(dst, dtype=np.int32),
+                                      np.array(weight, dtype=np.float64)))
+            self._pending_edges = []
+
+    def _load_existing_roads(self):
+        """Incremental mode: seed the snapshot graph with what MongoDB already holds."""
+        for doc in self.db.map_nodes.find({}, {"node_id": 1}):
+            self._intern(doc["node_id"])
+        for doc in self.db.map_edges.find({}, {"source": 1, "target": 1, "weight": 1}):
+            self._add_to_graph(RoadRow(doc["source"], doc["target"], doc["weight"]))
+        self._flush_edges()
+        self._known_in_db = set(self._node_index)
+
+    def _write_batch(self, batch: List[RoadRow], upsert: bool):
+        self._flush_edges()
+        new_nodes: Dict[str, Optional[Tuple[float, float]]] = {}
+        for road in batch:
+            for node, position in ((road.source, road.source_position), (road.target, road.target_position)):
+                if node in self._known_in_db or node in self._written_nodes:
+                    continue
+                if node not in new_nodes or position:
+                    new_nodes[node] = position or new_nodes.get(node)
+        self._written_nodes.update(new_nodes)
+
+        node_docs = [self._node_doc(node, position) for node, position in new_nodes.items()]
+        nodes_written = 0
+        if node_docs:
+            if upsert:
+                self.db.map_nodes.bulk_write([
+                    UpdateOne({"node_id": doc["node_id"]}, {"$set": doc}, upsert=True) for doc in node_docs
+                ], ordered=False)
+                nodes_written = len(node_docs)
+            else:
+                nodes_written = len(node_docs) - len(self._insert_new(self.db.map_nodes, node_docs))
+
+        # One write per road: the last row for a road (in either orientation) wins, as in the graph
+        roads: Dict[Tuple[str, str], float] = {}
+        for road in batch:
+            roads[road_key(road.source, road.target)] = road.weight
+        self.stats["duplicates"] += len(batch) - len(roads)
+
+        if upsert:
+            self.db.map_edges.bulk_write([
+                UpdateOne(road_filter(source, target),
+                          {"$set": {"weight": weight}, "$setOnInsert": {"source": source, "target": target}}, upsert=True)
+                for (source, target), weight in roads.items()
+            ], ordered=False)
+            edges_written = len(roads)
+        else:
+            repeated = self._insert_new(self.db.map_edges, [{"source": source, "target": target, "weight": weight}
+                                                            for (source, target), weight in roads.items()])
+            if repeated:
+                # Roads an earlier batch of this file already wrote: the later row wins here too
+                self.db.map_edges.bulk_write([
+                    UpdateOne({"source": doc["source"], "target": doc["target"]}, {"$set": {"weight": doc["weight"]}})
+                    for doc in repeated
+                ], ordered=False)
+            edges_written = len(roads) - len(repeated)
+            self.stats["duplicates"] += len(repeated)
+
+        bump_map_version(self.db)
+
+        self.stats["nodes_written"] += nodes_written
+        self.stats["edges_written"] += edges_written
+        self.stats["batches"] += 1
+
+    @staticmethod
+    def _insert_new(collection, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """insert_many that skips documents the unique indexes already hold; returns the skipped ones."""
+        try:
+            collection.insert_many(docs, ordered=False)
+            return []
+        except BulkWriteError as e:
+            if any(error["code"] != _DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+            return [docs[error["index"]] for error in e.details["writeErrors"]]
+
+    def _require_empty_collections(self):
+        if self.db.map_nodes.find_one({}, {"_id": 1}) or self.db.map_edges.find_one({}, {"_id": 1}):
+            raise ValueError("map_nodes / map_edges already hold a road network. Use --incremental to upsert "
+                             "into it, or --replace to start over.")
+
+    @staticmethod
+    def _node_doc(node: str, position: Optional[Tuple[float, float]]) -> Dict[str, Any]:
+        doc: Dict[str, Any] = {"node_id": node}
+        if position:
+            doc["lat"], doc["lon"] = position
+        return doc
+
+    def _record_error(self, message: str):
+        self.stats["invalid"] += 1
+        if len(self.errors) < 20:
+            self.errors.append(message)
+        if self.stats["invalid"] > self.max_errors:
+            raise ValueError(f"Aborting: more than {self.max_errors} invalid rows. First errors: {self.errors[:5]}")
+
+    def _read_checkpoint(self, path: str) -> int:
+        """Rows already committed by an interrupted run of this same file (0 if none or stale)."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        stat = os.stat(path)
+        if (checkpoint.get("source") != os.path.abspath(path) or checkpoint.get("size") != stat.st_size
+                or checkpoint.get("mtime") != stat.st_mtime or checkpoint.get("complete")):
+            return 0
+        print(f"Resuming after row {checkpoint['rows_committed']:,}")
+        return checkpoint["rows_committed"]
+
+    def _write_checkpoint(self, path: str, complete: bool = False):
+        if not self.checkpoint_path:
+            return
+        stat = os.stat(path)
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({"source": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime,
+                       "rows_committed": self.stats["rows"], "complete": complete}, f)
+        os.replace(temporary, self.checkpoint_path)  # Atomic: a crash never leaves half a checkpoint
@@ -0,0 +1,51 @@
+# app/utils/route_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class RouteCache:
+    def __init__(self, max_entries: int = 1024):
+        """
+        Bounded LRU cache for routing results.
+        Callers put the graph and occupancy versions into the key, so a bumped
+        version simply stops matching old entries, which then age out via LRU.
+        """
+        if max_entries <= 0:
+            raise ValueError(f"Route cache size must be greater than 0. Received: {max_entries}")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters used to size the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,9 @@
+# app/utils/seed_data.py
+
+# Intersections of the demo city (lat, lon), shared by seed.py and RoutingService's first-run seeding
+SEED_COORDINATES = {
+    "A": (18.5200, 73.8500), "B": (18.5300, 73.8550), "C": (18.5150, 73.8620),
+    "D": (18.5270, 73.8660), "E": (18.5120, 73.8740), "F": (18.5240, 73.8800),
+    "H1": (18.5370, 73.8500), "H2": (18.5050, 73.8780), "H3": (18.5300, 73.8870),
+    "H4": (18.5100, 73.8430)
+}
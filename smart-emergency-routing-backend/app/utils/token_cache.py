@@ -0,0 +1,61 @@
+# app/utils/token_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class TokenCache:
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 300.0):
+        """
+        Bounded LRU cache of already-verified JWTs (token -> user_id).
+        An entry lives for at most `ttl_seconds` and never past the token's own `exp`,
+        so an expired token always falls through to a full jwt.decode and is rejected.
+        """
+        if max_entries <= 0:
+            raise ValueError(f"Token cache size must be greater than 0. Received: {max_entries}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                user_id, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return user_id
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user_id: str, exp: Optional[float] = None):
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._entries[token] = (user_id, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,15 @@
+# asgi.py
+
+from app.asgi import create_asgi_app
+
+# Async serving mode: hypercorn asgi:app --bind 0.0.0.0:5000
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    import asyncio
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = ["0.0.0.0:5000"]
+    asyncio.run(serve(app, config))
@@ -0,0 +1,118 @@
+# benchmarks/auth_overhead.py
+"""
+Authenticated-request overhead and login-storm impact, before vs after the auth changes.
+
+1. Token check: the old per-call os.getenv + jwt.decode vs the verified-token cache,
+   both raw and through a protected Flask route (/api/v1/auth/me).
+2. Login storm: many concurrent PBKDF2 checks run inline (old) vs through the bounded
+   password pool (new), while a probe thread measures latency of a cheap request.
+
+Usage (from smart-emergency-routing-backend/):
+    python -m benchmarks.auth_overhead --requests 5000 --storm 64
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import jwt
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from app.services.auth_service import issue_session
+from app.utils import auth_middleware
+from app.utils.password_pool import PasswordPool
+
+def _legacy_verify(token: str) -> str:
+    """The previous token_required body: read the secret and fully verify on every call."""
+    secret = os.getenv('JWT_SECRET_KEY', 'fallback_secret')
+    return jwt.decode(token, secret, algorithms=["HS256"])['user_id']
+
+def _per_call_us(fn, token: str, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn(token)
+    return round((time.perf_counter() - started) / calls * 1e6, 2)
+
+def _route_us(client, token: str, calls: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    for _ in range(calls):
+        assert client.get('/api/v1/auth/me', headers=headers).status_code == 200
+    return round((time.perf_counter() - started) / calls * 1e6, 1)
+
+def token_overhead(calls: int) -> dict:
+    from app import create_app
+    os.environ.setdefault("SERVICE_WARMUP", "false")
+    client = create_app().test_client()
+    token = issue_session({"_id": "bench-user", "username": "bench", "email": "bench@example.com"},
+                          auth_middleware.JWT_SECRET)["token"]
+
+    cache = auth_middleware.token_cache
+    auth_middleware.token_cache = None
+    uncached_route = _route_us(client, token, calls)
+    auth_middleware.token_cache = cache
+    cached_route = _route_us(client, token, calls)
+
+    return {
+        "verify_legacy_us": _per_call_us(_legacy_verify, token, calls),
+        "verify_cached_us": _per_call_us(auth_middleware.verify_token, token, calls),
+        "route_without_cache_us": uncached_route,
+        "route_with_cache_us": cached_route
+    }
+
+def login_storm(logins: int, workers: int, probes: int) -> dict:
+    password_hash = generate_password_hash("password123")
+    pool = PasswordPool(workers)
+    results = {}
+
+    for mode, check in (("inline", check_password_hash), ("pool", pool.verify_password)):
+        latencies, stop = [], threading.Event()
+
+        def probe():
+            # Stand-in for a cheap authenticated request: one cached token check
+            token = issue_session({"_id": "probe", "username": "probe", "email": "p@example.com"},
+                                  auth_middleware.JWT_SECRET)["token"]
+            while not stop.is_set() and len(latencies) < probes:
+                started = time.perf_counter()
+                auth_middleware.verify_token(token)
+                latencies.append(time.perf_counter() - started)
+                time.sleep(0.002)
+
+        storm = [threading.Thread(target=check, args=(password_hash, "password123")) for _ in range(logins)]
+        prober = threading.Thread(target=probe)
+        started = time.perf_counter()
+        prober.start()
+        for thread in storm:
+            thread.start()
+        for thread in storm:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        prober.join()
+
+        latencies.sort()
+        results[mode] = {
+            "logins": logins,
+            "storm_seconds": round(elapsed, 2),
+            "probe_p50_ms": round(statistics.median(latencies) * 1000, 3),
+            "probe_p99_ms": round(latencies[int(0.99 * (len(latencies) - 1))] * 1000, 3)
+        }
+    results["pool"]["pool_stats"] = pool.stats()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000, help="token checks per variant")
+    parser.add_argument("--storm", type=int, default=64, help="concurrent logins in the storm")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="password pool size")
+    parser.add_argument("--probes", type=int, default=500, help="probe requests during the storm")
+    args = parser.parse_args()
+
+    print("Token check:", token_overhead(args.requests))
+    for mode, result in login_storm(args.storm, args.workers, args.probes).items():
+        print(f"Login storm ({mode}):", result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/compare_graph_backends.py
+"""
+Memory and latency comparison of the networkx-backed CityGraph against the
+array-backed CSRCityGraph on a synthetic grid city.
+
+Usage (from smart-emergency-routing-backend/):
+    python -m benchmarks.compare_graph_backends --side 450 --queries 50
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from app.models.city_graph import CityGraph
+from app.models.csr_graph import CSRCityGraph
+from benchmarks.synthetic_city import grid_city
+
+def measure(graph_cls, nodes, edges, pairs) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    city = graph_cls()
+    city.add_intersections(nodes)
+    city.add_roads(edges)
+    build_secs = time.perf_counter() - started
+    memory_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for start_node, end_node in pairs:
+        started = time.perf_counter()
+        city.calculate_travel_time(start_node, end_node)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    return {
+        "backend": graph_cls.__name__,
+        "build_secs": round(build_secs, 2),
+        "memory_mb": round(memory_bytes / 2 ** 20, 1),
+        "query_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "query_max_ms": round(latencies[-1] * 1000, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--side", type=int, default=450, help="grid side length (450 -> 202,500 nodes)")
+    parser.add_argument("--queries", type=int, default=50, help="random point-to-point queries per backend")
+    args = parser.parse_args()
+
+    nodes, edges = grid_city(args.side)
+    rng = random.Random(7)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.queries)]
+    print(f"Synthetic grid city: {len(nodes):,} nodes, {len(edges):,} roads, {args.queries} queries")
+
+    for graph_cls in (CityGraph, CSRCityGraph):
+        print(measure(graph_cls, nodes, edges, pairs))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/goal_directed.py
+"""
+Settled nodes and wall time of plain Dijkstra vs ALT (A* with landmarks) vs a
+contraction hierarchy for random point-to-point queries on a synthetic grid city.
+
+Usage (from smart-emergency-routing-backend/):
+    python -m benchmarks.goal_directed --side 100 --queries 200 --landmarks 16
+"""
+
+import argparse
+import random
+import time
+
+from app.models.csr_graph import CSRCityGraph
+from app.models.landmarks import astar, LandmarkIndex
+from app.models.contraction_hierarchy import ContractionHierarchy
+from benchmarks.synthetic_city import grid_city
+
+def run_queries(name, query, pairs, reference=None) -> dict:
+    settled_total, results = 0, []
+    started = time.perf_counter()
+    for start_node, end_node in pairs:
+        distance, _, settled = query(start_node, end_node)
+        settled_total += settled
+        results.append(distance)
+    elapsed = time.perf_counter() - started
+
+    # Exactness check against plain Dijkstra
+    if reference is not None:
+        assert all(abs(a - b) < 1e-6 for a, b in zip(results, reference)), f"{name} returned a non-optimal route"
+
+    return {
+        "mode": name,
+        "avg_settled_nodes": round(settled_total / len(pairs), 1),
+        "avg_query_ms": round(elapsed / len(pairs) * 1000, 3)
+    }, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--side", type=int, default=100, help="grid side length")
+    parser.add_argument("--queries", type=int, default=200, help="random point-to-point queries")
+    parser.add_argument("--landmarks", type=int, default=16, help="ALT landmarks")
+    args = parser.parse_args()
+
+    nodes, edges = grid_city(args.side)
+    city = CSRCityGraph()
+    city.add_intersections(nodes)
+    city.add_roads(edges)
+    rng = random.Random(7)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.queries)]
+    print(f"Synthetic grid city: {len(nodes):,} nodes, {len(edges):,} roads, {args.queries} queries")
+
+    started = time.perf_counter()
+    landmarks = LandmarkIndex(city, args.landmarks)
+    print(f"ALT preprocessing ({args.landmarks} landmarks): {time.perf_counter() - started:.2f}s")
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy(city)
+    print(f"CH preprocessing ({hierarchy.shortcuts:,} shortcuts): {time.perf_counter() - started:.2f}s")
+
+    dijkstra, reference = run_queries("dijkstra", lambda s, t: astar(city, s, t, lambda node: 0.0), pairs)
+    alt, _ = run_queries("alt", lambda s, t: landmarks.query(city, s, t), pairs, reference)
+    ch, _ = run_queries("contraction_hierarchy", hierarchy.query, pairs, reference)
+
+    for row in (dijkstra, alt, ch):
+        row["speedup_wall"] = round(dijkstra["avg_query_ms"] / row["avg_query_ms"], 1)
+        row["speedup_settled"] = round(dijkstra["avg_settled_nodes"] / row["avg_settled_nodes"], 1)
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/load_test.py
+"""
+Concurrent HTTP load test for the Flask (WSGI) and Quart (ASGI) serving modes.
+
+Start the server(s) first, e.g. from smart-emergency-routing-backend/:
+    python run.py                                   # Flask on :5000
+    hypercorn asgi:app --bind 127.0.0.1:5001        # async mode on :5001
+then:
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --url http://127.0.0.1:5001 \
+        --concurrency 200 --requests 5000 --path /api/v1/locations
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+async def _request(reader, writer, host: str, method: str, path: str, body: bytes):
+    """One HTTP/1.1 request on a kept-alive connection; returns (status, keep_alive)."""
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n"
+    if body:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    version, status = status_line.split()[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()  # No length: the body ends when the server closes
+        return int(status), False
+    keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    return int(status), keep_alive
+
+async def _worker(target, method, path, body, remaining, latencies, errors):
+    host, port = target
+    connection = None
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(host, port)
+            status, keep_alive = await _request(*connection, f"{host}:{port}", method, path, body)
+            if status >= 400:
+                errors.append(status)
+        except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+            errors.append(type(e).__name__)
+            keep_alive = False
+        latencies.append(time.perf_counter() - started)
+        if not keep_alive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+def _percentile(sorted_values, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run_load(url: str, path: str, method: str, body: bytes, concurrency: int, total: int) -> dict:
+    parts = urlsplit(url)
+    target = (parts.hostname, parts.port or 80)
+    remaining, latencies, errors = [total], [], []
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(target, method, path, body, remaining, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "url": url + path,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", action="append", required=True, help="server base URL (repeat to compare)")
+    parser.add_argument("--path", default="/api/v1/locations", help="endpoint to load")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--json", default=None, help="request body, e.g. '{\"ambulance_location\": \"A\"}'")
+    parser.add_argument("--concurrency", type=int, default=100, help="simultaneous connections")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests per URL")
+    args = parser.parse_args()
+
+    body = json.dumps(json.loads(args.json)).encode() if args.json else b""
+    for url in args.url:
+        print(json.dumps(asyncio.run(run_load(
+            url.rstrip("/"), args.path, args.method.upper(), body, args.concurrency, args.requests
+        ))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/suite.py
+"""
+Reproducible benchmark suite on a synthetic city loaded into the mock database.
+
+Measures graph construction, find_optimal_hospital, occupancy updates, point-to-point
+queries per graph backend and the HTTP endpoints, reporting p50/p95/p99 latency and
+throughput. Results are saved as JSON; --compare flags regressions against an older run.
+
+Usage (from smart-emergency-routing-backend/):
+    python -m benchmarks.suite --layout grid --size 60 --hospitals 20 --output before.json
+    python -m benchmarks.suite --layout grid --size 60 --hospitals 20 --compare before.json
+"""
+
+import os
+
+# The suite always runs against the in-memory mock and a private, freshly built graph
+os.environ["MONGO_URI"] = ""
+os.environ["OCCUPANCY_BOARD_NAME"] = ""
+os.environ.setdefault("SERVICE_WARMUP", "false")
+os.environ.pop("GRAPH_SNAPSHOT_PATH", None)
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic_city import LAYOUTS, OCCUPANCY_PROFILES, generate_city, load_into_db
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+    return {
+        "n": len(ordered),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "throughput_ops": round(len(ordered) / elapsed, 1) if elapsed > 0 else None
+    }
+
+def timed_calls(fn: Callable[[Any], Any], inputs: List[Any]) -> Dict[str, Any]:
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        call_started = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+def run_suite(args) -> Dict[str, Dict[str, Any]]:
+    from app.services.routing_service import RoutingService
+
+    city = generate_city(args.layout, args.size, args.hospitals, args.occupancy, args.seed)
+    load_into_db(city)
+    rng = random.Random(args.seed)
+    results = {}
+
+    # Graph construction straight from MongoDB documents
+    results["service_init"] = timed_calls(lambda _: RoutingService(), range(args.builds))
+    service = RoutingService()
+    for backend in ("networkx", "csr"):
+        results[f"graph_build_{backend}"] = timed_calls(
+            lambda _: service._build_city_graph_from_db(backend), range(args.builds))
+
+    intersections = [doc["node_id"] for doc in city["map_nodes"] if not doc["node_id"].startswith("H")]
+    locations = rng.sample(intersections, min(args.queries, len(intersections)))
+
+    # Dispatch: first pass misses the route cache, the repeat pass hits it
+    results["find_optimal_hospital"] = timed_calls(service.find_optimal_hospital, locations)
+    results["find_optimal_hospital_cached"] = timed_calls(service.find_optimal_hospital, locations)
+    results["search_optimal_hospital_dijkstra"] = timed_calls(service._search_optimal_hospital, locations)
+
+    # Point-to-point queries per graph backend
+    pairs = [(rng.choice(intersections), rng.choice(intersections)) for _ in range(args.queries)]
+    for backend in ("networkx", "csr"):
+        graph = service._build_city_graph_from_db(backend)
+        results[f"point_to_point_{backend}"] = timed_calls(lambda pair: graph.calculate_travel_time(*pair), pairs)
+
+    # Occupancy updates: MongoDB write + in-place dispatch-map repair
+    hospitals = city["hospitals"]
+    updates = [(h["hospital_id"], rng.randint(0, h["capacity"])) for h in rng.choices(hospitals, k=args.updates)]
+    results["update_hospital_occupancy"] = timed_calls(lambda u: service.update_hospital_occupancy(*u), updates)
+
+    # HTTP endpoints through the Flask test client (app stack, no network)
+    from app import create_app
+    from app.services import provider
+    provider.routing_service.set(service)
+    client = create_app().test_client()
+
+    def check(response):
+        if response.status_code >= 500:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    results["http_get_locations"] = timed_calls(lambda _: check(client.get('/api/v1/locations')), range(args.http))
+    results["http_optimize_route"] = timed_calls(
+        lambda location: check(client.post('/api/v1/optimize-route', json={"ambulance_location": location})),
+        (locations * (args.http // len(locations) + 1))[:args.http])
+    results["http_update_occupancy"] = timed_calls(
+        lambda u: check(client.patch('/api/v1/hospital/update-occupancy', json={"hospital_id": u[0], "new_occupancy": u[1]})),
+        (updates * (args.http // len(updates) + 1))[:args.http])
+    return results
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Prints a p50/p95 ratio table; returns the benchmarks whose p95 grew beyond `threshold`."""
+    regressions = []
+    print(f"\n{'benchmark':36} {'p50 old->new (ms)':>24} {'p95 old->new (ms)':>24}  ratio")
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:36} {'(new)':>24}")
+            continue
+        ratio = new["p95_ms"] / old["p95_ms"] if old["p95_ms"] else float('inf')
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:36} {old['p50_ms']:>11} -> {new['p50_ms']:<10} {old['p95_ms']:>11} -> {new['p95_ms']:<10} {ratio:5.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layout", choices=LAYOUTS, default="grid")
+    parser.add_argument("--size", type=int, default=40, help="grid side / ring count / planar intersections")
+    parser.add_argument("--hospitals", type=int, default=12)
+    parser.add_argument("--occupancy", choices=OCCUPANCY_PROFILES, default="uniform")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--builds", type=int, default=3, help="repetitions of each construction benchmark")
+    parser.add_argument("--queries", type=int, default=300, help="dispatch / point-to-point queries")
+    parser.add_argument("--updates", type=int, default=200, help="occupancy updates")
+    parser.add_argument("--http", type=int, default=300, help="requests per HTTP endpoint")
+    parser.add_argument("--output", default=None, help="JSON results path (default: benchmarks/results/<commit>-<layout>-<size>.json)")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 growth that counts as a regression")
+    args = parser.parse_args()
+
+    run = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "threshold")}
+        },
+        "results": run_suite(args)
+    }
+
+    for name, stats in run["results"].items():
+        print(f"{name:36} {json.dumps(stats)}")
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"{run['meta']['commit']}-{args.layout}-{args.size}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["params"] != run["meta"]["params"]:
+            print("[!] Baseline was recorded with different parameters; ratios are not comparable.")
+        regressions = compare(run, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
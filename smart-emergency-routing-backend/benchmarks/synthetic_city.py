@@ -0,0 +1,183 @@
+# benchmarks/synthetic_city.py
+"""
+Synthetic city generator: grid, radial and random-planar road networks with hospitals.
+
+Usage (from smart-emergency-routing-backend/):
+    python -m benchmarks.synthetic_city --layout radial --size 60 --hospitals 25 --occupancy busy
+"""
+
+import argparse
+import math
+import random
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+LAYOUTS = ("grid", "radial", "planar")
+OCCUPANCY_PROFILES = ("uniform", "busy", "skewed")
+
+# Roughly one city block is 0.0015 degrees; travel times are in minutes
+_CENTER_LAT, _CENTER_LON = 18.52, 73.85
+_DEGREES_PER_UNIT = 0.0015
+
+def grid_city(side: int, seed: int = 42) -> Tuple[List[str], List[Tuple[str, str, float]]]:
+    """A side x side street grid with random travel times (minutes) per block."""
+    rng = random.Random(seed)
+    nodes = [f"N{r}_{c}" for r in range(side) for c in range(side)]
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            if c + 1 < side:
+                edges.append((f"N{r}_{c}", f"N{r}_{c + 1}", round(rng.uniform(0.5, 3.0), 2)))
+            if r + 1 < side:
+                edges.append((f"N{r}_{c}", f"N{r + 1}_{c}", round(rng.uniform(0.5, 3.0), 2)))
+    return nodes, edges
+
+def _grid_positions(side: int) -> Dict[str, Tuple[float, float]]:
+    return {f"N{r}_{c}": (float(c), float(r)) for r in range(side) for c in range(side)}
+
+def radial_city(rings: int, spokes: int = 16, seed: int = 42) -> Tuple[List[str], List[Tuple[str, str, float]], Dict[str, Tuple[float, float]]]:
+    """Concentric ring roads crossed by radial avenues around a central square (old-town layout)."""
+    rng = random.Random(seed)
+    positions = {"N0_0": (0.0, 0.0)}
+    edges = []
+    for ring in range(1, rings + 1):
+        for spoke in range(spokes):
+            angle = 2 * math.pi * spoke / spokes
+            positions[f"N{ring}_{spoke}"] = (ring * math.cos(angle), ring * math.sin(angle))
+            inner = "N0_0" if ring == 1 else f"N{ring - 1}_{spoke}"
+            # Avenues are faster than ring roads; congestion adds noise to both
+            edges.append((inner, f"N{ring}_{spoke}", round(rng.uniform(0.6, 1.4), 2)))
+            arc = 2 * math.pi * ring / spokes
+            edges.append((f"N{ring}_{spoke}", f"N{ring}_{(spoke + 1) % spokes}", round(arc * rng.uniform(0.8, 2.0), 2)))
+    return list(positions), edges, positions
+
+def planar_city(intersections: int, seed: int = 42) -> Tuple[List[str], List[Tuple[str, str, float]], Dict[str, Tuple[float, float]]]:
+    """Random intersections joined by a Delaunay triangulation with ~20% of roads removed (planar, irregular)."""
+    from scipy.spatial import Delaunay
+
+    rng = np.random.default_rng(seed)
+    side = math.sqrt(intersections)
+    points = rng.uniform(0, side, size=(intersections, 2))
+    nodes = [f"N{i}" for i in range(intersections)]
+
+    pairs = set()
+    for a, b, c in Delaunay(points).simplices.tolist():
+        for u, v in ((a, b), (b, c), (a, c)):
+            pairs.add((min(u, v), max(u, v)))
+
+    # Drop roads at random, but keep a spanning tree so the city stays connected
+    parent = list(range(intersections))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    ordered = sorted(pairs)
+    keep_probability = rng.uniform(size=len(ordered))
+    edges = []
+    for (u, v), keep in zip(ordered, keep_probability):
+        root_u, root_v = find(u), find(v)
+        if root_u != root_v:
+            parent[root_u] = root_v
+        elif keep < 0.2:
+            continue
+        length = float(np.hypot(*(points[u] - points[v])))
+        edges.append((nodes[u], nodes[v], round(max(0.1, length * rng.uniform(0.8, 2.0)), 2)))
+    positions = {node: (float(x), float(y)) for node, (x, y) in zip(nodes, points)}
+    return nodes, edges, positions
+
+def occupancy_for(capacity: int, profile: str, rng: random.Random) -> int:
+    """Current occupancy under a load profile: uniform, busy (mostly near capacity) or skewed (a few full)."""
+    if profile == "uniform":
+        return rng.randint(0, capacity)
+    if profile == "busy":
+        return min(capacity, int(capacity * rng.betavariate(8, 2)))
+    if profile == "skewed":
+        return capacity if rng.random() < 0.2 else int(capacity * rng.betavariate(2, 5))
+    raise ValueError(f"Unknown occupancy profile '{profile}'. Choose one of: {', '.join(OCCUPANCY_PROFILES)}")
+
+def generate_city(layout: str = "grid", size: int = 50, hospitals: int = 10,
+                  occupancy: str = "uniform", seed: int = 42) -> Dict[str, Any]:
+    """
+    Builds a full city in the MongoDB document shapes the app reads:
+    {"map_nodes": [...], "map_edges": [...], "hospitals": [...]}.
+    `size` is the grid side, the number of rings, or the number of planar intersections.
+    Each hospital is its own node ("H<i>") attached to a random intersection.
+    """
+    if layout == "grid":
+        nodes, edges = grid_city(size, seed)
+        positions = _grid_positions(size)
+    elif layout == "radial":
+        nodes, edges, positions = radial_city(size, seed=seed)
+    elif layout == "planar":
+        nodes, edges, positions = planar_city(size, seed)
+    else:
+        raise ValueError(f"Unknown layout '{layout}'. Choose one of: {', '.join(LAYOUTS)}")
+
+    rng = random.Random(seed + 1)
+    hospital_docs = []
+    for i, attach in enumerate(rng.sample(nodes, min(hospitals, len(nodes))), start=1):
+        hospital_id = f"H{i}"
+        capacity = rng.choice((20, 30, 40, 50, 80, 100, 150))
+        hospital_docs.append({
+            "hospital_id": hospital_id,
+            "name": f"Synthetic Hospital {i}",
+            "capacity": capacity,
+            "current_occupancy": occupancy_for(capacity, occupancy, rng)
+        })
+        x, y = positions[attach]
+        positions[hospital_id] = (x + 0.1, y + 0.1)
+        nodes.append(hospital_id)
+        edges.append((attach, hospital_id, round(rng.uniform(0.5, 2.0), 2)))
+
+    return {
+        "layout": layout,
+        "map_nodes": [
+            {"node_id": node,
+             "lat": round(_CENTER_LAT + positions[node][1] * _DEGREES_PER_UNIT, 6),
+             "lon": round(_CENTER_LON + positions[node][0] * _DEGREES_PER_UNIT, 6)}
+            for node in nodes
+        ],
+        "map_edges": [{"source": source, "target": target, "weight": weight} for source, target, weight in edges],
+        "hospitals": hospital_docs
+    }
+
+def load_into_db(city: Dict[str, Any], db=None, batch_size: int = 10000, allow_real_db: bool = False):
+    """
+    Replaces hospitals, map_nodes and map_edges with the synthetic city.
+    Targets the in-memory mock behind get_db() unless `allow_real_db` is set.
+    """
+    from app.utils.db import get_db, is_mock_db
+    from app.utils.map_version import bump_map_version
+    if db is None:
+        if not allow_real_db and not is_mock_db():
+            raise RuntimeError("Refusing to overwrite a real MongoDB; unset MONGO_URI or pass allow_real_db=True.")
+        db = get_db()
+
+    for collection in ("hospitals", "map_nodes", "map_edges"):
+        db[collection].delete_many({})
+        documents = city[collection]
+        for start in range(0, len(documents), batch_size):
+            db[collection].insert_many([dict(doc) for doc in documents[start:start + batch_size]], ordered=False)
+    bump_map_version(db)
+    return db
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layout", choices=LAYOUTS, default="grid")
+    parser.add_argument("--size", type=int, default=50, help="grid side / ring count / planar intersections")
+    parser.add_argument("--hospitals", type=int, default=10)
+    parser.add_argument("--occupancy", choices=OCCUPANCY_PROFILES, default="uniform")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    city = generate_city(args.layout, args.size, args.hospitals, args.occupancy, args.seed)
+    occupancy = [h["current_occupancy"] / h["capacity"] for h in city["hospitals"]]
+    print(f"{args.layout} city: {len(city['map_nodes']):,} nodes, {len(city['map_edges']):,} roads, "
+          f"{len(city['hospitals'])} hospitals, mean occupancy {sum(occupancy) / len(occupancy):.0%}")
+
+if __name__ == "__main__":
+    main()
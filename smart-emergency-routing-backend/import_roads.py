@@ -0,0 +1,68 @@
+# import_roads.py
+
+import argparse
+import os
+import sys
+import time
+from app.utils.db import ensure_indexes, get_db
+from app.utils.map_version import bump_map_version
+from app.utils.road_import import RoadImporter
+
+def import_roads(path: str, input_format: str = None, batch_size: int = 5000, incremental: bool = False,
+                 replace: bool = False, resume: bool = False, snapshot: str = None, max_errors: int = 1000,
+                 progress_every: int = 20):
+    """Streams a CSV / GeoJSON road network into map_nodes + map_edges, optionally writing a graph snapshot."""
+    if replace and resume:
+        # Replacing would delete the rows the checkpoint says are already committed
+        raise ValueError("--replace cannot be combined with --resume.")
+    db = get_db()
+    if db is None:
+        raise RuntimeError("No database available; check MONGO_URI.")
+    if replace:
+        db.map_nodes.delete_many({})
+        db.map_edges.delete_many({})
+        bump_map_version(db)
+    ensure_indexes(db)  # Unique node_id and (source, target): upserts key on them, inserts never duplicate
+
+    checkpoint = path + ".import-checkpoint.json"
+    importer = RoadImporter(db, batch_size=batch_size, incremental=incremental,
+                            checkpoint_path=checkpoint, max_errors=max_errors)
+    print(f"Importing {path} ({'incremental upsert' if incremental else 'insert'}, batches of {batch_size:,})")
+    stats = importer.run(path, input_format, resume=resume, progress_every=progress_every)
+
+    print(f"{stats['rows']:,} rows: {stats['edges']:,} valid, {stats['invalid']:,} invalid, "
+          f"{stats['skipped_resume']:,} already committed before resume, {stats['duplicates']:,} duplicate roads")
+    print(f"Wrote {stats['nodes_written']:,} new nodes and {stats['edges_written']:,} roads "
+          f"in {stats['seconds']}s ({stats['edges_per_sec']:,} edges/s)")
+    for error in importer.errors:
+        print(f"  [!] {error}")
+
+    if snapshot:
+        started = time.perf_counter()
+        header = importer.write_snapshot(snapshot)
+        print(f"Snapshot {header['graph_version']} written to {snapshot}: {header['node_count']:,} nodes, "
+              f"{header['road_count']:,} roads in {time.perf_counter() - started:.2f}s")
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)  # Finished cleanly; nothing left to resume
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a road network (CSV or GeoJSON edge list) into MongoDB.")
+    parser.add_argument("path", help="CSV (source,target,weight[,source_lat,...]), GeoJSON FeatureCollection or GeoJSONSeq")
+    parser.add_argument("--format", choices=("csv", "geojson", "geojsonseq"), default=None,
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="roads per MongoDB write")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true", help="upsert into the existing network instead of inserting")
+    mode.add_argument("--replace", action="store_true", help="empty map_nodes and map_edges first")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted import of the same file")
+    parser.add_argument("--snapshot", default=None, help="also write a graph snapshot (see export_snapshot.py)")
+    parser.add_argument("--max-errors", type=int, default=1000, help="abort after this many invalid rows")
+    args = parser.parse_args()
+    try:
+        import_roads(args.path, args.format, args.batch_size, args.incremental, args.replace,
+                     args.resume, args.snapshot, args.max_errors)
+    except ValueError as e:
+        print(f"[!] {e}")
+        sys.exit(1)
@@ -1,6 +1,8 @@
 # seed_db.py
 
 from app.utils.db import get_db
+from app.utils.map_version import bump_map_version
+from app.utils.seed_data import SEED_COORDINATES
 
 def seed_database():
     db = get_db()
@@ -19,8 +21,8 @@ def seed_database():
     ]
     db.hospitals.insert_many(hospitals_data)
     
-    # 3. Seed City Map (Intersections/Nodes)
-    nodes_data = [{"node_id": node} for node in ["A", "B", "C", "D", "E", "F", "H1", "H2", "H3", "H4"]]
+    # 3. Seed City Map (Intersections/Nodes with GPS coordinates)
+    nodes_data = [{"node_id": node, "lat": lat, "lon": lon} for node, (lat, lon) in SEED_COORDINATES.items()]
     db.map_nodes.insert_many(nodes_data)
     
     # 4. Seed Road Network (Edges & Travel Times)
@@ -38,6 +40,7 @@ def seed_database():
         {"source": "A", "target": "H4", "weight": 12.0}
     ]
     db.map_edges.insert_many(edges_data)
+    bump_map_version(db)  # Snapshots exported from the old map are stale now
     
     print("Database successfully seeded with Hospitals AND the City Map! Jai Siya Ram.")
 
@@ -0,0 +1,98 @@
+# tests/conftest.py
+
+import asyncio
+import os
+
+# Tests always run against the in-memory mock, with no shared board, warm-up or snapshot
+os.environ["MONGO_URI"] = ""
+os.environ["OCCUPANCY_BOARD_NAME"] = ""
+os.environ["SERVICE_WARMUP"] = "false"
+os.environ.pop("GRAPH_SNAPSHOT_PATH", None)
+
+import pytest
+from app.models.city_graph import CityGraph
+from app.models.csr_graph import CSRCityGraph
+from app.models.hospital import Hospital
+from app.utils.db import ensure_indexes, get_db
+from benchmarks.synthetic_city import generate_city
+
+BACKENDS = {"networkx": CityGraph, "csr": CSRCityGraph}
+
+@pytest.fixture
+def db():
+    """The process-wide mock database, emptied before every test."""
+    database = get_db()
+    for name in database.list_collection_names():
+        database.drop_collection(name)
+    ensure_indexes(database)
+    return database
+
+@pytest.fixture
+def service(db):
+    """A RoutingService over the seeded demo city (A-F, hospitals H1-H4)."""
+    from app.services.routing_service import RoutingService
+    return RoutingService(use_snapshot=False)
+
+@pytest.fixture(params=sorted(BACKENDS))
+def backend(request, monkeypatch):
+    """Runs a test once per graph engine."""
+    monkeypatch.setenv("GRAPH_BACKEND", request.param)
+    return request.param
+
+@pytest.fixture
+def make_city():
+    """make_city(backend, ...) -> (graph, {hospital_id: Hospital}) for a synthetic city, no database involved."""
+    def build(backend: str, layout: str = "grid", size: int = 12, hospitals: int = 6, seed: int = 7):
+        city = generate_city(layout, size, hospitals, "uniform", seed)
+        graph = BACKENDS[backend]()
+        graph.add_intersections([doc["node_id"] for doc in city["map_nodes"]])
+        graph.add_roads([(doc["source"], doc["target"], doc["weight"]) for doc in city["map_edges"]])
+        hospital_objects = {
+            doc["hospital_id"]: Hospital(doc["hospital_id"], doc["name"], doc["capacity"], doc["current_occupancy"])
+            for doc in city["hospitals"]
+        }
+        return graph, hospital_objects
+    return build
+
+@pytest.fixture
+def provide():
+    """provide(lazy_service, instance) installs `instance` for one test (None: rebuilt on use)."""
+    replaced = []
+
+    def install(lazy_service, instance):
+        replaced.append((lazy_service, lazy_service.set(instance)))
+
+    yield install
+    for lazy_service, previous in reversed(replaced):
+        lazy_service.set(previous)
+
+@pytest.fixture
+def routed(service, provide):
+    """The app's services use `service`; the services built on top of it are rebuilt on use."""
+    from app.services import provider
+    provide(provider.routing_service, service)
+    provide(provider.fleet_service, None)
+    provide(provider.stream_broker, None)
+    return service
+
+@pytest.fixture
+def client(routed):
+    """Flask test client whose routes use `service`."""
+    from app import create_app
+    return create_app().test_client()
+
+@pytest.fixture
+def asgi_client(routed):
+    """Quart test client whose routes use `service`."""
+    from app.asgi import create_asgi_app
+    return create_asgi_app().test_client()
+
+@pytest.fixture
+def asgi_call(asgi_client):
+    """asgi_call(method, path, **kwargs) -> (status, JSON body) of one request against the ASGI app."""
+    def call(method: str, path: str, **kwargs):
+        async def send():
+            response = await getattr(asgi_client, method)(path, **kwargs)
+            return response.status_code, await response.get_json()
+        return asyncio.run(send())
+    return call
@@ -0,0 +1,79 @@
+# tests/test_async_app.py
+
+import asyncio
+import pytest
+from app.services import provider
+from app.utils.async_db import get_async_db
+from app.utils.db_workflow import run_workflow, run_workflow_async
+
+ROAD_UPDATES = [
+    {"source": "A", "target": "B", "weight": 1.5},
+    {"source": "E", "target": "C", "weight": 2.5},
+    {"source": "X", "target": "Y", "weight": 1.0}
+]
+
+def test_both_drivers_run_the_same_workflow(service, db):
+    synced = run_workflow(service.update_road_weights_steps(ROAD_UPDATES), db)
+    version = service.graph_version
+    awaited = asyncio.run(run_workflow_async(service.update_road_weights_steps(ROAD_UPDATES), get_async_db()))
+
+    assert synced == awaited == {"updated": 2, "not_found": [{"source": "X", "target": "Y"}]}
+    assert service.graph_version == version + 2
+    assert db.graph_meta.find_one({"_id": "map"})["version"] == 3  # Seed, then one bump per write
+
+def test_asgi_road_update_reaches_database_and_graph(asgi_call, service, db):
+    status, _ = asgi_call("patch", "/api/v1/roads/update-weight", json={"source": "B", "target": "A", "weight": 1.0})
+    assert status == 200
+    assert db.map_edges.find_one({"source": "A", "target": "B"})["weight"] == 1.0
+    assert dict(service.city_graph.neighbors("A"))["B"] == 1.0
+
+    status, _ = asgi_call("patch", "/api/v1/roads/update-weight", json={"source": "A", "target": "F", "weight": 1.0})
+    assert status == 404
+
+def test_asgi_bulk_occupancy_matches_flask(asgi_call, service, db):
+    db.hospitals.update_one({"hospital_id": "H2"}, {"$set": {"current_occupancy": 60}})
+    status, body = asgi_call("patch", "/api/v1/hospital/update-occupancy/bulk", json={"updates": [
+        {"hospital_id": "H1", "new_occupancy": 10},
+        {"hospital_id": "H2", "new_occupancy": 60},
+        {"hospital_id": "H9", "new_occupancy": 5}
+    ]})
+    assert status == 200
+    assert body["data"] == {"updated": 1, "unchanged": ["H2"], "not_found": ["H9"]}
+    assert service.hospitals["H2"].current_occupancy == 60
+
+@pytest.mark.parametrize("body, expected", [
+    ({"ambulance_location": "NOWHERE"}, 404),
+    ({"ambulance_location": "A", "departure_time": "yesterday-ish"}, 400),
+    ({"lat": "north", "lon": 73.85}, 400)
+])
+def test_not_found_is_404_and_bad_input_is_400_on_both_apps(client, asgi_call, body, expected):
+    assert client.post('/api/v1/optimize-route', json=body).status_code == expected
+    assert asgi_call("post", "/api/v1/optimize-route", json=body)[0] == expected
+
+def test_each_app_reports_only_its_own_services(client, asgi_call):
+    flask_services = client.get('/health/ready').get_json()["services"]
+    _, body = asgi_call("get", "/health/ready")
+    assert set(flask_services) == set(provider.WSGI_SERVICES)
+    assert set(body["services"]) == set(provider.ASGI_SERVICES)
+    if provider._WARM_UP is not None:
+        provider._WARM_UP.join(30)  # The probes started a build: let it finish before the fixtures unwind
+
+@pytest.mark.parametrize("method, path, kwargs, expected", [
+    ("patch", "/api/v1/hospital/update-occupancy", {"json": {"hospital_id": "H1"}}, 400),
+    ("patch", "/api/v1/hospital/update-occupancy", {"json": {"hospital_id": "H9", "new_occupancy": 1}}, 404),
+    ("patch", "/api/v1/hospital/update-occupancy/bulk", {"json": {"updates": [{"hospital_id": "H1"}]}}, 400),
+    ("patch", "/api/v1/roads/update-weight", {"json": {"source": "A", "target": "B"}}, 400),
+    ("patch", "/api/v1/roads/update-weight/bulk", {"json": {"updates": []}}, 400),
+    ("post", "/api/v1/optimize-route/batch", {"json": {"ambulance_locations": "A"}}, 400),
+    ("post", "/api/v1/fleet/assign", {"json": {}}, 400),
+    ("get", "/api/v1/snap?lat=18.5", {}, 400),
+    ("get", "/api/v1/stream?ambulance=amb1:NOWHERE", {}, 400),
+    ("post", "/api/v1/auth/login", {"json": {"email": "admin@example.com"}}, 400),
+    ("get", "/api/v1/auth/me", {}, 401),
+    ("get", "/api/v1/auth/me", {"headers": {"Authorization": "Bearer not-a-token"}}, 401)
+])
+def test_both_apps_answer_errors_alike(client, asgi_call, method, path, kwargs, expected):
+    flask = getattr(client, method)(path, **kwargs)
+    status, body = asgi_call(method, path, **kwargs)
+    assert flask.status_code == status == expected
+    assert flask.get_json() == body and body["status"] == "error"
@@ -0,0 +1,32 @@
+# tests/test_batch_dispatch.py
+
+def test_batch_matches_single_queries(service):
+    locations = ["A", "B", "C", "D", "E", "F", "A", "H2"]
+    results = service.find_optimal_hospitals_batch(locations)
+
+    assert len(results) == len(locations)
+    for location, result in zip(locations, results):
+        assert result == {"status": "success", "data": service.find_optimal_hospital(location)}
+
+def test_batch_uses_the_route_cache(service):
+    service.find_optimal_hospitals_batch(["A", "B", "A"])
+    stats = service.get_cache_stats()
+    assert stats["misses"] == 2 and stats["entries"] == 2
+
+    service.find_optimal_hospitals_batch(["A", "B"])
+    assert service.get_cache_stats()["hits"] == 2
+
+def test_batch_reports_unknown_locations_per_entry(service):
+    results = service.find_optimal_hospitals_batch(["A", "NOWHERE"])
+    assert results[0]["status"] == "success"
+    assert results[1]["status"] == "error"
+    assert "NOWHERE" in results[1]["message"]
+
+def test_batch_size_is_capped(client, service):
+    service.max_batch_size = 3
+    response = client.post('/api/v1/optimize-route/batch', json={"ambulance_locations": ["A", "B", "C", "D"]})
+    assert response.status_code == 400
+
+    response = client.post('/api/v1/optimize-route/batch', json={"ambulance_locations": ["A", "B", "C"]})
+    assert response.status_code == 200
+    assert [entry["status"] for entry in response.get_json()["data"]] == ["success"] * 3
@@ -0,0 +1,73 @@
+# tests/test_dispatch_map.py
+
+import random
+import pytest
+from app.models.dispatch_map import DispatchMap
+
+def assert_same_map(repaired: DispatchMap, rebuilt: DispatchMap):
+    """Same cost everywhere, and every repaired route really reaches its owner at that cost."""
+    assert set(repaired.cost) == set(rebuilt.cost)
+    for node, cost in rebuilt.cost.items():
+        assert repaired.cost[node] == pytest.approx(cost, abs=1e-6), node
+
+        route = repaired.route_from(node)
+        assert route[-1] == repaired.owner[node]
+        travel = sum(dict(repaired.city_graph.neighbors(a))[b] for a, b in zip(route, route[1:]))
+        waiting = repaired.hospitals[repaired.owner[node]].calculate_waiting_time()
+        assert travel + waiting == pytest.approx(cost, abs=1e-6), node
+
+def test_build_matches_brute_force(make_city):
+    graph, hospitals = make_city("networkx", size=8)
+    dispatch_map = DispatchMap(graph, hospitals)
+
+    for node in graph.nodes():
+        best = min(
+            (graph.calculate_travel_time(node, hospital_id) + hospital.calculate_waiting_time()
+             for hospital_id, hospital in hospitals.items()),
+            default=float('inf')
+        )
+        assert dispatch_map.cost[node] == pytest.approx(best, abs=1e-6)
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_occupancy_repair_equals_rebuild(make_city, backend):
+    graph, hospitals = make_city(backend)
+    dispatch_map = DispatchMap(graph, hospitals)
+    rng = random.Random(3)
+
+    for _ in range(40):
+        hospital = rng.choice(list(hospitals.values()))
+        # Includes full hospitals (infinite wait) and their recovery
+        hospital.update_occupancy(rng.randint(0, hospital.capacity))
+        dispatch_map.update_hospital(hospital.hospital_id)
+        assert_same_map(dispatch_map, DispatchMap(graph, hospitals))
+
+def test_repair_reports_only_changed_nodes(make_city):
+    graph, hospitals = make_city("networkx")
+    dispatch_map = DispatchMap(graph, hospitals)
+    before = dict(dispatch_map.owner), dict(dispatch_map.cost)
+
+    hospital = next(iter(hospitals.values()))
+    hospital.update_occupancy(max(hospital.current_occupancy - 5, 0))
+    changed = dispatch_map.update_hospital(hospital.hospital_id)
+
+    for node in graph.nodes():
+        moved = (before[0].get(node), before[1].get(node)) != (dispatch_map.owner.get(node), dispatch_map.cost.get(node))
+        assert moved == (node in changed), node
+
+def test_unchanged_wait_is_a_no_op(make_city):
+    graph, hospitals = make_city("csr")
+    dispatch_map = DispatchMap(graph, hospitals)
+    assert dispatch_map.update_hospital(next(iter(hospitals))) == set()
+
+def test_restored_labels_are_repaired(make_city):
+    graph, hospitals = make_city("csr")
+    dispatch_map = DispatchMap(graph, hospitals)
+    labels = {node: (dispatch_map.cost[node], dispatch_map.owner[node], dispatch_map.next_hop[node])
+              for node in dispatch_map.owner}
+    waiting_times = {hospital_id: hospital.calculate_waiting_time() for hospital_id, hospital in hospitals.items()}
+
+    # Occupancy moved on between export and restore
+    for hospital in list(hospitals.values())[:3]:
+        hospital.update_occupancy(hospital.capacity // 2)
+    restored = DispatchMap.from_labels(graph, hospitals, labels, waiting_times)
+    assert_same_map(restored, DispatchMap(graph, hospitals))
@@ -0,0 +1,50 @@
+# tests/test_graph_snapshot.py
+
+import pytest
+from app.models.csr_graph import CSRCityGraph
+from app.models.dispatch_map import DispatchMap
+from app.services.routing_service import RoutingService
+from app.utils.graph_snapshot import load_snapshot, write_snapshot
+
+@pytest.fixture
+def snapshot_path(service, tmp_path, monkeypatch):
+    """A snapshot exported from `service`, configured as GRAPH_SNAPSHOT_PATH."""
+    path = str(tmp_path / "graph.snapshot")
+    write_snapshot(path, service.city_graph, dispatch_map=service.dispatch_map, map_version=service.map_version)
+    monkeypatch.setenv("GRAPH_SNAPSHOT_PATH", path)
+    return path
+
+def test_round_trip_keeps_graph_and_dispatch_map(service, snapshot_path):
+    snapshot = load_snapshot(snapshot_path)
+    assert sorted(snapshot.city_graph.nodes()) == sorted(service.city_graph.nodes())
+    for node in service.city_graph.nodes():
+        assert dict(snapshot.city_graph.neighbors(node)) == dict(service.city_graph.neighbors(node))
+
+    restored = snapshot.restore_dispatch_map(service.hospitals)
+    assert restored.owner == service.dispatch_map.owner
+    assert restored.cost == pytest.approx(service.dispatch_map.cost)
+
+def test_fresh_snapshot_is_loaded(service, snapshot_path):
+    worker = RoutingService()
+    assert isinstance(worker.city_graph, CSRCityGraph)  # Default backend is networkx: this came from the file
+    assert worker.find_optimal_hospital("A") == service.find_optimal_hospital("A")
+
+def test_snapshot_is_stale_after_a_road_update(service, snapshot_path):
+    assert service.update_road_weight("A", "B", 0.5)
+
+    worker = RoutingService()
+    assert not isinstance(worker.city_graph, CSRCityGraph)  # Rebuilt from MongoDB
+    assert dict(worker.city_graph.neighbors("A"))["B"] == 0.5
+    assert worker.dispatch_map.cost == pytest.approx(DispatchMap(service.city_graph, service.hospitals).cost)
+
+def test_snapshot_without_map_version_is_stale(service, tmp_path, monkeypatch):
+    path = str(tmp_path / "old.snapshot")
+    write_snapshot(path, service.city_graph, dispatch_map=service.dispatch_map)
+    monkeypatch.setenv("GRAPH_SNAPSHOT_PATH", path)
+    assert not isinstance(RoutingService().city_graph, CSRCityGraph)
+
+def test_occupancy_changes_since_export_are_repaired(service, snapshot_path):
+    assert service.update_hospital_occupancy("H2", 95)
+    worker = RoutingService()
+    assert isinstance(worker.city_graph, CSRCityGraph)  # Occupancy does not invalidate the road network
+    assert worker.dispatch_map.cost == pytest.approx(DispatchMap(service.city_graph, service.hospitals).cost)
@@ -0,0 +1,40 @@
+# tests/test_health.py
+
+import time
+import pytest
+from app.services import provider
+
+@pytest.fixture
+def unbuilt_services(db, provide):
+    """Every registered service starts unbuilt (and is put back afterwards)."""
+    for service in provider._REGISTRY:
+        provide(service, None)
+    yield
+    if provider._WARM_UP is not None:
+        provider._WARM_UP.join(30)  # Let a probe-started build finish before the originals return
+
+def wait_until_ready(client, seconds: float = 30):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        response = client.get('/health/ready')
+        if response.status_code == 200:
+            return response
+        time.sleep(0.05)
+    raise AssertionError(f"Never became ready: {response.get_json()}")
+
+def test_liveness_does_not_need_services(unbuilt_services):
+    from app import create_app
+    response = create_app().test_client().get('/health')
+    assert response.status_code == 200
+
+def test_probe_builds_services_without_warm_up_or_traffic(unbuilt_services):
+    from app import create_app
+    client = create_app().test_client()  # SERVICE_WARMUP=false in the test environment
+
+    first = client.get('/health/ready')
+    assert first.status_code == 503
+    assert first.get_json()["status"] == "starting"
+
+    body = wait_until_ready(client).get_json()
+    assert body["status"] == "ready"
+    assert all(service["ready"] for service in body["services"].values())
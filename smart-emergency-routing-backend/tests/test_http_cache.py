@@ -0,0 +1,72 @@
+# tests/test_http_cache.py
+
+import asyncio
+import gzip
+import json
+import pytest
+from app.utils import http_cache
+from app.utils.http_cache import CachedPayload, choose_encoding
+
+PATHS = ["/api/v1/locations", "/api/v1/dispatch-map"]
+
+@pytest.fixture(params=["flask", "asgi"])
+def fetch(request, client, asgi_client, monkeypatch):
+    """fetch(path, **headers) -> (status, headers, raw body) from each app; every body is worth compressing."""
+    monkeypatch.setattr(http_cache, "COMPRESS_MIN_BYTES", 0)
+
+    def flask_get(path, **headers):
+        response = client.get(path, headers=headers)
+        return response.status_code, response.headers, response.data
+
+    def asgi_get(path, **headers):
+        async def send():
+            response = await asgi_client.get(path, headers=headers)
+            return response.status_code, response.headers, await response.get_data()
+        return asyncio.run(send())
+    return flask_get if request.param == "flask" else asgi_get
+
+@pytest.mark.parametrize("path", PATHS)
+def test_unchanged_data_revalidates_to_304(fetch, path):
+    status, headers, body = fetch(path)
+    assert status == 200 and json.loads(body)["status"] == "success"
+    assert headers["Cache-Control"] == "no-cache" and "Accept-Encoding" in headers["Vary"]
+
+    status, _, body = fetch(path, **{"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+    assert fetch(path, **{"If-None-Match": f'W/{headers["ETag"]}, "other"'})[0] == 304
+    assert fetch(path, **{"If-None-Match": '"stale"'})[0] == 200
+
+@pytest.mark.parametrize("path", PATHS)
+def test_gzip_is_negotiated_with_its_own_etag(fetch, path):
+    _, plain_headers, plain = fetch(path)
+    status, headers, body = fetch(path, **{"Accept-Encoding": "gzip, deflate"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == plain
+    assert headers["ETag"] != plain_headers["ETag"]
+    # Either representation's validator revalidates the other
+    assert fetch(path, **{"If-None-Match": headers["ETag"]})[0] == 304
+    assert fetch(path, **{"Accept-Encoding": "gzip", "If-None-Match": plain_headers["ETag"]})[0] == 304
+
+    _, refused, _ = fetch(path, **{"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused and refused["ETag"] == plain_headers["ETag"]
+
+def test_occupancy_change_invalidates_the_dispatch_map(fetch, routed):
+    _, headers, _ = fetch("/api/v1/dispatch-map")
+    routed.update_hospital_occupancy("H1", 0)
+    status, changed, _ = fetch("/api/v1/dispatch-map", **{"If-None-Match": headers["ETag"]})
+    assert status == 200 and changed["ETag"] != headers["ETag"]
+
+def test_encoding_choice(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    assert choose_encoding("gzip", 10_000) == "gzip"
+    assert choose_encoding("*", 10_000) == "gzip"
+    assert choose_encoding("br, gzip;q=0", 10_000) == "identity"  # br is unavailable without the package
+    assert choose_encoding("gzip;q=bogus", 10_000) == "identity"
+    assert choose_encoding(None, 10_000) == choose_encoding("gzip", 10) == "identity"
+
+def test_brotli_is_preferred_when_installed():
+    brotli = pytest.importorskip("brotli")
+    assert choose_encoding("gzip, br", 10_000) == "br"
+    payload = CachedPayload(b'{"status":"success","data":[]}' * 100)
+    assert brotli.decompress(payload.encoded("br")) == payload.body
+    assert payload.etag_for("br") not in (payload.etag, payload.etag_for("gzip"))
@@ -0,0 +1,57 @@
+# tests/test_occupancy.py
+
+import threading
+from app.models.dispatch_map import DispatchMap
+
+def test_bulk_update_classifies_against_the_database(service, db):
+    # Another worker moved H2 in MongoDB; this worker still holds the old value
+    db.hospitals.update_one({"hospital_id": "H2"}, {"$set": {"current_occupancy": 60}})
+    assert service.hospitals["H2"].current_occupancy == 20
+
+    result = service.update_hospital_occupancies([
+        {"hospital_id": "H1", "new_occupancy": 10},
+        {"hospital_id": "H2", "new_occupancy": 60},
+        {"hospital_id": "H9", "new_occupancy": 5}
+    ])
+
+    assert result == {"updated": 1, "unchanged": ["H2"], "not_found": ["H9"]}
+    assert db.hospitals.find_one({"hospital_id": "H1"})["current_occupancy"] == 10
+    # The stale local copy is healed even though nothing was written for it
+    assert service.hospitals["H2"].current_occupancy == 60
+    assert service.dispatch_map.cost == DispatchMap(service.city_graph, service.hospitals).cost
+
+def test_bulk_update_writes_what_the_stale_copy_already_holds(service, db):
+    # MongoDB moved on behind this worker; setting it back must reach the database
+    db.hospitals.update_one({"hospital_id": "H4"}, {"$set": {"current_occupancy": 35}})
+
+    result = service.update_hospital_occupancies([{"hospital_id": "H4", "new_occupancy": 15}])
+
+    assert result["updated"] == 1
+    assert db.hospitals.find_one({"hospital_id": "H4"})["current_occupancy"] == 15
+
+def test_bulk_update_loads_hospitals_added_after_startup(service, db):
+    db.hospitals.insert_one({"hospital_id": "H5", "name": "New Wing", "capacity": 20, "current_occupancy": 0})
+
+    result = service.update_hospital_occupancies([
+        {"hospital_id": "H5", "new_occupancy": 4},
+        {"hospital_id": "H5", "new_occupancy": 6}  # Last report wins
+    ])
+
+    assert result == {"updated": 1, "unchanged": [], "not_found": []}
+    assert service.hospitals["H5"].current_occupancy == 6
+
+def test_single_update_heals_a_stale_copy(service, db):
+    db.hospitals.update_one({"hospital_id": "H3", "current_occupancy": 29}, {"$set": {"current_occupancy": 5}})
+
+    assert service.update_hospital_occupancy("H3", 5) is False
+    assert service.hospitals["H3"].current_occupancy == 5
+    assert service.update_hospital_occupancy("H9", 5) is False
+
+def test_consistent_view_holds_occupancy_updates_back(service):
+    with service.consistent_view() as (_, hospitals):
+        writer = threading.Thread(target=service.update_hospital_occupancy, args=("H1", 0))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive() and hospitals["H1"].current_occupancy != 0
+    writer.join(5)
+    assert service.hospitals["H1"].current_occupancy == 0
@@ -0,0 +1,82 @@
+# tests/test_occupancy_board.py
+
+import os
+import uuid
+import pytest
+from app.utils.occupancy_board import OccupancyBoard, open_occupancy_board
+
+@pytest.fixture
+def board_name(tmp_path, monkeypatch):
+    """A board name private to this test; the segment and lock file are removed afterwards."""
+    name = f"sers_test_{uuid.uuid4().hex[:12]}"
+    monkeypatch.setenv("OCCUPANCY_BOARD_LOCK_DIR", str(tmp_path))
+    yield name
+    try:
+        from _posixshmem import shm_unlink
+        shm_unlink(f"/{name}")
+    except (ImportError, FileNotFoundError):
+        pass
+
+def test_board_is_opt_in(monkeypatch):
+    monkeypatch.delenv("OCCUPANCY_BOARD_NAME", raising=False)
+    assert open_occupancy_board() is None
+
+def test_lock_file_lives_in_the_lock_dir(board_name, tmp_path):
+    board = OccupancyBoard(board_name, max_slots=8)
+    board.publish({"H1": 3})
+    assert os.path.exists(tmp_path / f"{board_name}.lock")
+
+def test_readers_see_only_newer_writes(board_name):
+    writer = OccupancyBoard(board_name, max_slots=8)
+    reader = OccupancyBoard(board_name, max_slots=8)  # A second worker mapping the same segment
+
+    assert reader.read_changes(0) is None
+    writer.publish({"H1": 3, "H2": 7})
+    version, changes = reader.read_changes(0)
+    assert version == 2 and changes == {"H1": 3, "H2": 7}
+
+    writer.publish({"H2": 8})
+    assert reader.read_changes(version) == (4, {"H2": 8})
+    assert reader.read_changes(4) is None
+
+def test_reader_never_returns_a_half_written_update(board_name):
+    board = OccupancyBoard(board_name, max_slots=8)
+    board.publish({"H1": 3})
+    board._header[0] = board.version + 1  # A writer died mid-update: version stays odd
+    assert board.read_changes(0) is None
+
+def test_full_board_and_long_ids_are_rejected(board_name):
+    board = OccupancyBoard(board_name, max_slots=1)
+    board.publish({"H1": 3})
+    with pytest.raises(ValueError):
+        board.publish({"H2": 1})
+    with pytest.raises(ValueError):
+        board.publish({"H" * 40: 1})
+
+def test_workers_share_occupancy(board_name, db, monkeypatch):
+    from app.services.routing_service import RoutingService
+    monkeypatch.setenv("OCCUPANCY_BOARD_NAME", board_name)
+    first, second = RoutingService(use_snapshot=False), RoutingService(use_snapshot=False)
+
+    assert first.update_hospital_occupancy("H2", 90)
+    second.find_optimal_hospital("A")  # Syncs before routing
+    assert second.hospitals["H2"].current_occupancy == 90
+    assert second.occupancy_version == 1
+
+def test_change_published_while_loading_is_replayed(board_name, db, monkeypatch):
+    from app.services.routing_service import RoutingService
+    monkeypatch.setenv("OCCUPANCY_BOARD_NAME", board_name)
+    other_worker = OccupancyBoard(board_name)
+    fetch = RoutingService._fetch_live_hospitals
+
+    def fetch_then_race(self):
+        hospitals = fetch(self)
+        # Another worker writes right after the hospitals were read
+        db.hospitals.update_one({"hospital_id": "H1"}, {"$set": {"current_occupancy": 0}})
+        other_worker.publish({"H1": 0})
+        return hospitals
+
+    monkeypatch.setattr(RoutingService, "_fetch_live_hospitals", fetch_then_race)
+    service = RoutingService(use_snapshot=False)
+    assert service.hospitals["H1"].current_occupancy == 0
+    assert service._board_version == other_worker.version
@@ -0,0 +1,40 @@
+# tests/test_profiler.py
+
+import asyncio
+import time
+from app.utils.profiler import SlowRequestProfiler
+
+def test_requests_sharing_a_thread_are_kept_apart():
+    profiler = SlowRequestProfiler(keep=5, interval_ms=1)
+    first = profiler.start_request("GET /first", key=object())
+    second = profiler.start_request("GET /second", key=object())
+    time.sleep(0.03)
+    profiler.end_request(second)
+    profiler.end_request(first)
+
+    report = profiler.report()
+    assert [entry["request"] for entry in report] == ["GET /first", "GET /second"]
+    assert all(entry["samples"] > 0 for entry in report)
+
+def test_asgi_app_profiles_slow_requests(routed, monkeypatch):
+    from app.asgi import create_asgi_app
+    monkeypatch.setenv("PROFILE_SLOW_REQUESTS", "2")
+    client = create_asgi_app().test_client()
+
+    async def run():
+        for location in ("A", "B", "C"):
+            await client.post('/api/v1/optimize-route', json={"ambulance_location": location})
+        response = await client.get('/metrics/slow-requests')
+        return response.status_code, await response.get_json()
+
+    status, body = asyncio.run(run())
+    assert status == 200
+    assert len(body["data"]) == 2
+    assert all(entry["request"] == "POST /api/v1/optimize-route" for entry in body["data"])
+
+def test_asgi_slow_requests_is_404_when_disabled(monkeypatch):
+    from app.asgi import create_asgi_app
+    monkeypatch.delenv("PROFILE_SLOW_REQUESTS", raising=False)
+    client = create_asgi_app().test_client()
+    response = asyncio.run(client.get('/metrics/slow-requests'))
+    assert response.status_code == 404
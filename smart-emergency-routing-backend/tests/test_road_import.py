@@ -0,0 +1,94 @@
+# tests/test_road_import.py
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+from app.utils.road_import import RoadImporter, road_key
+from import_roads import import_roads
+
+ROWS = [(f"N{i}", f"N{i + 1}", 1.0 + i % 3) for i in range(23)]
+
+@pytest.fixture
+def road_csv(tmp_path):
+    path = tmp_path / "roads.csv"
+    path.write_text("source,target,weight\n" + "".join(f"{s},{t},{w}\n" for s, t, w in ROWS))
+    return str(path)
+
+def assert_imported_once(db):
+    nodes = [doc["node_id"] for doc in db.map_nodes.find()]
+    edges = [(doc["source"], doc["target"]) for doc in db.map_edges.find()]
+    assert sorted(nodes) == sorted({node for s, t, _ in ROWS for node in (s, t)})
+    assert sorted(edges) == sorted(road_key(s, t) for s, t, _ in ROWS)
+
+class Crash(Exception):
+    pass
+
+def crash_after(monkeypatch, method: str, calls: int):
+    """Makes RoadImporter.<method> raise on call number `calls` (after the real call ran, if any)."""
+    original, seen = getattr(RoadImporter, method), []
+
+    def crashing(self, *args, **kwargs):
+        seen.append(1)
+        if len(seen) == calls:
+            if method == "_write_checkpoint":
+                raise Crash()  # The batch reached MongoDB, its checkpoint did not
+        result = original(self, *args, **kwargs)
+        if len(seen) == calls:
+            raise Crash()
+        return result
+    monkeypatch.setattr(RoadImporter, method, crashing)
+
+@pytest.mark.parametrize("method", ["_write_batch", "_write_checkpoint"])
+def test_resumed_import_writes_everything_once(db, road_csv, tmp_path, monkeypatch, method):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with monkeypatch.context() as patch:
+        crash_after(patch, method, 3)
+        with pytest.raises(Crash):
+            RoadImporter(db, batch_size=5, checkpoint_path=checkpoint).run(road_csv)
+
+    stats = RoadImporter(db, batch_size=5, checkpoint_path=checkpoint).run(road_csv, resume=True)
+    assert stats["skipped_resume"] > 0
+    assert_imported_once(db)
+
+def test_insert_refuses_a_loaded_network(db, road_csv):
+    RoadImporter(db, batch_size=5).run(road_csv)
+    with pytest.raises(ValueError, match="--incremental"):
+        RoadImporter(db, batch_size=5).run(road_csv)
+    RoadImporter(db, batch_size=5, incremental=True).run(road_csv)
+    assert_imported_once(db)
+
+def test_duplicate_rows_are_skipped_on_insert(db, tmp_path):
+    path = tmp_path / "dupes.csv"
+    path.write_text("source,target,weight\nA,B,1\nB,C,2\nA,B,3\n")
+    stats = RoadImporter(db, batch_size=10).run(str(path))
+    assert stats["duplicates"] == 1 and stats["edges_written"] == 2
+    assert db.map_edges.count_documents({}) == 2
+
+@pytest.mark.parametrize("batch_size", [10, 1])
+def test_reversed_rows_are_the_same_road(db, tmp_path, batch_size):
+    path = tmp_path / "reversed.csv"
+    path.write_text("source,target,weight\nA,B,1\nB,C,2\nB,A,3\n")
+    stats = RoadImporter(db, batch_size=batch_size).run(str(path))
+    assert stats["duplicates"] == 1 and stats["edges_written"] == 2
+    road = db.map_edges.find_one({"source": "A", "target": "B"})
+    assert db.map_edges.count_documents({}) == 2
+    assert road["weight"] == 3.0  # The last row wins, within a batch or across batches, as in the graph
+
+def test_incremental_updates_a_road_given_in_either_orientation(db, tmp_path):
+    db.map_edges.insert_one({"source": "C", "target": "B", "weight": 2.0})  # Stored by an older import
+    path = tmp_path / "update.csv"
+    path.write_text("source,target,weight\nB,A,4\nB,C,5\nA,B,6\nD,C,7\n")
+    RoadImporter(db, batch_size=2, incremental=True).run(str(path))
+    weights = {(doc["source"], doc["target"]): doc["weight"] for doc in db.map_edges.find()}
+    assert weights == {("A", "B"): 6.0, ("C", "B"): 5.0, ("C", "D"): 7.0}
+
+def test_nodes_and_roads_are_unique(db):
+    db.map_nodes.insert_one({"node_id": "A"})
+    with pytest.raises(DuplicateKeyError):
+        db.map_nodes.insert_one({"node_id": "A"})
+    db.map_edges.insert_one({"source": "A", "target": "B", "weight": 1.0})
+    with pytest.raises(DuplicateKeyError):
+        db.map_edges.insert_one({"source": "A", "target": "B", "weight": 2.0})
+
+def test_replace_and_resume_are_exclusive(db, road_csv):
+    with pytest.raises(ValueError, match="--replace"):
+        import_roads(road_csv, replace=True, resume=True)
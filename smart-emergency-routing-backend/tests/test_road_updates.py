@@ -0,0 +1,87 @@
+# tests/test_road_updates.py
+
+import random
+import pytest
+from app.models.dispatch_map import DispatchMap
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_road_repair_equals_rebuild(make_city, backend):
+    graph, hospitals = make_city(backend)
+    dispatch_map = DispatchMap(graph, hospitals)
+    roads = [(node, neighbor) for node in graph.nodes() for neighbor, _ in graph.neighbors(node) if node < neighbor]
+    rng = random.Random(11)
+
+    for _ in range(60):
+        source, target = rng.choice(roads)
+        # Faster, slower and near-closures, on roads inside and outside the current trees
+        weight = rng.choice((rng.uniform(0.1, 1.0), rng.uniform(1.0, 6.0), 500.0))
+        old_weight = graph.update_road_weight(source, target, weight)
+        dispatch_map.update_road(source, target, old_weight, weight)
+
+        rebuilt = DispatchMap(graph, hospitals)
+        assert set(dispatch_map.cost) == set(rebuilt.cost)
+        for node, cost in rebuilt.cost.items():
+            assert dispatch_map.cost[node] == pytest.approx(cost, abs=1e-6), node
+
+def test_has_road_matches_on_both_backends(make_city):
+    networkx_graph, _ = make_city("networkx")
+    csr_graph, _ = make_city("csr")
+    for node in networkx_graph.nodes()[:20]:
+        for neighbor, _ in networkx_graph.neighbors(node):
+            assert csr_graph.has_road(node, neighbor) and csr_graph.has_road(neighbor, node)
+    assert not csr_graph.has_road("A", "NOWHERE")
+    assert not networkx_graph.has_road("N0_0", "N5_5")
+    assert not csr_graph.has_road("N0_0", "N5_5")
+
+def test_road_update_is_applied_everywhere(service, db):
+    changes = []
+    service.add_change_listener(changes.append)
+
+    assert service.update_road_weight("B", "A", 1.0)  # Either orientation
+    assert db.map_edges.find_one({"source": "A", "target": "B"})["weight"] == 1.0
+    assert dict(service.city_graph.neighbors("A"))["B"] == 1.0
+    assert service.graph_version == 1
+    assert changes[-1]["type"] == "road"
+    assert service.dispatch_map.cost == pytest.approx(DispatchMap(service.city_graph, service.hospitals).cost)
+
+def test_road_missing_from_graph_leaves_the_database_alone(service, db):
+    # In map_edges, but added after the graph was built
+    db.map_edges.insert_one({"source": "A", "target": "F", "weight": 9.0})
+    changes = []
+    service.add_change_listener(changes.append)
+
+    assert service.update_road_weight("A", "F", 1.0) is False
+    assert db.map_edges.find_one({"source": "A", "target": "F"})["weight"] == 9.0
+    assert service.graph_version == 0 and changes == []
+
+def test_bulk_update_skips_roads_missing_from_graph(service, db):
+    db.map_edges.insert_one({"source": "A", "target": "F", "weight": 9.0})
+    changes = []
+    service.add_change_listener(changes.append)
+
+    result = service.update_road_weights([
+        {"source": "A", "target": "B", "weight": 1.5},
+        {"source": "A", "target": "F", "weight": 1.0},
+        {"source": "C", "target": "E", "weight": 2.5},
+        {"source": "X", "target": "Y", "weight": 1.0}
+    ])
+
+    assert result == {"updated": 2, "not_found": [{"source": "A", "target": "F"}, {"source": "X", "target": "Y"}]}
+    assert db.map_edges.find_one({"source": "A", "target": "F"})["weight"] == 9.0
+    assert db.map_edges.find_one({"source": "C", "target": "E"})["weight"] == 2.5
+    assert service.graph_version == 2
+    assert len(changes) == 1 and len(changes[0]["roads"]) == 2
+    assert service.dispatch_map.cost == pytest.approx(DispatchMap(service.city_graph, service.hospitals).cost)
+
+def test_apply_road_weights_is_all_or_nothing(service):
+    before = dict(service.city_graph.neighbors("A"))
+    with pytest.raises(ValueError):
+        service.apply_road_weights([("A", "B", 1.0), ("A", "F", 1.0)])
+    assert dict(service.city_graph.neighbors("A")) == before
+    assert service.graph_version == 0
+
+def test_invalid_weight_is_rejected(client):
+    response = client.patch('/api/v1/roads/update-weight', json={"source": "A", "target": "B", "weight": -1})
+    assert response.status_code == 400
+    response = client.patch('/api/v1/roads/update-weight', json={"source": "A", "target": "F", "weight": 1})
+    assert response.status_code == 404
@@ -0,0 +1,37 @@
+# tests/test_route_accelerator.py
+
+import random
+import pytest
+from app.models.landmarks import astar
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+@pytest.mark.parametrize("contraction", [False, True])
+def test_preprocessed_queries_are_exact(make_city, backend, contraction):
+    graph, _ = make_city(backend, size=10)
+    nodes = graph.nodes()
+    rng = random.Random(5)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(40)]
+    reference = [astar(graph, start, end, lambda node: 0.0)[0] for start, end in pairs]
+
+    graph.preprocess(landmarks=4, contraction=contraction)
+    for (start, end), expected in zip(pairs, reference):
+        assert graph.calculate_travel_time(start, end) == pytest.approx(expected, abs=1e-6)
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_road_update_drops_stale_preprocessing(make_city, backend):
+    graph, _ = make_city(backend, size=10)
+    graph.preprocess(landmarks=4)
+    start, end = "N0_0", "N9_9"
+    before = graph.calculate_travel_time(start, end)
+
+    # Make every road out of the start much slower
+    for neighbor, weight in list(graph.neighbors(start)):
+        graph.update_road_weight(start, neighbor, weight + 100)
+    assert graph.accelerator is None
+    assert graph.calculate_travel_time(start, end) == pytest.approx(before + 100, abs=1e-6)
+
+def test_service_startup_does_no_point_to_point_preprocessing(db, monkeypatch):
+    from app.services.routing_service import RoutingService
+    monkeypatch.setenv("ROUTE_LANDMARKS", "4")
+    monkeypatch.setenv("ROUTE_CONTRACTION", "true")
+    assert RoutingService(use_snapshot=False).city_graph.accelerator is None
@@ -0,0 +1,62 @@
+# tests/test_snapping.py
+
+import subprocess
+import sys
+import pytest
+from app.utils.seed_data import SEED_COORDINATES
+
+MIDDLE_OF_A_B = (18.5250, 73.8525)
+
+@pytest.fixture
+def backend_service(backend, db):
+    from app.services.routing_service import RoutingService
+    return RoutingService(use_snapshot=False)
+
+def test_intersection_snaps_to_itself(backend_service):
+    snapped = backend_service.snap_position(*SEED_COORDINATES["D"])
+    assert snapped["node_id"] == "D" and snapped["distance_m"] == pytest.approx(0, abs=0.5)
+
+def test_point_between_intersections_snaps_to_the_road(backend_service):
+    road = backend_service.snap_position(*MIDDLE_OF_A_B)["road"]
+    assert {road["source"], road["target"]} == {"A", "B"}
+    assert road["fraction"] == pytest.approx(0.5, abs=0.01)
+
+def test_dispatch_from_a_road_adds_the_partial_road_time(backend_service):
+    result = backend_service.find_optimal_hospital_from_position(*MIDDLE_OF_A_B)
+    best_end = min(backend_service.find_optimal_hospital(node)["metrics"]["total_response_time_mins"] for node in ("A", "B"))
+    # Half of the 5-minute road A-B, from whichever end is better
+    assert result["metrics"]["total_response_time_mins"] == pytest.approx(best_end + 2.5, abs=0.05)
+    assert result["snapped_location"]["road"] is not None
+
+def test_dispatch_from_an_intersection_matches_the_node_query(backend_service):
+    by_position = backend_service.find_optimal_hospital_from_position(*SEED_COORDINATES["C"])
+    by_node = backend_service.find_optimal_hospital("C")
+    assert by_position["optimal_hospital"] == by_node["optimal_hospital"]
+    assert by_position["metrics"]["total_response_time_mins"] == pytest.approx(by_node["metrics"]["total_response_time_mins"], abs=0.05)
+
+@pytest.mark.parametrize("position", [
+    {"lat": "north", "lon": 73.85},
+    {"lat": 123.0, "lon": 73.85},
+    {"lat": float("nan"), "lon": 73.85},
+    {"lat": 0.0, "lon": 0.0}  # Valid, but nowhere near a road
+])
+def test_bad_positions_are_400_on_both_apps(client, asgi_call, position):
+    assert client.post('/api/v1/optimize-route', json=position).status_code == 400
+    assert asgi_call("post", "/api/v1/optimize-route", json=position)[0] == 400
+    query = f"/api/v1/snap?lat={position['lat']}&lon={position['lon']}"
+    assert client.get(query).status_code == 400
+    assert asgi_call("get", query)[0] == 400
+
+def test_good_position_dispatches_on_both_apps(client, asgi_call):
+    body = {"lat": MIDDLE_OF_A_B[0], "lon": MIDDLE_OF_A_B[1]}
+    flask = client.post('/api/v1/optimize-route', json=body)
+    status, asgi = asgi_call("post", "/api/v1/optimize-route", json=body)
+    assert flask.status_code == status == 200
+    assert flask.get_json()["data"] == asgi["data"]
+
+def test_seed_script_does_not_load_the_routing_service():
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, seed; print('app.services.routing_service' in sys.modules)"],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == "False"
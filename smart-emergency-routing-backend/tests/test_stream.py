@@ -0,0 +1,71 @@
+# tests/test_stream.py
+
+import time
+import pytest
+from app.services.errors import StreamFullError
+from app.services.stream_service import StreamBroker
+
+def wait_for(condition, seconds: float = 5):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+def test_thread_subscribers_are_capped(service, monkeypatch):
+    monkeypatch.setenv("STREAM_MAX_THREAD_SUBSCRIBERS", "2")
+    broker = StreamBroker(service)
+    first, second = broker.subscribe({}), broker.subscribe({})
+    with pytest.raises(StreamFullError):
+        broker.subscribe({})
+
+    broker.unsubscribe(first)
+    broker.unsubscribe(first)  # A second unsubscribe must not free another slot
+    third = broker.subscribe({})
+    with pytest.raises(StreamFullError):
+        broker.subscribe({})
+    assert broker.stats()["subscribers"] == 2
+    broker.unsubscribe(second)
+    broker.unsubscribe(third)
+
+def test_flask_stream_beyond_the_cap_is_503(client, monkeypatch):
+    monkeypatch.setenv("STREAM_MAX_THREAD_SUBSCRIBERS", "1")
+    first = client.get('/api/v1/stream?ambulance=amb1:A')
+    assert first.status_code == 200
+
+    second = client.get('/api/v1/stream')
+    assert second.status_code == 503
+    assert second.headers["Retry-After"]
+    first.close()
+
+def test_dispatcher_counts_events(service):
+    broker = StreamBroker(service)
+    subscriber = broker.subscribe({"amb1": "A"})
+    subscriber.next_frames(0)  # The initial assignment
+
+    service.update_hospital_occupancy("H4", 39)
+    wait_for(lambda: broker.stats()["events"] == 1)
+    stats = broker.stats()
+    assert stats["frames_delivered"] >= 1 and stats["subscribers"] == 1
+    assert b"event: occupancy" in b"".join(subscriber.next_frames(1))
+    broker.unsubscribe(subscriber)
+
+def test_initial_assignment_precedes_concurrent_changes(service, monkeypatch):
+    broker = StreamBroker(service)
+    decide = service.find_optimal_hospital
+
+    def change_while_deciding(location, *args):
+        # An occupancy change lands between registering the subscriber and its first decision
+        monkeypatch.setattr(service, "find_optimal_hospital", decide)
+        service.update_hospital_occupancy("H4", 39)
+        time.sleep(0.2)  # Gives the dispatcher time to publish it
+        return decide(location, *args)
+    monkeypatch.setattr(service, "find_optimal_hospital", change_while_deciding)
+
+    subscriber = broker.subscribe({"amb1": "A"})
+    wait_for(lambda: broker.stats()["events"] == 1)
+    frames = b"".join(subscriber.next_frames(1)).decode().split("\n\n")
+    assert frames[0].split("\n")[1] == "event: assignment"
+    assert '"previous_hospital_id": null' in frames[0]
+    assert '"previous_hospital_id": null' not in "".join(frames[1:])
+    broker.unsubscribe(subscriber)
@@ -0,0 +1,68 @@
+# tests/test_time_profiles.py
+
+import datetime
+import pytest
+from app.models.time_profiles import departure_minute
+
+MIDDLE_OF_A_B = (18.5250, 73.8525)
+# A-B and A-H4 are four times slower around 08:00 and free-flowing at night
+RUSH_HOUR = [[0, 1.0], [360, 1.0], [480, 4.0], [600, 1.0]]
+
+@pytest.fixture
+def profiled(db, monkeypatch):
+    """profiled(backend) -> RoutingService over the demo city with RUSH_HOUR on roads A-B and A-H4."""
+    from app.services.routing_service import RoutingService
+    monkeypatch.setenv("CITY_TIMEZONE", "UTC")
+    RoutingService(use_snapshot=False)  # Seeds the demo city
+    db.map_edges.update_many({"source": "A", "target": {"$in": ["B", "H4"]}}, {"$set": {"profile": RUSH_HOUR}})
+
+    def build(backend: str):
+        monkeypatch.setenv("GRAPH_BACKEND", backend)
+        return RoutingService(use_snapshot=False)
+    return build
+
+def test_departure_formats(monkeypatch):
+    monkeypatch.setenv("CITY_TIMEZONE", "UTC")
+    eight_am = datetime.datetime(2024, 5, 6, 8, 7, tzinfo=datetime.timezone.utc).timestamp()
+    assert departure_minute(None) is None and departure_minute("") is None
+    assert departure_minute("2024-05-06T08:07:00Z") == 480
+    assert departure_minute(eight_am) == departure_minute(int(eight_am)) == 480
+    assert departure_minute(str(int(eight_am))) == departure_minute(f" {eight_am:.1f} ") == 480
+    assert departure_minute("now") is not None
+
+@pytest.mark.parametrize("departure_time", [1e20, -1e20, float("nan"), "1e20", "yesterday-ish", True, [8, 0]])
+def test_bad_departures_raise_value_error(departure_time):
+    with pytest.raises(ValueError, match="departure_time"):
+        departure_minute(departure_time)
+
+def test_rush_hour_slows_the_road_on_both_backends(profiled):
+    results = {}
+    for backend in ("networkx", "csr"):
+        service = profiled(backend)
+        results[backend] = {
+            when: service.find_optimal_hospital("A", f"2024-05-06T{when}:00Z")
+            for when in ("03:00", "08:00")
+        }
+    assert results["networkx"] == results["csr"]
+    night, rush = results["csr"]["03:00"], results["csr"]["08:00"]
+    assert night["optimal_hospital"]["id"] == "H4"
+    assert rush["optimal_hospital"]["id"] != "H4"
+    assert rush["metrics"]["total_response_time_mins"] > night["metrics"]["total_response_time_mins"]
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_partial_road_is_priced_at_the_departure_time(profiled, backend):
+    service = profiled(backend)
+    for when, factor in (("03:00", 1.0), ("08:00", service.city_graph.road_time("A", "B", 480) / 5.0)):
+        departure = f"2024-05-06T{when}:00Z"
+        result = service.find_optimal_hospital_from_position(*MIDDLE_OF_A_B, departure)
+        best_end = min(service.find_optimal_hospital(node, departure)["metrics"]["total_response_time_mins"]
+                       for node in ("A", "B"))
+        # Half of the 5-minute road A-B, scaled by its factor at the departure time
+        assert result["metrics"]["total_response_time_mins"] == pytest.approx(best_end + 2.5 * factor, abs=0.05)
+    assert service.city_graph.road_time("A", "B", 480) > service.city_graph.road_time("A", "B", 180) == 5.0
+
+@pytest.mark.parametrize("departure_time", ["yesterday-ish", 1e20, "1e20"])
+def test_bad_departure_time_is_400_on_both_apps(client, asgi_call, departure_time):
+    body = {"ambulance_location": "A", "departure_time": departure_time}
+    assert client.post('/api/v1/optimize-route', json=body).status_code == 400
+    assert asgi_call("post", "/api/v1/optimize-route", json=body)[0] == 400